@@ -3,12 +3,14 @@ Admin API routes for application management
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Body, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Body, Request, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session, joinedload
 from datetime import datetime, timezone
 
 from app.core.database import get_db
+from app.core.etag import application_etag
+from app.core.serialization import FastJSONResponse, Projection
 from app.core.deps import get_current_admin_user
 from app.core.audit import (
     log_application_event,
@@ -18,10 +20,17 @@ from app.core.audit import (
     ACTION_STATUS_REJECTED, ACTION_NOTE_ADDED
 )
 from app.models.user import User
-from app.models.application import Application, AdminNote, ApplicationApproval, ApplicationResponse, ApplicationQuestion
+from app.models.application import (
+    Application, AdminNote, ApplicationApproval, ApplicationResponse, ApplicationQuestion, ApplicationSection,
+    Medication, Allergy, File as FileModel
+)
 from app.schemas.admin_note import AdminNote as AdminNoteSchema, AdminNoteCreate
-from app.schemas.application import ApplicationUpdate, Application as ApplicationSchema, ApplicationProgress
-from app.services import email_service
+from app.schemas.application import (
+    ApplicationUpdate, Application as ApplicationSchema, ApplicationProgress, SectionProgress,
+    ApplicationSectionWithQuestions
+)
+from app.schemas.medication import Medication as MedicationSchema, Allergy as AllergySchema
+from app.services import email_service, stripe_service
 from app.services.email_events import fire_email_event
 
 router = APIRouter(prefix="/admin", tags=["admin"])
@@ -32,57 +41,11 @@ class ApprovalRequest(BaseModel):
     note: str  # Required note explaining the decision
 
 
-@router.get("/applications/{application_id}/progress", response_model=ApplicationProgress)
-async def get_application_progress_admin(
-    application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
-):
+def compute_admin_progress(application: Application, sections: list, all_responses: list) -> ApplicationProgress:
     """
-    Get detailed progress for an application (admin version)
-
-    Returns completion status for each section and overall progress.
-    Admin can view progress for any application.
+    Admin progress for an application from pre-loaded data: `sections`
+    (questions loaded) and all of the application's responses
     """
-    # Import here to avoid circular dependency
-    from app.api.applications import (
-        ApplicationSection,
-        ApplicationQuestion,
-        ApplicationResponse as AppResponse,
-        SectionProgress
-    )
-
-    application = db.query(Application).filter(Application.id == application_id).first()
-    if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Application not found"
-        )
-
-    # Get application status for conditional filtering
-    app_status = application.status  # 'applicant', 'camper', 'inactive'
-    app_sub_status = application.sub_status  # Progress within status
-
-    # Get sections filtered by required_status
-    sections_query = db.query(ApplicationSection).filter(
-        ApplicationSection.is_active == True
-    )
-
-    # Filter sections by required_status (applicant vs camper)
-    if app_status == 'applicant':
-        sections_query = sections_query.filter(
-            (ApplicationSection.required_status == None) |
-            (ApplicationSection.required_status == 'applicant')
-        )
-    # Campers see all sections
-
-    sections = sections_query.order_by(ApplicationSection.order_index).all()
-
-    # Get all responses for this application
-    all_responses = db.query(AppResponse).filter(
-        AppResponse.application_id == application_id
-    ).all()
-
     # Create a dict of question_id -> response_value for quick lookup
     response_dict = {str(r.question_id): r.response_value for r in all_responses}
 
@@ -102,13 +65,8 @@ async def get_application_progress_admin(
     completed_sections = 0
 
     for section in sections:
-        # Get questions for this section
-        questions_query = db.query(ApplicationQuestion).filter(
-            ApplicationQuestion.section_id == section.id,
-            ApplicationQuestion.is_active == True
-        )
-
-        questions = questions_query.all()
+        # OPTIMIZED: Filter questions in memory (already loaded via joinedload)
+        questions = [q for q in section.questions if q.is_active]
 
         # Filter questions by conditional logic
         visible_questions = [q for q in questions if should_show_question(q)]
@@ -161,6 +119,101 @@ async def get_application_progress_admin(
     )
 
 
+def load_visible_sections(db: Session, application: Application, with_headers: bool = False) -> list:
+    """Active sections (questions loaded) the application's status can see, in order"""
+    options = [joinedload(ApplicationSection.questions)]
+    if with_headers:
+        options.append(joinedload(ApplicationSection.headers))
+    sections_query = db.query(ApplicationSection).options(*options).filter(
+        ApplicationSection.is_active == True
+    )
+
+    # Filter sections by required_status (applicant vs camper)
+    if application.status == 'applicant':
+        sections_query = sections_query.filter(
+            (ApplicationSection.required_status == None) |
+            (ApplicationSection.required_status == 'applicant')
+        )
+    # Campers see all sections
+
+    return sections_query.order_by(ApplicationSection.order_index).all()
+
+
+@router.get("/applications/{application_id}/progress", response_model=ApplicationProgress)
+async def get_application_progress_admin(
+    application_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get detailed progress for an application (admin version)
+
+    Returns completion status for each section and overall progress.
+    Admin can view progress for any application.
+    """
+    application = db.query(Application).filter(Application.id == application_id).first()
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+
+    # OPTIMIZED: Load sections with questions in ONE query (not N+1)
+    sections = load_visible_sections(db, application)
+
+    # Get all responses for this application
+    all_responses = db.query(ApplicationResponse).filter(
+        ApplicationResponse.application_id == application_id
+    ).all()
+
+    return compute_admin_progress(application, sections, all_responses)
+
+
+def build_approval_status(application: Application, approvals: list, current_user: User) -> dict:
+    """Approval counts, voters and the current admin's vote (approvals loaded with admin)"""
+    # Count approvals and declines
+    approval_count = sum(1 for a in approvals if a.approved)
+    decline_count = sum(1 for a in approvals if not a.approved)
+
+    # Check current user's vote
+    current_user_vote = None
+    for approval in approvals:
+        if approval.admin_id == current_user.id:
+            current_user_vote = "approved" if approval.approved else "declined"
+            break
+
+    # Get list of admins who approved/declined (including their notes)
+    approved_by = [
+        {
+            "admin_id": str(a.admin_id),
+            "name": f"{a.admin.first_name} {a.admin.last_name}" if a.admin else "Unknown",
+            "team": a.admin.team if a.admin else None,
+            "note": a.note
+        }
+        for a in approvals if a.approved
+    ]
+
+    declined_by = [
+        {
+            "admin_id": str(a.admin_id),
+            "name": f"{a.admin.first_name} {a.admin.last_name}" if a.admin else "Unknown",
+            "team": a.admin.team if a.admin else None,
+            "note": a.note
+        }
+        for a in approvals if not a.approved
+    ]
+
+    return {
+        "application_id": str(application.id),
+        "approval_count": approval_count,
+        "decline_count": decline_count,
+        "current_user_vote": current_user_vote,
+        "approved_by": approved_by,
+        "declined_by": declined_by,
+        "status": application.status
+    }
+
+
 @router.get("/applications/{application_id}/approval-status")
 async def get_approval_status(
     application_id: str,
@@ -186,47 +239,7 @@ async def get_approval_status(
             ApplicationApproval.application_id == application_id
         ).all()
 
-        # Count approvals and declines
-        approval_count = sum(1 for a in approvals if a.approved)
-        decline_count = sum(1 for a in approvals if not a.approved)
-
-        # Check current user's vote
-        current_user_vote = None
-        for approval in approvals:
-            if approval.admin_id == current_user.id:
-                current_user_vote = "approved" if approval.approved else "declined"
-                break
-
-        # Get list of admins who approved/declined (including their notes)
-        approved_by = [
-            {
-                "admin_id": str(a.admin_id),
-                "name": f"{a.admin.first_name} {a.admin.last_name}" if a.admin else "Unknown",
-                "team": a.admin.team if a.admin else None,
-                "note": a.note
-            }
-            for a in approvals if a.approved
-        ]
-
-        declined_by = [
-            {
-                "admin_id": str(a.admin_id),
-                "name": f"{a.admin.first_name} {a.admin.last_name}" if a.admin else "Unknown",
-                "team": a.admin.team if a.admin else None,
-                "note": a.note
-            }
-            for a in approvals if not a.approved
-        ]
-
-        return {
-            "application_id": str(application_id),
-            "approval_count": approval_count,
-            "decline_count": decline_count,
-            "current_user_vote": current_user_vote,
-            "approved_by": approved_by,
-            "declined_by": declined_by,
-            "status": application.status
-        }
+        return build_approval_status(application, approvals, current_user)
 
     except HTTPException:
         raise
@@ -320,7 +333,8 @@ async def create_note(
 async def get_notes(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: User = Depends(get_current_admin_user),
+    etag: Optional[str] = Depends(application_etag("notes"))
 ):
     """
     Get all notes for an application
@@ -344,6 +358,130 @@ async def get_notes(
     return notes
 
 
+# ============================================================================
+# Review Bundle - everything the admin application page needs, in one request
+# ============================================================================
+
+REVIEW_BUNDLE_FIELDS = (
+    "application", "sections", "progress", "approvals", "notes",
+    "files", "medications", "allergies", "invoices"
+)
+
+section_projection = Projection(ApplicationSectionWithQuestions)
+note_projection = Projection(AdminNoteSchema)
+medication_projection = Projection(MedicationSchema)
+allergy_projection = Projection(AllergySchema)
+
+
+@router.get("/applications/{application_id}/review-bundle")
+async def get_review_bundle(
+    application_id: str,
+    fields: Optional[str] = Query(
+        None,
+        description="Comma-separated parts to include (default all): " + ", ".join(REVIEW_BUNDLE_FIELDS)
+    ),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Admin review page data in one request.
+
+    Replaces the separate calls for the application, sections, progress,
+    approval status, notes, files, medications, allergies and payment
+    summary. Each part has the same shape as its standalone endpoint. The
+    application, its responses and its sections are loaded once and shared,
+    and file URLs are signed in a single storage request.
+    """
+    from app.api.applications import application_with_user_projection
+    from app.api.files import signed_file_entries
+    from app.api.invoices import build_payment_summary
+
+    if fields:
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(REVIEW_BUNDLE_FIELDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown fields: {', '.join(sorted(unknown))}. Valid fields: {', '.join(REVIEW_BUNDLE_FIELDS)}"
+            )
+    else:
+        requested = set(REVIEW_BUNDLE_FIELDS)
+
+    # Application with user and responses in ONE query; shared by application / progress / files
+    query = db.query(Application)
+    if "application" in requested:
+        query = query.options(joinedload(Application.user))
+    if requested & {"application", "progress", "files"}:
+        query = query.options(joinedload(Application.responses))
+    application = query.filter(Application.id == application_id).first()
+
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+
+    bundle = {"application_id": str(application.id)}
+
+    if "application" in requested:
+        bundle["application"] = application_with_user_projection(application)
+
+    if requested & {"sections", "progress"}:
+        # Sections with questions (and headers) in ONE query; shared by sections / progress
+        sections = load_visible_sections(db, application, with_headers="sections" in requested)
+        if "sections" in requested:
+            section_list = []
+            for section in sections:
+                data = section_projection(section)
+                data["questions"] = [q for q in data["questions"] if q["is_active"]]
+                data["headers"] = [h for h in data["headers"] if h["is_active"]]
+                section_list.append(data)
+            bundle["sections"] = section_list
+        if "progress" in requested:
+            bundle["progress"] = compute_admin_progress(application, sections, application.responses).model_dump()
+
+    if "approvals" in requested:
+        approvals = db.query(ApplicationApproval).options(
+            joinedload(ApplicationApproval.admin)
+        ).filter(
+            ApplicationApproval.application_id == application_id
+        ).all()
+        bundle["approvals"] = build_approval_status(application, approvals, current_user)
+
+    if "notes" in requested:
+        notes = db.query(AdminNote).options(
+            joinedload(AdminNote.admin)
+        ).filter(
+            AdminNote.application_id == application_id
+        ).order_by(AdminNote.created_at.desc()).all()
+        bundle["notes"] = [note_projection(note) for note in notes]
+
+    if "files" in requested:
+        file_ids = [r.file_id for r in application.responses if r.file_id is not None]
+        file_records = db.query(FileModel).filter(FileModel.id.in_(file_ids)).all() if file_ids else []
+        bundle["files"] = signed_file_entries(file_records)
+
+    if "medications" in requested:
+        medications = db.query(Medication).options(
+            joinedload(Medication.doses)
+        ).filter(
+            Medication.application_id == application_id
+        ).order_by(Medication.order_index).all()
+        bundle["medications"] = [medication_projection(m) for m in medications]
+
+    if "allergies" in requested:
+        allergies = db.query(Allergy).filter(
+            Allergy.application_id == application_id
+        ).order_by(Allergy.order_index).all()
+        bundle["allergies"] = [allergy_projection(a) for a in allergies]
+
+    if "invoices" in requested:
+        invoices = stripe_service.get_invoices_for_application(db, application.id)
+        bundle["invoices"] = build_payment_summary(str(application.id), invoices)
+
+    return FastJSONResponse(bundle)
+
+
 @router.post("/applications/{application_id}/approve")
 async def approve_application(
     application_id: str,
@@ -790,11 +928,16 @@ async def update_application_admin(
     """
     Update application as admin (can edit any application)
     Admin-only endpoint
+
+    With `base_revision`, responses the family changed since that revision
+    are rejected with 409 instead of overwritten.
     """
+    from app.api.applications import find_response_conflicts, raise_on_response_conflicts, upsert_responses
+
     try:
         application = db.query(Application).filter(
             Application.id == application_id
-        ).first()
+        ).with_for_update().first()
 
         if not application:
             raise HTTPException(
@@ -817,6 +960,11 @@ async def update_application_admin(
             ).all()
             existing_responses_map = {str(r.question_id): r for r in existing_responses_list}
 
+            raise_on_response_conflicts(
+                application,
+                find_response_conflicts(update_data.base_revision, update_data.responses, existing_responses_map)
+            )
+
             # OPTIMIZED: Pre-load all questions being updated in ONE query
             # This eliminates N individual queries for camper name sync
             question_ids = [r.question_id for r in update_data.responses]
@@ -825,25 +973,10 @@ async def update_application_admin(
             ).all()
             questions_map = {str(q.id): q for q in questions_list}
 
+            upsert_responses(db, application_id, update_data.responses, existing_responses_list)
+
             for response_data in update_data.responses:
-                # Check if response already exists using pre-loaded map (O(1) lookup)
-                # Use str() to ensure consistent key format (handles both UUID and string types)
                 question_id_str = str(response_data.question_id)
-                existing_response = existing_responses_map.get(question_id_str)
-
-                if existing_response:
-                    # Update existing response
-                    existing_response.response_value = response_data.response_value
-                    existing_response.file_id = response_data.file_id
-                else:
-                    # Create new response
-                    new_response = ApplicationResponse(
-                        application_id=application_id,
-                        question_id=response_data.question_id,
-                        response_value=response_data.response_value,
-                        file_id=response_data.file_id
-                    )
-                    db.add(new_response)
 
                 # Sync camper name fields to applications table when those questions are updated
                 # This keeps the denormalized columns in sync with the response values
@@ -4,17 +4,24 @@ Manage application sections and questions
 """
 
 from fastapi import APIRouter, Depends, HTTPException
-from typing import List, Optional, Union, Dict, Any
+from typing import List, Optional, Union, Dict, Any, Tuple
 from pydantic import BaseModel
 from uuid import UUID
+from sqlalchemy import text
 from sqlalchemy.orm import Session, joinedload, object_session
 
 from app.core.database import get_db
 from app.core.deps import get_current_user
+from app.core.cache_bus import invalidates, publish_in_transaction, CACHE_FORM
 from app.models.user import User
 from app.models.application import ApplicationSection, ApplicationQuestion, ApplicationHeader
 
-router = APIRouter(prefix="/application-builder", tags=["application-builder"])
+# Every write changes the form definition cached by the applications API
+router = APIRouter(
+    prefix="/application-builder",
+    tags=["application-builder"],
+    dependencies=[Depends(invalidates(CACHE_FORM))]
+)
 
 
 # Pydantic Models
@@ -501,6 +508,63 @@ async def duplicate_question(
     return convert_question_to_response(duplicated_question)
 
 
+def reorder_rows(
+    db: Session,
+    table: str,
+    items: List[Tuple[UUID, int]],
+    label: str,
+    same_section: bool = False
+) -> None:
+    """
+    Set order_index for (id, order_index) pairs of `table` in one UPDATE and
+    bump the form cache version in the same transaction.
+
+    Validated inside the statement: every id must exist (and, with
+    same_section, all must belong to one section). Otherwise nothing is
+    updated and 400 is raised - e.g. when a concurrent edit deleted or moved
+    one of the rows.
+    """
+    ids = [item_id for item_id, _ in items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail=f"Duplicate {label} IDs in reorder request")
+    if not ids:
+        return
+
+    section_check = "AND COUNT(DISTINCT t.section_id) = 1" if same_section else ""
+    updated = db.execute(
+        text(f"""
+            WITH new_order AS (
+                SELECT * FROM unnest(CAST(:ids AS uuid[]), CAST(:order_indexes AS integer[]))
+                    AS n(id, order_index)
+            ),
+            valid AS (
+                SELECT COUNT(*) = :count {section_check} AS ok
+                FROM {table} t
+                JOIN new_order n ON n.id = t.id
+            )
+            UPDATE {table} t
+            SET order_index = n.order_index,
+                updated_at = NOW()
+            FROM new_order n, valid
+            WHERE t.id = n.id AND valid.ok
+            RETURNING t.id
+        """),
+        {
+            'ids': [str(item_id) for item_id in ids],
+            'order_indexes': [order_index for _, order_index in items],
+            'count': len(ids),
+        }
+    ).fetchall()
+
+    if len(updated) != len(ids):
+        db.rollback()
+        scope = " of one section" if same_section else ""
+        raise HTTPException(status_code=400, detail=f"Reorder must list existing {label}s{scope}")
+
+    publish_in_transaction(db, CACHE_FORM)
+    db.commit()
+
+
 @router.post("/sections/reorder")
 async def reorder_sections(
     section_ids: List[UUID],
@@ -509,13 +573,11 @@ async def reorder_sections(
 ):
     """Reorder sections by providing ordered list of section IDs"""
 
-    # Update order_index for each section
-    for index, section_id in enumerate(section_ids):
-        db.query(ApplicationSection).filter(
-            ApplicationSection.id == section_id
-        ).update({"order_index": index})
-
-    db.commit()
+    reorder_rows(
+        db, "application_sections",
+        [(section_id, index) for index, section_id in enumerate(section_ids)],
+        "section"
+    )
 
     return {"message": "Sections reordered successfully"}
 
@@ -528,13 +590,11 @@ async def reorder_questions(
 ):
     """Reorder questions by providing list of {id, order_index} pairs"""
 
-    # Update order_index for each question using the provided order_index
-    for item in items:
-        db.query(ApplicationQuestion).filter(
-            ApplicationQuestion.id == item.id
-        ).update({"order_index": item.order_index})
-
-    db.commit()
+    reorder_rows(
+        db, "application_questions",
+        [(item.id, item.order_index) for item in items],
+        "question", same_section=True
+    )
 
     return {"message": "Questions reordered successfully"}
 
@@ -629,12 +689,10 @@ async def reorder_headers(
 ):
     """Reorder headers by providing list of {id, order_index} pairs"""
 
-    # Update order_index for each header using the provided order_index
-    for item in items:
-        db.query(ApplicationHeader).filter(
-            ApplicationHeader.id == item.id
-        ).update({"order_index": item.order_index})
-
-    db.commit()
+    reorder_rows(
+        db, "application_headers",
+        [(item.id, item.order_index) for item in items],
+        "header", same_section=True
+    )
 
     return {"message": "Headers reordered successfully"}
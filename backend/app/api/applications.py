@@ -7,8 +7,12 @@ from datetime import datetime, timezone
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import func, or_
-from app.core.database import get_db
+from sqlalchemy import func, or_, text
+from app.core.database import get_db, get_read_db
+from app.core.etag import application_etag
+from app.core.cache_bus import LocalCache, CACHE_FORM
+from app.core.profiling import profiled_section
+from app.core.serialization import FastJSONResponse, Projection
 from app.core.deps import get_current_user, get_current_admin_user
 from app.models.user import User
 from app.models.application import (
@@ -17,7 +21,9 @@ from app.models.application import (
     ApplicationQuestion,
     ApplicationResponse,
     ApplicationApproval,
-    ApplicationHeader
+    ApplicationHeader,
+    Medication,
+    Allergy
 )
 from app.schemas.application import (
     ApplicationSectionWithQuestions,
@@ -28,17 +34,67 @@ from app.schemas.application import (
     ApplicationWithUser,
     ApplicationProgress,
     SectionProgress,
-    ApplicationResponseCreate
+    ApplicationResponseCreate,
+    ApplicationResponsesDelta,
+    SectionSummary,
+    SectionResponses
 )
 from app.models.application import File as FileModel
-from app.services import storage_service
+from app.services import storage_service, stripe_service
+from app.api.files import signed_file_entries
 from app.services import email_service
 from app.services.email_events import fire_email_event
 
 router = APIRouter()
 
+# Row-to-dict projections for the large list endpoints (skip per-row pydantic validation)
+application_projection = Projection(ApplicationSchema)
+application_with_user_projection = Projection(ApplicationWithUser)
 
-@router.get("/sections", response_model=List[ApplicationSectionWithQuestions])
+
+form_section_projection = Projection(ApplicationSectionWithQuestions)
+form_cache = LocalCache(CACHE_FORM)
+
+
+def get_form_definition(db: Session, app_status: Optional[str]) -> List[dict]:
+    """
+    Active sections with their active questions and headers, as dicts.
+
+    Applicants see sections with required_status NULL or 'applicant'; everyone
+    else sees all. Cached per process until the application builder changes
+    the form.
+    """
+    cache_key = "applicant" if app_status == 'applicant' else "all"
+
+    def load():
+        # Sections with eager-loaded questions and headers (single query instead of N+1)
+        sections_query = db.query(ApplicationSection).options(
+            joinedload(ApplicationSection.questions),
+            joinedload(ApplicationSection.headers)
+        ).filter(
+            ApplicationSection.is_active == True
+        )
+
+        # Filter sections by required_status (applicant vs camper)
+        if app_status == 'applicant':
+            sections_query = sections_query.filter(
+                (ApplicationSection.required_status == None) |
+                (ApplicationSection.required_status == 'applicant')
+            )
+
+        sections = []
+        for section in sections_query.order_by(ApplicationSection.order_index).all():
+            data = form_section_projection(section)
+            # Filter questions and headers by is_active
+            data["questions"] = [q for q in data["questions"] if q["is_active"]]
+            data["headers"] = [h for h in data["headers"] if h["is_active"]]
+            sections.append(data)
+        return sections
+
+    return form_cache.get_or_load(cache_key, load)
+
+
+@router.get("/sections")
 async def get_application_sections(
     application_id: Optional[str] = None,
     db: Session = Depends(get_db),
@@ -64,31 +120,8 @@ async def get_application_sections(
             app_status = application.status
             app_sub_status = application.sub_status
 
-    # Build query for sections with eager-loaded questions and headers (single query instead of N+1)
-    sections_query = db.query(ApplicationSection).options(
-        joinedload(ApplicationSection.questions),
-        joinedload(ApplicationSection.headers)
-    ).filter(
-        ApplicationSection.is_active == True
-    )
-
-    # Filter sections by required_status (applicant vs camper)
-    if app_status == 'applicant':
-        # Applicants see sections with required_status=NULL or 'applicant'
-        sections_query = sections_query.filter(
-            (ApplicationSection.required_status == None) |
-            (ApplicationSection.required_status == 'applicant')
-        )
-    # Campers see all sections (no required_status filter)
-
-    sections = sections_query.order_by(ApplicationSection.order_index).all()
-
-    # Filter questions and headers by is_active
-    for section in sections:
-        section.questions = [q for q in section.questions if q.is_active]
-        section.headers = [h for h in section.headers if h.is_active]
-
-    return sections
+    # Form definition from the per-process cache (evicted by application builder writes)
+    return FastJSONResponse(get_form_definition(db, app_status))
 
 
 @router.post("", response_model=ApplicationSchema, status_code=status.HTTP_201_CREATED)
@@ -148,62 +181,129 @@ async def get_my_applications(
     if not applications:
         return []
 
+    # Profile photo URLs for all applications, signed in ONE storage request
+    photo_urls = get_profile_photo_urls(db, applications)
+
+    results = []
+    for app in applications:
+        app_dict = application_projection(app)
+        app_dict['profile_photo_url'] = photo_urls.get(app.id)
+        results.append(app_dict)
+
+    return FastJSONResponse(results)
+
+
+@router.get("/dashboard")
+async def get_family_dashboard(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Everything the family dashboard shows, in one request.
+
+    For each of the user's applications: the application (with profile photo
+    URL), its progress and its payment summary. Uses a constant number of
+    queries however many children a parent has, and signs all photo URLs
+    in one storage request.
+    """
+    from app.api.invoices import build_payment_summary
+
+    applications = db.query(Application).filter(
+        Application.user_id == current_user.id
+    ).order_by(Application.created_at).all()
+
+    if not applications:
+        return FastJSONResponse({"applications": []})
+
+    application_ids = [app.id for app in applications]
+
+    photo_urls = get_profile_photo_urls(db, applications)
+
+    # All active sections with questions in ONE query, filtered per application status in memory
+    sections = db.query(ApplicationSection).options(
+        joinedload(ApplicationSection.questions)
+    ).filter(
+        ApplicationSection.is_active == True
+    ).order_by(ApplicationSection.order_index).all()
+
+    # All responses of all applications in ONE query
+    responses_by_application = {app_id: [] for app_id in application_ids}
+    for response in db.query(ApplicationResponse).filter(
+        ApplicationResponse.application_id.in_(application_ids)
+    ).all():
+        responses_by_application[response.application_id].append(response)
+
+    # All invoices of all applications in ONE query
+    invoices_by_application = stripe_service.get_invoices_for_applications(db, application_ids)
+
+    results = []
+    for app in applications:
+        app_dict = application_projection(app)
+        app_dict['profile_photo_url'] = photo_urls.get(app.id)
+        progress = compute_progress(
+            app,
+            visible_sections_for(sections, app.status),
+            responses_by_application[app.id]
+        )
+        results.append({
+            "application": app_dict,
+            "progress": progress.model_dump(),
+            "payment": build_payment_summary(str(app.id), invoices_by_application[str(app.id)])
+        })
+
+    return FastJSONResponse({"applications": results})
+
+
+def get_profile_photo_urls(db: Session, applications: List[Application]) -> dict:
+    """
+    application_id -> signed profile photo URL, for the applications that
+    have one. Three queries and one storage request for any number of
+    applications; photos that fail to sign are left out (non-critical).
+    """
     # Get all profile picture question IDs
     profile_picture_questions = db.query(ApplicationQuestion.id).filter(
         ApplicationQuestion.question_type == 'profile_picture',
         ApplicationQuestion.is_active == True
     ).all()
     profile_picture_question_ids = [q.id for q in profile_picture_questions]
+    if not profile_picture_question_ids:
+        return {}
 
-    # Get application IDs
-    application_ids = [app.id for app in applications]
-
-    # Get all responses for profile picture questions across all user's applications
+    # Get all responses for profile picture questions across the applications
     profile_responses = db.query(ApplicationResponse).filter(
-        ApplicationResponse.application_id.in_(application_ids),
+        ApplicationResponse.application_id.in_([app.id for app in applications]),
         ApplicationResponse.question_id.in_(profile_picture_question_ids),
         ApplicationResponse.file_id != None
     ).all()
 
     # Build a map of application_id -> file_id
     app_to_file_id = {resp.application_id: resp.file_id for resp in profile_responses}
+    if not app_to_file_id:
+        return {}
 
     # Get all file records at once
-    file_ids = list(set(app_to_file_id.values()))
-    if file_ids:
-        file_records = db.query(FileModel).filter(
-            FileModel.id.in_(file_ids)
-        ).all()
-        file_map = {f.id: f for f in file_records}
-    else:
-        file_map = {}
-
-    # Generate signed URLs and build response
-    results = []
-    for app in applications:
-        app_dict = ApplicationSchema.model_validate(app).model_dump()
-
-        # Add profile photo URL if available
-        file_id = app_to_file_id.get(app.id)
-        if file_id and file_id in file_map:
-            file_record = file_map[file_id]
-            try:
-                # Generate signed URL (uses default 15-minute expiration)
-                signed_url = storage_service.get_signed_url(file_record.storage_path)
-                app_dict['profile_photo_url'] = signed_url
-            except Exception as e:
-                # Log error but continue - profile photo is non-critical
-                print(f"Failed to get signed URL for profile photo: {e}")
-                app_dict['profile_photo_url'] = None
-        else:
-            app_dict['profile_photo_url'] = None
+    file_records = db.query(FileModel).filter(
+        FileModel.id.in_(set(app_to_file_id.values()))
+    ).all()
+    file_map = {f.id: f for f in file_records}
 
-        results.append(app_dict)
+    try:
+        # Uses default 15-minute expiration
+        signed_urls = storage_service.get_signed_urls([f.storage_path for f in file_records])
+    except Exception as e:
+        # Log error but continue - profile photo is non-critical
+        print(f"Failed to get signed URLs for profile photos: {e}")
+        return {}
 
-    return results
+    photo_urls = {}
+    for app_id, file_id in app_to_file_id.items():
+        file_record = file_map.get(file_id)
+        if file_record and file_record.storage_path in signed_urls:
+            photo_urls[app_id] = signed_urls[file_record.storage_path]
+    return photo_urls
 
 
-@router.get("/admin/sections", response_model=List[ApplicationSectionWithQuestions])
+@router.get("/admin/sections")
 async def get_application_sections_admin(
     application_id: str,
     db: Session = Depends(get_db),
@@ -228,37 +328,14 @@ async def get_application_sections_admin(
     app_status = application.status
     app_sub_status = application.sub_status
 
-    # Build query for sections with eager-loaded questions and headers
-    sections_query = db.query(ApplicationSection).options(
-        joinedload(ApplicationSection.questions),
-        joinedload(ApplicationSection.headers)
-    ).filter(
-        ApplicationSection.is_active == True
-    )
-
-    # Filter sections by required_status (applicant vs camper)
-    if app_status == 'applicant':
-        sections_query = sections_query.filter(
-            (ApplicationSection.required_status == None) |
-            (ApplicationSection.required_status == 'applicant')
-        )
-    # Campers see all sections
-
-    sections = sections_query.order_by(ApplicationSection.order_index).all()
-
-    # Filter questions and headers by is_active
-    for section in sections:
-        section.questions = [q for q in section.questions if q.is_active]
-        section.headers = [h for h in section.headers if h.is_active]
-
-    return sections
+    return FastJSONResponse(get_form_definition(db, app_status))
 
 
 @router.get("/admin/all")
 async def get_all_applications_admin(
     status_filter: Optional[str] = Query(None, description="Filter by status"),
     search: Optional[str] = Query(None, description="Search by camper name or user email"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """
@@ -332,7 +409,7 @@ async def get_all_applications_admin(
     # Convert to dict and add approval information
     result = []
     for app in applications:
-        app_dict = ApplicationWithUser.model_validate(app).model_dump()
+        app_dict = application_with_user_projection(app)
 
         # Add approval stats
         approvals = [a for a in app.approvals if a.approved]
@@ -368,14 +445,15 @@ async def get_all_applications_admin(
 
         result.append(app_dict)
 
-    return result
+    return FastJSONResponse(result)
 
 
 @router.get("/admin/{application_id}", response_model=ApplicationWithUser)
 async def get_application_admin(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: User = Depends(get_current_admin_user),
+    etag: Optional[str] = Depends(application_etag("application-admin"))
 ):
     """
     Admin-only: Get any application with all responses and user info
@@ -402,7 +480,8 @@ async def get_application_admin(
 async def get_application(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    etag: Optional[str] = Depends(application_etag("application"))
 ):
     """
     Get a specific application with all responses (user must own the application)
@@ -425,6 +504,271 @@ async def get_application(
     return application
 
 
+@router.get("/{application_id}/responses", response_model=ApplicationResponsesDelta)
+async def get_application_responses(
+    application_id: str,
+    since: Optional[int] = Query(None, ge=0, description="Revision from the previous sync (omit for all responses)"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Delta sync: responses created, updated or deleted after revision `since`.
+
+    Returns the application's current revision to pass as `since` next time;
+    when nothing changed, `responses` and `deleted_question_ids` are empty.
+    Users can only sync their own applications. Admins can sync any.
+    """
+    query = db.query(Application.revision).filter(Application.id == application_id)
+    if current_user.role not in ['admin', 'super_admin']:
+        query = query.filter(Application.user_id == current_user.id)
+
+    # Read the revision BEFORE the responses: writers stamp revisions under a
+    # lock on the application row, so every write tagged <= revision is
+    # already committed and visible to the queries below. Rows newer than
+    # revision may also come back; the client just sees them again next sync.
+    revision = query.scalar()
+    if revision is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+
+    responses_query = db.query(ApplicationResponse).filter(
+        ApplicationResponse.application_id == application_id
+    )
+    deleted_question_ids = []
+    if since is not None:
+        responses_query = responses_query.filter(ApplicationResponse.revision > since)
+        deleted_question_ids = [row[0] for row in db.execute(
+            text("""
+                SELECT question_id FROM application_response_tombstones
+                WHERE application_id = :application_id AND revision > :since
+            """),
+            {"application_id": application_id, "since": since}
+        ).fetchall()]
+
+    return {
+        "revision": revision,
+        "responses": responses_query.all(),
+        "deleted_question_ids": deleted_question_ids
+    }
+
+
+def get_viewable_application(db: Session, application_id: str, current_user: User) -> Application:
+    """Application the user owns (admins: any), else 404 so IDs can't be probed"""
+    query = db.query(Application).filter(Application.id == application_id)
+    if current_user.role not in ['admin', 'super_admin']:
+        query = query.filter(Application.user_id == current_user.id)
+    application = query.first()
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    return application
+
+
+@router.get("/{application_id}/sections/summary", response_model=List[SectionSummary])
+async def get_section_summaries(
+    application_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Per-section counts for an application, in one aggregate query.
+
+    Cheap enough to call on page load: the form renders the section the
+    family is on, then prefetches the next sections (largest first, or
+    those whose revision changed since they were cached) in the background.
+    """
+    application = get_viewable_application(db, application_id, current_user)
+
+    rows = db.execute(
+        text("""
+            SELECT s.id, s.title, s.order_index,
+                   COUNT(q.id) AS question_count,
+                   COUNT(r.id) FILTER (
+                       WHERE r.file_id IS NOT NULL OR NULLIF(btrim(r.response_value), '') IS NOT NULL
+                   ) AS response_count,
+                   COUNT(r.file_id) AS file_count,
+                   (SELECT COUNT(*) FROM medications m
+                    JOIN application_questions mq ON mq.id = m.question_id
+                    WHERE mq.section_id = s.id AND m.application_id = :application_id) AS medication_count,
+                   (SELECT COUNT(*) FROM allergies a
+                    JOIN application_questions aq ON aq.id = a.question_id
+                    WHERE aq.section_id = s.id AND a.application_id = :application_id) AS allergy_count,
+                   COALESCE(MAX(r.revision), 0) AS revision
+            FROM application_sections s
+            LEFT JOIN application_questions q ON q.section_id = s.id AND q.is_active = true
+            LEFT JOIN application_responses r ON r.question_id = q.id AND r.application_id = :application_id
+            WHERE s.is_active = true
+              AND (:all_sections OR s.required_status IS NULL OR s.required_status = 'applicant')
+            GROUP BY s.id, s.title, s.order_index
+            ORDER BY s.order_index
+        """),
+        {
+            "application_id": application_id,
+            # Applicants see sections with required_status NULL or 'applicant'; campers see all
+            "all_sections": application.status != 'applicant'
+        }
+    ).fetchall()
+
+    return [
+        {
+            "section_id": row.id,
+            "section_title": row.title,
+            "order_index": row.order_index,
+            "question_count": row.question_count,
+            "response_count": row.response_count,
+            "file_count": row.file_count,
+            "medication_count": row.medication_count,
+            "allergy_count": row.allergy_count,
+            "revision": row.revision
+        }
+        for row in rows
+    ]
+
+
+@router.get("/{application_id}/sections/{section_id}/responses", response_model=SectionResponses)
+async def get_section_responses(
+    application_id: str,
+    section_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Responses, files, medications and allergies for one section.
+
+    Lets the form render the section the family is working on without
+    loading every response of the application first.
+    """
+    application = get_viewable_application(db, application_id, current_user)
+
+    question_ids = [row.id for row in db.query(ApplicationQuestion.id).filter(
+        ApplicationQuestion.section_id == section_id
+    ).all()]
+    if not question_ids:
+        section_exists = db.query(ApplicationSection.id).filter(ApplicationSection.id == section_id).first()
+        if not section_exists:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Section not found"
+            )
+        return {"section_id": section_id, "revision": application.revision}
+
+    responses = db.query(ApplicationResponse).filter(
+        ApplicationResponse.application_id == application_id,
+        ApplicationResponse.question_id.in_(question_ids)
+    ).all()
+
+    medications = db.query(Medication).options(
+        joinedload(Medication.doses)
+    ).filter(
+        Medication.application_id == application_id,
+        Medication.question_id.in_(question_ids)
+    ).order_by(Medication.order_index).all()
+
+    allergies = db.query(Allergy).filter(
+        Allergy.application_id == application_id,
+        Allergy.question_id.in_(question_ids)
+    ).order_by(Allergy.order_index).all()
+
+    file_ids = [r.file_id for r in responses if r.file_id is not None]
+    file_records = db.query(FileModel).filter(FileModel.id.in_(file_ids)).all() if file_ids else []
+
+    files = signed_file_entries(file_records)
+
+    return {
+        "section_id": section_id,
+        "revision": application.revision,
+        "responses": responses,
+        "files": files,
+        "medications": medications,
+        "allergies": allergies
+    }
+
+
+def find_response_conflicts(
+    base_revision: Optional[int],
+    incoming: List[ApplicationResponseCreate],
+    existing_responses_map: dict
+) -> List[dict]:
+    """
+    Responses in an update that someone else changed after `base_revision`
+    to a different value. Stale writes to responses nobody else touched
+    merge normally; identical values are not conflicts.
+    """
+    if base_revision is None:
+        return []
+
+    conflicts = []
+    for response_data in incoming:
+        existing = existing_responses_map.get(str(response_data.question_id))
+        if existing is None or (existing.revision or 0) <= base_revision:
+            continue
+        same_value = existing.response_value == response_data.response_value
+        same_file = str(existing.file_id or '') == str(response_data.file_id or '')
+        if not (same_value and same_file):
+            conflicts.append({
+                "question_id": str(existing.question_id),
+                "response_value": existing.response_value,
+                "file_id": str(existing.file_id) if existing.file_id else None,
+                "revision": existing.revision
+            })
+    return conflicts
+
+
+def upsert_responses(
+    db: Session,
+    application_id: str,
+    incoming: List[ApplicationResponseCreate],
+    existing_responses: List[ApplicationResponse]
+) -> None:
+    """
+    Save autosaved responses in ONE INSERT ... ON CONFLICT statement, so the
+    statement-level revision triggers (migration 043) bump and lock the
+    application row once per save, not once per response row.
+    """
+    latest = {str(r.question_id): r for r in incoming}  # Last value wins for a repeated question
+    db.execute(
+        text("""
+            INSERT INTO application_responses (application_id, question_id, response_value, file_id)
+            SELECT CAST(:application_id AS uuid), r.question_id, r.response_value, r.file_id
+            FROM unnest(
+                CAST(:question_ids AS uuid[]),
+                CAST(:response_values AS text[]),
+                CAST(:file_ids AS uuid[])
+            ) AS r(question_id, response_value, file_id)
+            ON CONFLICT (application_id, question_id) DO UPDATE
+            SET response_value = EXCLUDED.response_value,
+                file_id = EXCLUDED.file_id,
+                updated_at = NOW()
+        """),
+        {
+            'application_id': str(application_id),
+            'question_ids': list(latest),
+            'response_values': [r.response_value for r in latest.values()],
+            'file_ids': [str(r.file_id) if r.file_id else None for r in latest.values()],
+        }
+    )
+    # Loaded rows are stale now; reload them if read again (completion check)
+    for response in existing_responses:
+        db.expire(response)
+
+
+def raise_on_response_conflicts(application: Application, conflicts: List[dict]) -> None:
+    """409 with the current server values, so the client can re-apply or discard its edits"""
+    if conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail={
+                "message": "Some responses were changed by someone else since your last sync",
+                "revision": application.revision,
+                "conflicts": conflicts
+            }
+        )
+
+
 @router.patch("/{application_id}", response_model=ApplicationSchema)
 async def update_application(
     application_id: str,
@@ -439,11 +783,16 @@ async def update_application(
     - Updating basic application info
     - Saving/updating responses to questions
     - Calculating completion percentage
+
+    With `base_revision`, responses changed by someone else since that
+    revision are rejected with 409 (optimistic concurrency).
     """
+    # Lock the row so concurrent autosaves (two tabs, parent + admin) apply
+    # one after the other and the conflict check below sees the latest state
     application = db.query(Application).filter(
         Application.id == application_id,
         Application.user_id == current_user.id
-    ).first()
+    ).with_for_update().first()
 
     if not application:
         raise HTTPException(
@@ -466,6 +815,11 @@ async def update_application(
         ).all()
         existing_responses_map = {str(r.question_id): r for r in existing_responses_list}
 
+        raise_on_response_conflicts(
+            application,
+            find_response_conflicts(update_data.base_revision, update_data.responses, existing_responses_map)
+        )
+
         # OPTIMIZED: Pre-load all questions being updated in ONE query
         # This eliminates N individual queries for camper name sync
         question_ids = [r.question_id for r in update_data.responses]
@@ -474,25 +828,10 @@ async def update_application(
         ).all()
         questions_map = {str(q.id): q for q in questions_list}
 
+        upsert_responses(db, application_id, update_data.responses, existing_responses_list)
+
         for response_data in update_data.responses:
-            # Check if response already exists using pre-loaded map (O(1) lookup)
-            # Use str() to ensure consistent key format (handles both UUID and string types)
             question_id_str = str(response_data.question_id)
-            existing_response = existing_responses_map.get(question_id_str)
-
-            if existing_response:
-                # Update existing response
-                existing_response.response_value = response_data.response_value
-                existing_response.file_id = response_data.file_id
-            else:
-                # Create new response
-                new_response = ApplicationResponse(
-                    application_id=application_id,
-                    question_id=response_data.question_id,
-                    response_value=response_data.response_value,
-                    file_id=response_data.file_id
-                )
-                db.add(new_response)
 
             # Sync camper name fields to applications table when those questions are updated
             # This keeps the denormalized columns in sync with the response values
@@ -752,54 +1091,19 @@ async def withdraw_application(
     }
 
 
-@router.get("/{application_id}/progress", response_model=ApplicationProgress)
-async def get_application_progress(
-    application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
-):
-    """
-    Get detailed progress for an application
-
-    Returns completion status for each section and overall progress
-    """
-    application = db.query(Application).filter(
-        Application.id == application_id,
-        Application.user_id == current_user.id
-    ).first()
-
-    if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Application not found"
-        )
-
-    # Get application status for conditional filtering
-    app_status = application.status  # 'applicant', 'camper', 'inactive'
-    app_sub_status = application.sub_status  # Progress within status
-
-    # OPTIMIZED: Load sections with questions in ONE query (not N+1)
-    sections_query = db.query(ApplicationSection).options(
-        joinedload(ApplicationSection.questions)
-    ).filter(
-        ApplicationSection.is_active == True
-    )
-
-    # Filter sections by required_status (applicant vs camper)
+def visible_sections_for(sections: list, app_status: Optional[str]) -> list:
+    """Filter pre-loaded active sections by required_status (applicants don't see camper-only sections)"""
     if app_status == 'applicant':
-        sections_query = sections_query.filter(
-            (ApplicationSection.required_status == None) |
-            (ApplicationSection.required_status == 'applicant')
-        )
+        return [s for s in sections if s.required_status in (None, 'applicant')]
     # Campers see all sections
+    return sections
 
-    sections = sections_query.order_by(ApplicationSection.order_index).all()
-
-    # Get all responses for this application (we need these to evaluate conditional logic)
-    all_responses = db.query(ApplicationResponse).filter(
-        ApplicationResponse.application_id == application_id
-    ).all()
 
+def compute_progress(application: Application, sections: list, all_responses: list) -> ApplicationProgress:
+    """
+    Progress for an application from pre-loaded data: the sections its
+    status can see (questions loaded) and all of its responses
+    """
     # Create a dict of question_id -> response_value for quick lookup
     response_dict = {str(r.question_id): r.response_value for r in all_responses}
 
@@ -892,6 +1196,58 @@ async def get_application_progress(
     )
 
 
+@router.get("/{application_id}/progress", response_model=ApplicationProgress)
+async def get_application_progress(
+    application_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get detailed progress for an application
+
+    Returns completion status for each section and overall progress
+    """
+    application = db.query(Application).filter(
+        Application.id == application_id,
+        Application.user_id == current_user.id
+    ).first()
+
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+
+    # Get application status for conditional filtering
+    app_status = application.status  # 'applicant', 'camper', 'inactive'
+    app_sub_status = application.sub_status  # Progress within status
+
+    # OPTIMIZED: Load sections with questions in ONE query (not N+1)
+    sections_query = db.query(ApplicationSection).options(
+        joinedload(ApplicationSection.questions)
+    ).filter(
+        ApplicationSection.is_active == True
+    )
+
+    # Filter sections by required_status (applicant vs camper)
+    if app_status == 'applicant':
+        sections_query = sections_query.filter(
+            (ApplicationSection.required_status == None) |
+            (ApplicationSection.required_status == 'applicant')
+        )
+    # Campers see all sections
+
+    sections = sections_query.order_by(ApplicationSection.order_index).all()
+
+    # Get all responses for this application (we need these to evaluate conditional logic)
+    all_responses = db.query(ApplicationResponse).filter(
+        ApplicationResponse.application_id == application_id
+    ).all()
+
+    return compute_progress(application, sections, all_responses)
+
+
+@profiled_section("completion")
 def calculate_completion_for_status(db: Session, application_id: str, target_status: str) -> int:
     """
     Calculate completion percentage assuming a specific status.
@@ -965,6 +1321,7 @@ def calculate_completion_for_status(db: Session, application_id: str, target_sta
     return int((completed_sections / sections_with_requirements) * 100)
 
 
+@profiled_section("completion")
 def calculate_completion_percentage(db: Session, application_id: str) -> int:
     """
     Calculate the completion percentage for an application.
@@ -6,8 +6,6 @@ from datetime import datetime
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
-from google.oauth2 import id_token
-from google.auth.transport import requests as google_requests
 
 from app.core.database import get_db
 from app.core.security import create_access_token
@@ -40,6 +38,10 @@ async def google_auth(auth_data: GoogleAuthRequest, db: Session = Depends(get_db
     - JWT access token
     - User information
     """
+    # Imported here: google-auth is only needed for this endpoint
+    from google.oauth2 import id_token
+    from google.auth.transport import requests as google_requests
+
     try:
         # Verify the Google ID token
         idinfo = id_token.verify_oauth2_token(
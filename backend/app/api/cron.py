@@ -6,12 +6,18 @@ Vercel Cron Configuration (vercel.json):
 {
   "crons": [
     { "path": "/api/cron/process-queue", "schedule": "*/5 * * * *" },
-    { "path": "/api/cron/scheduled-automations", "schedule": "0 * * * *" }
+    { "path": "/api/cron/process-jobs", "schedule": "*/5 * * * *" },
+    { "path": "/api/cron/scheduled-automations", "schedule": "0 * * * *" },
+    { "path": "/api/cron/log-maintenance", "schedule": "30 3 * * *" }
   ]
 }
 
 The scheduled-automations endpoint is called hourly and processes email automations
 from the email_automations table based on their configured schedule_day and schedule_hour.
+
+The same workloads are registered as scheduled tasks (@scheduled_task) and run
+by the worker's scheduler (app/services/scheduler.py). These endpoints go
+through the scheduler too, so each tick runs once whichever trigger fires first.
 """
 
 from datetime import datetime, timezone, timedelta
@@ -25,8 +31,10 @@ from app.core.config import settings
 from app.models.user import User
 from app.models.application import Application
 from app.models.super_admin import SystemConfiguration
-from app.services import email_service
+from app.services import email_service, log_retention, job_queue, scheduler
+from app.services.scheduler import scheduled_task
 from app.services.scheduled_emails import process_all_due_automations
+from app.services.send_ledger import SendLedger
 
 router = APIRouter()
 
@@ -90,16 +98,59 @@ def get_config_value(db: Session, key: str, default=None):
     return default
 
 
+def trigger_scheduled_task(name: str) -> dict:
+    """
+    Run the current tick of a scheduled task for a Vercel Cron request.
+
+    Goes through the scheduler, so the tick is skipped when a worker's
+    scheduler (or an overlapping/retried trigger) has it or already ran it.
+    Handlers are sync: scheduled tasks may start their own event loop.
+    """
+    outcome = scheduler.run_task(name, trigger='http')
+
+    response = {
+        "success": outcome['status'] != 'failed',
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "slot": outcome['slot'],
+    }
+    if outcome['status'] in ('locked', 'already_ran'):
+        response["skipped"] = outcome['status']
+    elif outcome['status'] == 'failed':
+        response["error"] = outcome['error']
+    else:
+        response.update(outcome['result'] or {})
+    return response
+
+
+@scheduled_task("process_email_queue", every_seconds=300)
+def process_email_queue_task(db: Session, slot: datetime) -> dict:
+    return email_service.process_email_queue(db, batch_size=20)
+
+
 @router.get("/process-queue")
-async def process_email_queue(
-    db: Session = Depends(get_db),
+def process_email_queue(
     authorized: bool = Depends(verify_cron_secret)
 ):
     """
     Process pending emails in the queue.
     Should be called every 5 minutes by Vercel Cron.
     """
-    result = email_service.process_email_queue(db, batch_size=20)
+    return trigger_scheduled_task("process_email_queue")
+
+
+@router.get("/process-jobs")
+def process_background_jobs(
+    db: Session = Depends(get_db),
+    authorized: bool = Depends(verify_cron_secret)
+):
+    """
+    Run due background jobs and re-queue stale ones.
+    Should be called every 5 minutes by Vercel Cron; picks up jobs no worker
+    or in-process run has taken (e.g. retries waiting out their backoff).
+
+    Sync (runs in the threadpool): job handlers may start their own event loop.
+    """
+    result = job_queue.process_jobs(db, batch_size=5)
 
     return {
         "success": True,
@@ -163,6 +214,12 @@ async def send_weekly_emails(
     }
 
 
+def weekly_period(now: Optional[datetime] = None) -> str:
+    """ISO week of the weekly emails' send ledger entries, e.g. '2026-W42'"""
+    year, week, _ = (now or datetime.now(timezone.utc)).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
 async def send_admin_digest(db: Session, camp_year: int) -> dict:
     """Send weekly digest to all admins and super admins"""
 
@@ -225,10 +282,17 @@ async def send_admin_digest(db: Session, camp_year: int) -> dict:
 
     digest_date = datetime.now().strftime('%B %d, %Y')
 
+    # A re-run in the same week only sends to admins that didn't get it yet
+    ledger = SendLedger(db, "reminder:admin_digest", weekly_period())
+    pending = ledger.unsent(admins, lambda admin: (admin.email, None))
+
     sent_count = 0
-    for admin in admins:
+    for admin in pending:
         try:
-            email_service.send_template_email(
+            idempotency_key = ledger.claim(admin.email)
+            if idempotency_key is None:
+                continue
+            send_result = email_service.send_template_email(
                 db=db,
                 to_email=admin.email,
                 template_key='admin_digest',
@@ -247,13 +311,16 @@ async def send_admin_digest(db: Session, camp_year: int) -> dict:
                     'paidCampers': paid_campers,
                 },
                 to_name=f"{admin.first_name} {admin.last_name}",
-                user_id=admin.id
+                user_id=admin.id,
+                idempotency_key=idempotency_key
             )
-            sent_count += 1
+            ledger.record(admin.email, None, send_result)
+            if send_result.get('success'):
+                sent_count += 1
         except Exception as e:
             print(f"Failed to send digest to {admin.email}: {e}")
 
-    return {"sent": sent_count}
+    return {"sent": sent_count, "already_sent": len(admins) - len(pending)}
 
 
 async def send_payment_reminders(db: Session, camp_year: int) -> dict:
@@ -268,13 +335,19 @@ async def send_payment_reminders(db: Session, camp_year: int) -> dict:
         User.receive_emails == True
     ).all()
 
+    ledger = SendLedger(db, "reminder:payment_reminder", weekly_period())
+    pending = ledger.unsent(unpaid_applications, lambda row: (row[1].email, row[0].id))
+
     sent_count = 0
-    for app, user in unpaid_applications:
+    for app, user in pending:
         try:
+            idempotency_key = ledger.claim(user.email, app.id)
+            if idempotency_key is None:
+                continue
             camper_first = app.camper_first_name or ''
             camper_last = app.camper_last_name or ''
             camper_name = f"{camper_first} {camper_last}".strip() or "your camper"
-            email_service.send_template_email(
+            send_result = email_service.send_template_email(
                 db=db,
                 to_email=user.email,
                 template_key='payment_reminder',
@@ -287,13 +360,16 @@ async def send_payment_reminders(db: Session, camp_year: int) -> dict:
                 },
                 to_name=f"{user.first_name} {user.last_name}",
                 user_id=user.id,
-                application_id=app.id
+                application_id=app.id,
+                idempotency_key=idempotency_key
             )
-            sent_count += 1
+            ledger.record(user.email, app.id, send_result)
+            if send_result.get('success'):
+                sent_count += 1
         except Exception as e:
             print(f"Failed to send payment reminder to {user.email}: {e}")
 
-    return {"sent": sent_count}
+    return {"sent": sent_count, "already_sent": len(unpaid_applications) - len(pending)}
 
 
 async def send_incomplete_reminders(db: Session, camp_year: int) -> dict:
@@ -309,13 +385,19 @@ async def send_incomplete_reminders(db: Session, camp_year: int) -> dict:
         User.receive_emails == True
     ).all()
 
+    ledger = SendLedger(db, "reminder:incomplete_reminder", weekly_period())
+    pending = ledger.unsent(incomplete_applications, lambda row: (row[1].email, row[0].id))
+
     sent_count = 0
-    for app, user in incomplete_applications:
+    for app, user in pending:
         try:
+            idempotency_key = ledger.claim(user.email, app.id)
+            if idempotency_key is None:
+                continue
             camper_first = app.camper_first_name or ''
             camper_last = app.camper_last_name or ''
             camper_name = f"{camper_first} {camper_last}".strip() or "your camper"
-            email_service.send_template_email(
+            send_result = email_service.send_template_email(
                 db=db,
                 to_email=user.email,
                 template_key='incomplete_reminder',
@@ -329,13 +411,16 @@ async def send_incomplete_reminders(db: Session, camp_year: int) -> dict:
                 },
                 to_name=f"{user.first_name} {user.last_name}",
                 user_id=user.id,
-                application_id=app.id
+                application_id=app.id,
+                idempotency_key=idempotency_key
             )
-            sent_count += 1
+            ledger.record(user.email, app.id, send_result)
+            if send_result.get('success'):
+                sent_count += 1
         except Exception as e:
             print(f"Failed to send incomplete reminder to {user.email}: {e}")
 
-    return {"sent": sent_count}
+    return {"sent": sent_count, "already_sent": len(incomplete_applications) - len(pending)}
 
 
 @router.post("/admin-digest")
@@ -371,9 +456,14 @@ async def trigger_incomplete_reminders(
     return {"success": True, **result}
 
 
+@scheduled_task("scheduled_automations", every_seconds=3600, catch_up=True)
+async def scheduled_automations_task(db: Session, slot: datetime) -> dict:
+    camp_year = get_config_value(db, 'camp_year', datetime.now().year)
+    return await process_all_due_automations(db, camp_year, at=slot)
+
+
 @router.get("/scheduled-automations")
-async def send_scheduled_automations(
-    db: Session = Depends(get_db),
+def send_scheduled_automations(
     authorized: bool = Depends(verify_cron_secret)
 ):
     """
@@ -393,11 +483,32 @@ async def send_scheduled_automations(
     This is the data-driven replacement for the hardcoded weekly-emails endpoint,
     allowing admins to configure scheduled emails via the super admin UI.
     """
-    camp_year = get_config_value(db, 'camp_year', datetime.now().year)
-    results = await process_all_due_automations(db, camp_year)
+    return trigger_scheduled_task("scheduled_automations")
 
-    return {
-        "success": True,
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        **results
+
+@scheduled_task("log_maintenance", every_seconds=86400, offset_seconds=3 * 3600 + 30 * 60)
+def log_maintenance_task(db: Session, slot: datetime) -> dict:
+    config = {
+        'audit_log_retention_months': get_config_value(db, 'audit_log_retention_months', 24),
+        'email_log_retention_months': get_config_value(db, 'email_log_retention_months', 12),
+        'email_queue_archive_days': get_config_value(db, 'email_queue_archive_days', 30),
+        'scheduler_run_retention_days': get_config_value(db, 'scheduler_run_retention_days', 30),
+        'email_send_ledger_retention_days': get_config_value(db, 'email_send_ledger_retention_days', 90),
     }
+    return log_retention.run_log_maintenance(db, config)
+
+
+@router.get("/log-maintenance")
+def run_log_maintenance(
+    authorized: bool = Depends(verify_cron_secret)
+):
+    """
+    Daily log housekeeping:
+    - Pre-create monthly audit_logs / email_logs partitions
+    - Drop partitions past their retention window
+    - Archive old completed email_queue rows
+    - Prune old scheduler run history
+
+    Should be called once a day by Vercel Cron.
+    """
+    return trigger_scheduled_task("log_maintenance")
@@ -12,13 +12,17 @@ from pydantic import BaseModel, EmailStr
 from uuid import UUID
 import os
 
-from app.core.database import get_db
+from app.core.database import get_db, get_read_db
 from app.core.deps import get_current_super_admin_user, get_current_admin_user, get_current_user
 from app.core.config import get_settings
+from app.core.serialization import FastJSONResponse
 from app.models.user import User
 from app.models.application import Application
 from app.models.super_admin import EmailTemplate, EmailDocument, AuditLog
 from app.services import email_service
+from app.services.job_queue import JobContext
+from app.services.send_ledger import SendLedger
+from app.schemas.job import JobAccepted
 from app.core.audit import log_audit_event, ENTITY_EMAIL
 
 settings = get_settings()
@@ -260,18 +264,45 @@ async def send_adhoc_email(
 # MASS EMAIL ENDPOINTS
 # ============================================================================
 
-@router.post("/send-mass")
+@router.post("/send-mass", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def send_mass_email(
     request: SendMassEmailRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
-    """Send mass emails immediately (super admin only)"""
+    """
+    Send mass emails (super admin only).
+
+    Sending runs as a 'mass_email' background job: the response is 202 with a
+    job_id; the job reports progress per recipient and its result is
+    {success, sent_count, failed_count, message, errors}.
+    """
+    from app.api.jobs import accept_job
+    return accept_job(db, background_tasks, 'mass_email', request.model_dump(), current_user)
+
+
+def send_mass_email_batch(
+    db: Session,
+    request: SendMassEmailRequest,
+    actor_id: UUID,
+    job: Optional[JobContext] = None
+) -> dict:
+    """
+    Render and send a mass email to each recipient, then audit it.
 
+    As a job, sends go through the send ledger (keyed by the job id), so a
+    re-run after the job died only sends to the recipients that are left.
+    """
     sent_count = 0
     failed_count = 0
     errors = []
+    recipients = request.recipients
+
+    ledger = SendLedger(db, "mass_email", str(job.job_id)) if job else None
+    if ledger:
+        recipients = ledger.unsent(recipients, lambda r: (r.email, r.application_id))
+        sent_count = len(request.recipients) - len(recipients)  # By an earlier attempt
 
     # Get base variables for template substitution
     base_vars = email_service.get_base_variables(db)
@@ -283,8 +314,20 @@ async def send_mass_email(
     if request.template_key:
         template_vars = get_template_specific_variables(db, request.template_key, base_vars.get('campYear', 2026))
 
-    for recipient in request.recipients:
+    already_sent = sent_count
+    for index, recipient in enumerate(recipients):
+        # Stops here when cancelled: emails already sent stay sent
+        if job:
+            job.progress(already_sent + index, len(request.recipients), f"Sent {sent_count}, failed {failed_count}")
+
+        idempotency_key = None
         try:
+            if ledger:
+                idempotency_key = ledger.claim(recipient.email, recipient.application_id)
+                if idempotency_key is None:
+                    sent_count += 1  # Sent (or being sent) by another attempt
+                    continue
+
             # Build recipient-specific variables
             recipient_vars = {
                 **base_vars,
@@ -347,8 +390,11 @@ async def send_mass_email(
                 user_id=UUID(recipient.user_id) if recipient.user_id else None,
                 application_id=UUID(recipient.application_id) if recipient.application_id else None,
                 template_key=request.template_key,
-                email_type='mass'
+                email_type='mass',
+                idempotency_key=idempotency_key
             )
+            if ledger:
+                ledger.record(recipient.email, recipient.application_id, result)
 
             if result['success']:
                 sent_count += 1
@@ -357,6 +403,9 @@ async def send_mass_email(
                 errors.append({'email': recipient.email, 'error': result.get('error')})
 
         except Exception as e:
+            db.rollback()
+            if idempotency_key:
+                ledger.record(recipient.email, recipient.application_id, {'error': str(e)})
             failed_count += 1
             errors.append({'email': recipient.email, 'error': str(e)})
 
@@ -365,7 +414,7 @@ async def send_mass_email(
         db=db,
         entity_type=ENTITY_EMAIL,
         action='mass_email_sent',
-        actor_id=current_user.id,
+        actor_id=actor_id,
         details={
             'subject': request.subject,
             'total_recipients': len(request.recipients),
@@ -388,7 +437,7 @@ async def get_email_audience(
     status_filter: Optional[str] = Query(None, description="Filter by status (applicant, camper, inactive)"),
     sub_status_filter: Optional[str] = Query(None, description="Filter by sub_status"),
     paid_filter: Optional[bool] = Query(None, description="Filter by payment status"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
     """Get potential email recipients based on filters (super admin only)"""
@@ -429,14 +478,14 @@ async def get_email_audience(
 # EMAIL LOGS ENDPOINTS
 # ============================================================================
 
-@router.get("/logs", response_model=List[EmailLogResponse])
+@router.get("/logs")
 async def get_email_logs(
     email_type: Optional[str] = Query(None, description="Filter by email type"),
     recipient_email: Optional[str] = Query(None, description="Filter by recipient email"),
     application_id: Optional[str] = Query(None, description="Filter by application ID"),
     skip: int = Query(0, ge=0),
     limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
     """Get email logs (super admin only)"""
@@ -469,22 +518,23 @@ async def get_email_logs(
     result = db.execute(text(query), params)
     logs = result.fetchall()
 
-    return [
-        EmailLogResponse(
-            id=str(log[0]),
-            recipient_email=log[1],
-            recipient_name=log[2],
-            subject=log[3],
-            template_used=log[4],
-            email_type=log[5],
-            status=log[6],
-            error_message=log[7],
-            sent_at=log[8],
-            user_id=log[9],
-            application_id=log[10]
-        )
+    # Rows map 1:1 onto EmailLogResponse, so encode them directly
+    return FastJSONResponse([
+        {
+            "id": str(log[0]),
+            "recipient_email": log[1],
+            "recipient_name": log[2],
+            "subject": log[3],
+            "template_used": log[4],
+            "email_type": log[5],
+            "status": log[6],
+            "error_message": log[7],
+            "sent_at": log[8],
+            "user_id": log[9],
+            "application_id": log[10]
+        }
         for log in logs
-    ]
+    ])
 
 
 @router.get("/logs/stats")
@@ -264,6 +264,45 @@ async def get_template_file(
         raise HTTPException(status_code=500, detail=f"Failed to get template file: {str(e)}")
 
 
+def signed_file_entries(file_records: List[FileModel]) -> List[dict]:
+    """
+    Metadata + download URL for each file, signed in ONE storage request.
+    If the batch request fails, files are signed one by one instead; files
+    storage still fails to sign are logged and left out.
+    """
+    if not file_records:
+        return []
+
+    try:
+        # Uses default 15-minute expiration
+        signed_urls = storage_service.get_signed_urls([f.storage_path for f in file_records])
+    except Exception as e:
+        print(f"[FILES] Failed to get signed URLs for {len(file_records)} file(s), signing one by one: {e}")
+        signed_urls = {}
+        for file_record in file_records:
+            try:
+                signed_urls[file_record.storage_path] = storage_service.get_signed_url(file_record.storage_path)
+            except Exception:
+                pass  # Logged below with the file ID
+
+    results = []
+    for file_record in file_records:
+        signed_url = signed_urls.get(file_record.storage_path)
+        if not signed_url:
+            # Log error but continue with other files
+            print(f"[FILES] Failed to get signed URL for file {file_record.id} (path: {file_record.storage_path})")
+            continue
+        results.append({
+            "id": str(file_record.id),
+            "filename": file_record.file_name,
+            "size": file_record.file_size,
+            "content_type": file_record.file_type,
+            "url": signed_url,
+            "created_at": file_record.created_at.isoformat()
+        })
+    return results
+
+
 @router.post("/batch")
 async def get_files_batch(
     file_ids: List[str],
@@ -274,6 +313,7 @@ async def get_files_batch(
     Get multiple files' metadata and download URLs in a single request
 
     This is much faster than making individual requests for each file.
+    All URLs are signed in a single storage request.
     """
     if not file_ids:
         return []
@@ -305,30 +345,16 @@ async def get_files_batch(
     else:
         user_app_ids = set()
 
-    results = []
+    # Check authorization
+    accessible_records = []
     for file_record in file_records:
-        # Check authorization
         if file_record.application_id:
             if str(file_record.application_id) not in user_app_ids and current_user.role not in ["admin", "super_admin"]:
                 print(f"[FILES BATCH] Skipping file {file_record.id} - user lacks access (not owner and not admin)")
                 continue  # Skip files user doesn't have access to
+        accessible_records.append(file_record)
 
-        try:
-            # Generate signed URL (uses default 15-minute expiration)
-            signed_url = storage_service.get_signed_url(file_record.storage_path)
-
-            results.append({
-                "id": str(file_record.id),
-                "filename": file_record.file_name,
-                "size": file_record.file_size,
-                "content_type": file_record.file_type,
-                "url": signed_url,
-                "created_at": file_record.created_at.isoformat()
-            })
-        except Exception as e:
-            # Log error but continue with other files
-            print(f"[FILES BATCH] Failed to get signed URL for file {file_record.id} (path: {file_record.storage_path}): {e}")
-            continue
+    results = signed_file_entries(accessible_records)
 
     print(f"[FILES BATCH] Returning {len(results)} files")
     return results
@@ -6,18 +6,20 @@ Handles invoice viewing, management, and payment plan administration
 from typing import List, Optional
 from datetime import datetime, timezone
 from decimal import Decimal
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, BackgroundTasks
 from pydantic import BaseModel, Field
 from sqlalchemy.orm import Session
 from uuid import UUID
 
 from app.core.database import get_db
+from app.core.etag import application_etag
 from app.core.deps import get_current_user, get_current_admin_user
 from app.core.audit import log_application_event
 from app.models.user import User
 from app.models.application import Application, Invoice
 from app.services import stripe_service
 from app.services.email_events import fire_email_event
+from app.schemas.job import JobAccepted
 
 router = APIRouter(prefix="/invoices", tags=["invoices"])
 
@@ -94,16 +96,16 @@ async def get_my_invoices(
     Returns invoices across all of the user's applications.
     """
     # Get all applications for this user
-    applications = db.query(Application).filter(
+    applications = db.query(Application.id).filter(
         Application.user_id == current_user.id
     ).all()
 
+    # OPTIMIZED: all applications' invoices in ONE query (not one per application)
+    invoices_by_application = stripe_service.get_invoices_for_applications(db, [app.id for app in applications])
+
     all_invoices = []
     for app in applications:
-        invoices = stripe_service.get_invoices_for_application(db, app.id)
-        for inv in invoices:
-            inv['application_id'] = str(app.id)
-            all_invoices.append(inv)
+        all_invoices.extend(invoices_by_application[str(app.id)])
 
     return all_invoices
 
@@ -112,7 +114,8 @@ async def get_my_invoices(
 async def get_invoices_for_application(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    etag: Optional[str] = Depends(application_etag("invoices"))
 ):
     """
     Get all invoices for a specific application.
@@ -154,7 +157,8 @@ async def get_invoices_for_application(
 async def admin_get_invoices(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
+    current_user: User = Depends(get_current_admin_user),
+    etag: Optional[str] = Depends(application_etag("invoices-admin"))
 ):
     """
     Admin endpoint to get all invoices for an application.
@@ -471,19 +475,26 @@ async def admin_void_invoice(
     return result
 
 
-@router.post("/admin/application/{application_id}/payment-plan")
+@router.post(
+    "/admin/application/{application_id}/payment-plan",
+    response_model=JobAccepted,
+    status_code=status.HTTP_202_ACCEPTED
+)
 async def admin_create_payment_plan(
     application_id: str,
     plan_request: CreatePaymentPlanRequest,
-    request: Request,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
     """
     Convert an existing invoice to a payment plan with multiple invoices.
     Voids the current invoice and creates new ones based on the plan.
+
+    The Stripe calls run as a 'payment_plan' background job: the response is
+    202 with a job_id, and the job's result is the created plan.
     """
-    application = db.query(Application).filter(
+    application = db.query(Application.id).filter(
         Application.id == application_id
     ).first()
 
@@ -493,45 +504,71 @@ async def admin_create_payment_plan(
             detail="Application not found"
         )
 
-    # Extract payment plan from validated Pydantic model
-    # Amounts are already Decimal from PaymentPlanPayment model
+    # Validate dates up front so bad input is still a 400, not a failed job
     try:
-        payment_amounts = [p.amount for p in plan_request.payments]
-        payment_dates = [
+        for p in plan_request.payments:
             datetime.fromisoformat(p.due_date.replace('Z', '+00:00'))
-            for p in plan_request.payments
-        ]
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Invalid date format: {e}"
         )
 
+    from app.api.jobs import accept_job
+    return accept_job(
+        db,
+        background_tasks,
+        'payment_plan',
+        {
+            'application_id': str(application.id),
+            # Decimal amounts travel as strings to keep their precision
+            'payments': [{'amount': str(p.amount), 'due_date': p.due_date} for p in plan_request.payments]
+        },
+        current_user
+    )
+
+
+async def create_payment_plan_for_application(
+    db: Session,
+    application_id: str,
+    payments: List[dict],
+    actor_id: UUID
+) -> dict:
+    """Create the plan in Stripe, audit it and fire the payment_plan_created email event"""
+    application = db.query(Application).filter(
+        Application.id == application_id
+    ).first()
+
+    if not application:
+        raise ValueError("Application not found")
+
+    payment_amounts = [Decimal(p['amount']) for p in payments]
+    payment_dates = [
+        datetime.fromisoformat(p['due_date'].replace('Z', '+00:00'))
+        for p in payments
+    ]
+
     result = stripe_service.create_payment_plan(
         db=db,
         application_id=UUID(application_id),
         payment_amounts=payment_amounts,
         payment_dates=payment_dates,
-        admin_id=current_user.id
+        admin_id=actor_id
     )
 
     if not result['success']:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=result.get('error', 'Failed to create payment plan')
-        )
+        raise ValueError(result.get('error', 'Failed to create payment plan'))
 
     # Log audit event
     log_application_event(
         db=db,
         action='payment_plan_created',
         application_id=UUID(application_id),
-        actor_id=current_user.id,
+        actor_id=actor_id,
         details={
             'total_payments': result['total_payments'],
             'payment_amounts': [float(a) for a in payment_amounts]
-        },
-        request=request
+        }
     )
 
     # Fire payment_plan_created email event
@@ -569,31 +606,8 @@ async def admin_create_payment_plan(
 # Payment Summary Endpoint
 # =============================================================================
 
-@router.get("/admin/application/{application_id}/summary")
-async def get_payment_summary(
-    application_id: str,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_admin_user)
-):
-    """
-    Get payment summary for an application including:
-    - Total amount owed
-    - Total paid
-    - Outstanding balance
-    - Invoice breakdown
-    """
-    application = db.query(Application).filter(
-        Application.id == application_id
-    ).first()
-
-    if not application:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Application not found"
-        )
-
-    invoices = stripe_service.get_invoices_for_application(db, UUID(application_id))
-
+def build_payment_summary(application_id: str, invoices: List[dict]) -> dict:
+    """Payment totals and invoice breakdown from an application's invoices"""
     total_amount = sum(inv['amount'] for inv in invoices if inv['status'] != 'void')
     total_paid = sum(inv['amount'] for inv in invoices if inv['status'] == 'paid')
     total_discount = sum(inv.get('discount_amount', 0) for inv in invoices)
@@ -622,3 +636,31 @@ async def get_payment_summary(
         },
         'invoices': invoices
     }
+
+
+@router.get("/admin/application/{application_id}/summary")
+async def get_payment_summary(
+    application_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Get payment summary for an application including:
+    - Total amount owed
+    - Total paid
+    - Outstanding balance
+    - Invoice breakdown
+    """
+    application = db.query(Application).filter(
+        Application.id == application_id
+    ).first()
+
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+
+    invoices = stripe_service.get_invoices_for_application(db, UUID(application_id))
+
+    return build_payment_summary(application_id, invoices)
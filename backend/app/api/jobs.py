@@ -0,0 +1,113 @@
+"""
+Background job API endpoints
+Status polling and cancellation for jobs queued by heavy endpoints
+"""
+
+from typing import List, Optional, Dict, Any
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.core.config import settings
+from app.core.deps import get_current_admin_user, get_current_super_admin_user
+from app.core.serialization import FastJSONResponse
+from app.models.user import User
+from app.schemas.job import Job
+from app.services import job_queue
+
+router = APIRouter(prefix="/jobs", tags=["jobs"])
+
+
+def accept_job(
+    db: Session,
+    background_tasks: BackgroundTasks,
+    job_type: str,
+    payload: Dict[str, Any],
+    current_user: User
+) -> FastJSONResponse:
+    """
+    Queue a job and answer 202 with its id (JobAccepted).
+
+    With JOBS_RUN_AFTER_RESPONSE the job also starts in this process once the
+    response is sent; a worker or the cron endpoint runs it otherwise.
+    """
+    job_id = job_queue.enqueue(db, job_type, payload, created_by=current_user.id)
+
+    if settings.JOBS_RUN_AFTER_RESPONSE:
+        background_tasks.add_task(job_queue.run_job_now, job_id)
+
+    return FastJSONResponse(
+        {
+            "job_id": job_id,
+            "job_type": job_type,
+            "status": "pending",
+            "status_url": f"/api/jobs/{job_id}"
+        },
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+def get_visible_job(db: Session, job_id: UUID, current_user: User) -> dict:
+    """Job by id; admins only see jobs they started, super admins see all"""
+    job = job_queue.get_job(db, job_id)
+    if not job or (
+        current_user.role != 'super_admin' and str(job['created_by']) != str(current_user.id)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found"
+        )
+    return job
+
+
+@router.get("", response_model=List[Job])
+async def list_jobs(
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    job_type: Optional[str] = Query(None, description="Filter by job type"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """Recent background jobs, newest first (super admin only)"""
+    if status_filter and status_filter not in job_queue.JOB_STATUSES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid status. Must be one of: {', '.join(job_queue.JOB_STATUSES)}"
+        )
+
+    return job_queue.list_jobs(db, status=status_filter, job_type=job_type, limit=limit)
+
+
+@router.get("/{job_id}", response_model=Job)
+async def get_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Job status, progress and (once completed) result.
+    Poll until status is completed, failed or cancelled.
+    """
+    return get_visible_job(db, job_id, current_user)
+
+
+@router.post("/{job_id}/cancel", response_model=Job)
+async def cancel_job(
+    job_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    Cancel a job. A pending job is cancelled at once; a running job stops at
+    its next progress report and its uncommitted work is rolled back.
+    """
+    get_visible_job(db, job_id, current_user)
+
+    if job_queue.cancel_job(db, job_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Job has already finished"
+        )
+
+    return job_queue.get_job(db, job_id)
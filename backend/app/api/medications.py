@@ -2,11 +2,16 @@
 Medications and Allergies API endpoints
 """
 
-from typing import List
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy import delete, insert, update
+from sqlalchemy.orm import Session, selectinload
 from app.core.database import get_db
+from app.core.etag import application_etag
 from app.core.deps import get_current_user
+from app.core.query_recorder import query_budget
 from app.models.user import User
 from app.models.application import Application, Medication, MedicationDose, Allergy
 from app.schemas.medication import (
@@ -19,10 +24,172 @@ from app.schemas.medication import (
     Allergy as AllergySchema,
     AllergyCreate,
     AllergyUpdate,
+    MedicationItem,
+    MedicationListReplace,
+    AllergyItem,
+    AllergyListReplace,
 )
 
 router = APIRouter()
 
+MEDICATION_FIELDS = {'medication_name', 'strength', 'dose_amount', 'dose_form', 'order_index'}
+DOSE_FIELDS = {'given_type', 'time', 'notes', 'order_index'}
+ALLERGY_FIELDS = {'allergen', 'reaction', 'severity', 'notes', 'order_index'}
+
+
+def get_owned_application(db: Session, application_id: str, current_user: User) -> Application:
+    """The current user's application, or 404"""
+    try:
+        uuid.UUID(str(application_id))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+
+    application = db.query(Application).filter(
+        Application.id == application_id,
+        Application.user_id == current_user.id
+    ).first()
+
+    if not application:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Application not found"
+        )
+    return application
+
+
+def parse_question_id(question_id: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(question_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Question not found"
+        )
+
+
+def load_medications(db: Session, application_id: Any, question_id: Any = None) -> List[Medication]:
+    """Medications with their doses in two queries (no lazy load per medication)"""
+    query = db.query(Medication).options(
+        selectinload(Medication.doses)
+    ).filter(
+        Medication.application_id == application_id
+    )
+    if question_id is not None:
+        query = query.filter(Medication.question_id == question_id)
+    return query.order_by(Medication.order_index).populate_existing().all()
+
+
+def has_changes(row: Any, values: Dict[str, Any]) -> bool:
+    return any(getattr(row, field) != value for field, value in values.items())
+
+
+def replace_medications(
+    db: Session,
+    application_id: uuid.UUID,
+    question_id: uuid.UUID,
+    items: Iterable[MedicationItem]
+) -> None:
+    """
+    Make the question's stored medications and doses match `items`, with one
+    bulk statement per kind of change. Does not commit.
+    """
+    existing = {m.id: m for m in load_medications(db, application_id, question_id)}
+    now = datetime.now(timezone.utc)
+
+    medication_inserts, medication_updates = [], []
+    dose_inserts, dose_updates, removed_dose_ids = [], [], []
+
+    for item in items:
+        values = item.model_dump(include=MEDICATION_FIELDS)
+        # pop: an id listed twice only updates the row once, the copy is created
+        current = existing.pop(item.id, None) if item.id else None
+        if current is None:
+            medication_id = uuid.uuid4()
+            medication_inserts.append({
+                'id': medication_id,
+                'application_id': application_id,
+                'question_id': question_id,
+                **values,
+            })
+            current_doses = {}
+        else:
+            medication_id = current.id
+            if has_changes(current, values):
+                medication_updates.append({'id': medication_id, 'updated_at': now, **values})
+            current_doses = {d.id: d for d in current.doses}
+
+        for dose in item.doses:
+            dose_values = dose.model_dump(include=DOSE_FIELDS)
+            current_dose = current_doses.pop(dose.id, None) if dose.id else None
+            if current_dose is None:
+                dose_inserts.append({'id': uuid.uuid4(), 'medication_id': medication_id, **dose_values})
+            elif has_changes(current_dose, dose_values):
+                dose_updates.append({'id': current_dose.id, 'updated_at': now, **dose_values})
+        removed_dose_ids.extend(current_doses)
+
+    # Doses of removed medications go with them (ON DELETE CASCADE)
+    if existing:
+        db.execute(
+            delete(Medication).where(Medication.id.in_(list(existing))),
+            execution_options={'synchronize_session': False}
+        )
+    if removed_dose_ids:
+        db.execute(
+            delete(MedicationDose).where(MedicationDose.id.in_(removed_dose_ids)),
+            execution_options={'synchronize_session': False}
+        )
+    if medication_updates:
+        db.execute(update(Medication), medication_updates)
+    if medication_inserts:
+        db.execute(insert(Medication), medication_inserts)
+    if dose_updates:
+        db.execute(update(MedicationDose), dose_updates)
+    if dose_inserts:
+        db.execute(insert(MedicationDose), dose_inserts)
+
+
+def replace_allergies(
+    db: Session,
+    application_id: uuid.UUID,
+    question_id: uuid.UUID,
+    items: Iterable[AllergyItem]
+) -> None:
+    """Make the question's stored allergies match `items` (bulk statements). Does not commit."""
+    existing = {
+        a.id: a for a in db.query(Allergy).filter(
+            Allergy.application_id == application_id,
+            Allergy.question_id == question_id
+        ).all()
+    }
+    now = datetime.now(timezone.utc)
+
+    inserts, updates = [], []
+    for item in items:
+        values = item.model_dump(include=ALLERGY_FIELDS)
+        current = existing.pop(item.id, None) if item.id else None
+        if current is None:
+            inserts.append({
+                'id': uuid.uuid4(),
+                'application_id': application_id,
+                'question_id': question_id,
+                **values,
+            })
+        elif has_changes(current, values):
+            updates.append({'id': current.id, 'updated_at': now, **values})
+
+    if existing:
+        db.execute(
+            delete(Allergy).where(Allergy.id.in_(list(existing))),
+            execution_options={'synchronize_session': False}
+        )
+    if updates:
+        db.execute(update(Allergy), updates)
+    if inserts:
+        db.execute(insert(Allergy), inserts)
+
 
 # ============================================================================
 # MEDICATIONS ENDPOINTS
@@ -32,7 +199,8 @@ router = APIRouter()
 async def get_medications_for_application(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    etag: Optional[str] = Depends(application_etag("medications"))
 ):
     """Get all medications for an application"""
     # Verify application belongs to user
@@ -47,11 +215,7 @@ async def get_medications_for_application(
             detail="Application not found"
         )
 
-    medications = db.query(Medication).filter(
-        Medication.application_id == application_id
-    ).order_by(Medication.order_index).all()
-
-    return medications
+    return load_medications(db, application_id)
 
 
 @router.get("/medications/{application_id}/question/{question_id}", response_model=List[MedicationSchema])
@@ -74,12 +238,33 @@ async def get_medications_for_question(
             detail="Application not found"
         )
 
-    medications = db.query(Medication).filter(
-        Medication.application_id == application_id,
-        Medication.question_id == question_id
-    ).order_by(Medication.order_index).all()
+    return load_medications(db, application_id, question_id)
+
+
+@router.put("/medications/{application_id}/question/{question_id}", response_model=List[MedicationSchema])
+@query_budget(11)
+async def replace_medications_for_question(
+    application_id: str,
+    question_id: str,
+    payload: MedicationListReplace,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Replace all medications (and doses) for a question with the given list,
+    in one transaction. Returns the stored list.
+    """
+    application = get_owned_application(db, application_id, current_user)
+    question_uuid = parse_question_id(question_id)
+
+    try:
+        replace_medications(db, application.id, question_uuid, payload.medications)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
 
-    return medications
+    return load_medications(db, application.id, question_uuid)
 
 
 @router.post("/medications", response_model=MedicationSchema, status_code=status.HTTP_201_CREATED)
@@ -339,7 +524,8 @@ async def delete_medication_dose(
 async def get_allergies_for_application(
     application_id: str,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: User = Depends(get_current_user),
+    etag: Optional[str] = Depends(application_etag("allergies"))
 ):
     """Get all allergies for an application"""
     # Verify application belongs to user
@@ -389,6 +575,35 @@ async def get_allergies_for_question(
     return allergies
 
 
+@router.put("/allergies/{application_id}/question/{question_id}", response_model=List[AllergySchema])
+@query_budget(6)
+async def replace_allergies_for_question(
+    application_id: str,
+    question_id: str,
+    payload: AllergyListReplace,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Replace all allergies for a question with the given list, in one
+    transaction. Returns the stored list.
+    """
+    application = get_owned_application(db, application_id, current_user)
+    question_uuid = parse_question_id(question_id)
+
+    try:
+        replace_allergies(db, application.id, question_uuid, payload.allergies)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return db.query(Allergy).filter(
+        Allergy.application_id == application.id,
+        Allergy.question_id == question_uuid
+    ).order_by(Allergy.order_index).populate_existing().all()
+
+
 @router.post("/allergies", response_model=AllergySchema, status_code=status.HTTP_201_CREATED)
 async def create_allergy(
     allergy_data: AllergyCreate,
@@ -6,7 +6,9 @@ Webhook Events Handled:
 - invoice.paid: When a customer pays an invoice
 - invoice.payment_failed: When a payment attempt fails
 - invoice.voided: When an invoice is voided in Stripe
-- customer.created: When a new customer is created (logging only)
+- customer.created / customer.updated / customer.deleted: Refresh the local
+  customer cache (stripe_customers), so invoices for known customers don't
+  need a Customer.retrieve
 """
 
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
@@ -112,7 +114,9 @@ async def stripe_webhook(
                                 'amountPaid': float(amount_paid),
                                 'remainingBalance': remaining_balance,
                                 'allPaid': all_paid
-                            }
+                            },
+                            # Stripe redelivers webhooks: send once per invoice
+                            dedupe_key=stripe_invoice_id
                         )
 
                         # 2. Fire admin_payment_received event to notify admins
@@ -128,7 +132,8 @@ async def stripe_webhook(
                                 'remainingBalance': remaining_balance,
                                 'allPaid': all_paid,
                                 'applicationUrl': f"/admin/applications/{application_id}"
-                            }
+                            },
+                            dedupe_key=stripe_invoice_id
                         )
                 except Exception as e:
                     print(f"[Stripe Webhook] Failed to fire email event: {e}")
@@ -200,10 +205,10 @@ async def stripe_webhook(
 
             return {"status": "processed", "event": event_type}
 
-        elif event_type == "customer.created":
-            # Just log - customer creation is handled in our code
-            print(f"[Stripe Webhook] Customer created: {event_data.id}")
-            return {"status": "acknowledged", "event": event_type}
+        elif event_type in ("customer.created", "customer.updated", "customer.deleted"):
+            # Keep the customer cache in sync (customer.deleted invalidates it)
+            result = stripe_service.handle_customer_event(event_type, event_data, db)
+            return {"status": "processed", "event": event_type, **result}
 
         else:
             # Unhandled event type - acknowledge but don't process
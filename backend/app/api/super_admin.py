@@ -3,17 +3,24 @@ Super Admin API endpoints
 Only accessible by users with role = 'super_admin'
 """
 
+import base64
 from datetime import datetime, timezone, timedelta
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, or_, and_, text
-from app.core.database import get_db
+from uuid import UUID
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response, BackgroundTasks
+from fastapi.responses import StreamingResponse, PlainTextResponse
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import func, or_, and_, text, tuple_
+from app.core.database import get_db, get_read_db, ReadSessionLocal
 from app.core.deps import get_current_super_admin_user
+from app.core.cache_bus import invalidates, publish, CACHE_SYSTEM_CONFIG, CACHE_TEAMS, CACHE_USERS
+from app.core.query_recorder import query_budget
+from app.core.serialization import FastJSONResponse, Projection
 from app.models.user import User
 from app.models.application import Application, ApplicationResponse, ApplicationQuestion, AdminNote, File, Invoice, ApplicationApproval
 from app.models.super_admin import SystemConfiguration, AuditLog, EmailTemplate, EmailAutomation, Team
-from app.services import stripe_service, storage_service
+from app.services import stripe_service, storage_service, season_archive
+from app.services.job_queue import JobContext
 from app.schemas.super_admin import (
     SystemConfiguration as SystemConfigurationSchema,
     SystemConfigurationCreate,
@@ -47,6 +54,10 @@ from app.schemas.super_admin import (
     UserDeletionResult
 )
 from app.schemas.user import UserResponse
+from app.schemas.job import JobAccepted
+
+# Row-to-dict projection for the user list (skips per-row pydantic validation)
+user_projection = Projection(UserResponse)
 
 router = APIRouter()
 
@@ -57,7 +68,7 @@ router = APIRouter()
 
 @router.get("/dashboard/stats", response_model=DashboardStats)
 async def get_dashboard_stats(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
     """
@@ -228,7 +239,17 @@ async def get_dashboard_stats(
     )
 
 
+def get_admin_counts_by_team(db: Session) -> dict:
+    """Count admins + super_admins per team key in a single grouped query"""
+    rows = db.query(User.team, func.count(User.id)).filter(
+        User.role.in_(['admin', 'super_admin']),
+        User.team.isnot(None)
+    ).group_by(User.team).all()
+    return {team_key: count for team_key, count in rows}
+
+
 @router.get("/dashboard/team-performance", response_model=List[TeamPerformance])
+@query_budget(2)
 async def get_team_performance(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
@@ -236,14 +257,12 @@ async def get_team_performance(
     """Get performance metrics for each team"""
 
     teams = db.query(Team).filter(Team.is_active == True).all()
+    admin_counts = get_admin_counts_by_team(db)
     performance = []
 
     for team in teams:
         # Count admins and super_admins in this team
-        admin_count = db.query(func.count(User.id)).filter(
-            User.role.in_(['admin', 'super_admin']),
-            User.team == team.key
-        ).scalar() or 0
+        admin_count = admin_counts.get(team.key, 0)
 
         # Count applications reviewed by this team (placeholder - needs approval tracking)
         applications_reviewed = 0
@@ -264,7 +283,7 @@ async def get_team_performance(
 # USER MANAGEMENT
 # ============================================================================
 
-@router.get("/users", response_model=List[UserResponse])
+@router.get("/users")
 async def get_all_users(
     role: Optional[str] = Query(None, description="Filter by role: user, admin, super_admin"),
     status: Optional[str] = Query(None, description="Filter by status: active, inactive, suspended"),
@@ -322,14 +341,14 @@ async def get_all_users(
     # Build response with camper_name included
     result = []
     for user in users:
-        user_dict = UserResponse.model_validate(user).model_dump()
+        user_dict = user_projection(user)
         user_dict['camper_name'] = user_camper_map.get(str(user.id))
         result.append(user_dict)
 
-    return result
+    return FastJSONResponse(result)
 
 
-@router.patch("/users/{user_id}", response_model=UserResponse)
+@router.patch("/users/{user_id}", response_model=UserResponse, dependencies=[Depends(invalidates(CACHE_USERS, "user_id"))])
 async def update_user(
     user_id: str,
     user_data: UserUpdate,
@@ -397,7 +416,7 @@ async def update_user(
     return UserResponse.model_validate(user)
 
 
-@router.post("/users/{user_id}/change-role", response_model=UserResponse)
+@router.post("/users/{user_id}/change-role", response_model=UserResponse, dependencies=[Depends(invalidates(CACHE_USERS, "user_id"))])
 async def change_user_role(
     user_id: str,
     role_data: UserRoleUpdate,
@@ -459,7 +478,7 @@ async def change_user_role(
     return UserResponse.model_validate(user)
 
 
-@router.post("/users/{user_id}/suspend", response_model=UserResponse)
+@router.post("/users/{user_id}/suspend", response_model=UserResponse, dependencies=[Depends(invalidates(CACHE_USERS, "user_id"))])
 async def suspend_user(
     user_id: str,
     status_data: UserStatusUpdate,
@@ -539,9 +558,10 @@ async def suspend_user(
     return UserResponse.model_validate(user)
 
 
-@router.delete("/users/{user_id}", response_model=UserDeletionResult)
+@router.delete("/users/{user_id}", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def delete_user(
     user_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
@@ -554,9 +574,10 @@ async def delete_user(
     3. Deletes the user record from our database
 
     This action CANNOT be undone.
-    """
-    from app.services import supabase_admin_service
 
+    Runs as a 'delete_user' background job: the response is 202 with a
+    job_id, and the job's result is the UserDeletionResult.
+    """
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(
@@ -571,6 +592,18 @@ async def delete_user(
             detail="Cannot delete your own account"
         )
 
+    from app.api.jobs import accept_job
+    return accept_job(db, background_tasks, 'delete_user', {'user_id': str(user.id)}, current_user)
+
+
+def delete_user_account(db: Session, user_id: str, actor_id: UUID) -> dict:
+    """Cascade delete a user (see delete_user) and audit it. Returns a UserDeletionResult dict."""
+    from app.services import supabase_admin_service
+
+    user = db.query(User).filter(User.id == user_id).first()
+    if not user:
+        raise ValueError("User not found")
+
     # Store user info for audit log
     user_email = user.email
     user_name = f"{user.first_name or ''} {user.last_name or ''}".strip() or user_email
@@ -582,33 +615,32 @@ async def delete_user(
         supabase_auth_id=str(user.supabase_auth_id) if user.supabase_auth_id else None
     )
 
-    if result['success']:
-        # Create audit log
-        audit_log = AuditLog(
-            entity_type='user',
-            entity_id=None,  # User no longer exists
-            action='deleted',
-            actor_id=current_user.id,
-            details={
-                'deleted_user_id': user_id,
-                'deleted_user_email': user_email,
-                'deleted_user_name': user_name,
-                'summary': result['summary']
-            }
-        )
-        db.add(audit_log)
-        db.commit()
+    if not result['success']:
+        raise RuntimeError(f"Failed to delete user: {result['error']}")
 
-        return UserDeletionResult(
-            success=True,
-            message=f"User {user_name} ({user_email}) has been permanently deleted",
-            summary=result['summary']
-        )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to delete user: {result['error']}"
-        )
+    # Create audit log
+    audit_log = AuditLog(
+        entity_type='user',
+        entity_id=None,  # User no longer exists
+        action='deleted',
+        actor_id=actor_id,
+        details={
+            'deleted_user_id': user_id,
+            'deleted_user_email': user_email,
+            'deleted_user_name': user_name,
+            'summary': result['summary']
+        }
+    )
+    db.add(audit_log)
+    db.commit()
+
+    publish(db, CACHE_USERS, user_id)
+
+    return UserDeletionResult(
+        success=True,
+        message=f"User {user_name} ({user_email}) has been permanently deleted",
+        summary=result['summary']
+    ).model_dump(mode="json")
 
 
 @router.post("/users/{user_id}/reset-password", response_model=UserActionResult)
@@ -947,7 +979,7 @@ async def get_configuration(
     return SystemConfigurationSchema.model_validate(config)
 
 
-@router.patch("/config/{key}", response_model=SystemConfigurationSchema)
+@router.patch("/config/{key}", response_model=SystemConfigurationSchema, dependencies=[Depends(invalidates(CACHE_SYSTEM_CONFIG, "key"))])
 async def update_configuration(
     key: str,
     config_data: SystemConfigurationUpdate,
@@ -1146,18 +1178,21 @@ async def update_email_template(
 # ============================================================================
 
 @router.get("/email-automations", response_model=List[EmailAutomationWithTemplate])
+@query_budget(1)
 async def get_all_email_automations(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
     """Get all email automations with template details"""
 
-    automations = db.query(EmailAutomation).order_by(EmailAutomation.name).all()
+    automations = db.query(EmailAutomation).options(
+        joinedload(EmailAutomation.template)
+    ).order_by(EmailAutomation.name).all()
     result = []
 
     for automation in automations:
-        # Get template details
-        template = db.query(EmailTemplate).filter(EmailTemplate.key == automation.template_key).first()
+        # Template was loaded in the same query
+        template = automation.template
 
         automation_dict = EmailAutomationWithTemplate.model_validate(automation).model_dump()
         if template:
@@ -1360,6 +1395,7 @@ async def delete_email_automation(
 # ============================================================================
 
 @router.get("/teams", response_model=List[TeamWithAdminCount])
+@query_budget(2)
 async def get_all_teams(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
@@ -1367,14 +1403,12 @@ async def get_all_teams(
     """Get all teams with member counts (admins + super_admins)"""
 
     teams = db.query(Team).order_by(Team.order_index).all()
+    admin_counts = get_admin_counts_by_team(db)
     result = []
 
     for team in teams:
         # Count both admins and super_admins in this team
-        admin_count = db.query(func.count(User.id)).filter(
-            User.role.in_(['admin', 'super_admin']),
-            User.team == team.key
-        ).scalar() or 0
+        admin_count = admin_counts.get(team.key, 0)
 
         team_dict = TeamWithAdminCount.model_validate(team).model_dump()
         team_dict['admin_count'] = admin_count
@@ -1383,7 +1417,7 @@ async def get_all_teams(
     return result
 
 
-@router.post("/teams", response_model=TeamSchema, status_code=status.HTTP_201_CREATED)
+@router.post("/teams", response_model=TeamSchema, status_code=status.HTTP_201_CREATED, dependencies=[Depends(invalidates(CACHE_TEAMS))])
 async def create_team(
     team_data: TeamCreate,
     db: Session = Depends(get_db),
@@ -1418,7 +1452,7 @@ async def create_team(
     return TeamSchema.model_validate(team)
 
 
-@router.patch("/teams/{team_id}", response_model=TeamSchema)
+@router.patch("/teams/{team_id}", response_model=TeamSchema, dependencies=[Depends(invalidates(CACHE_TEAMS))])
 async def update_team(
     team_id: str,
     team_data: TeamUpdate,
@@ -1469,20 +1503,47 @@ async def update_team(
 # AUDIT LOGS
 # ============================================================================
 
-@router.get("/audit-logs", response_model=List[AuditLogWithActor])
-async def get_audit_logs(
-    entity_type: Optional[str] = Query(None, description="Filter by entity type"),
-    entity_id: Optional[str] = Query(None, description="Filter by entity ID"),
-    action: Optional[str] = Query(None, description="Filter by action"),
-    actor_id: Optional[str] = Query(None, description="Filter by actor ID"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(50, ge=1, le=100),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_super_admin_user)
-):
-    """Get audit logs with filtering"""
+AUDIT_LOG_EXPORT_BATCH_SIZE = 1000
 
-    query = db.query(AuditLog)
+
+def encode_audit_cursor(created_at: datetime, log_id) -> str:
+    """Encode the (created_at, id) of the last row on a page as an opaque cursor"""
+    raw = f"{created_at.isoformat()}|{log_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_audit_cursor(cursor: str):
+    """Decode a cursor produced by encode_audit_cursor into (created_at, id)"""
+    try:
+        created_at, log_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(log_id)
+    except (ValueError, UnicodeDecodeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def build_audit_log_query(
+    db: Session,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[str] = None,
+    action: Optional[str] = None,
+    actor_id: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Build the audit log query with actor name/email projected in the same SELECT.
+    Ordered newest first on (created_at, id), which idx_audit_logs_created_id covers.
+    """
+    query = db.query(
+        AuditLog,
+        User.first_name.label('actor_first_name'),
+        User.last_name.label('actor_last_name'),
+        User.email.label('actor_email')
+    ).outerjoin(User, User.id == AuditLog.actor_id)
 
     # Apply filters
     if entity_type:
@@ -1493,42 +1554,204 @@ async def get_audit_logs(
         query = query.filter(AuditLog.action == action)
     if actor_id:
         query = query.filter(AuditLog.actor_id == actor_id)
+    if start_date:
+        query = query.filter(AuditLog.created_at >= start_date)
+    if end_date:
+        query = query.filter(AuditLog.created_at < end_date)
+
+    # Keyset pagination: continue strictly after the last row of the previous page
+    if cursor:
+        cursor_created_at, cursor_id = decode_audit_cursor(cursor)
+        query = query.filter(
+            tuple_(AuditLog.created_at, AuditLog.id) < tuple_(cursor_created_at, cursor_id)
+        )
 
-    # Get logs with pagination
-    logs = query.order_by(AuditLog.created_at.desc()).offset(skip).limit(limit).all()
+    return query.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+
+
+def audit_row_to_schema(row) -> AuditLogWithActor:
+    """Convert a (AuditLog, first_name, last_name, email) row to the response schema"""
+    log = row[0]
+    actor_name = None
+    if row.actor_email is not None:
+        actor_name = f"{row.actor_first_name} {row.actor_last_name}"
+    return AuditLogWithActor(
+        id=log.id,
+        entity_type=log.entity_type,
+        entity_id=log.entity_id,
+        action=log.action,
+        details=log.details,
+        actor_id=log.actor_id,
+        ip_address=log.ip_address,
+        user_agent=log.user_agent,
+        created_at=log.created_at,
+        actor_name=actor_name,
+        actor_email=row.actor_email
+    )
 
-    # Enrich with actor information
-    result = []
-    for log in logs:
-        log_dict = AuditLogWithActor.model_validate(log).model_dump()
-        if log.actor:
-            log_dict['actor_name'] = f"{log.actor.first_name} {log.actor.last_name}"
-            log_dict['actor_email'] = log.actor.email
-        result.append(AuditLogWithActor(**log_dict))
 
-    return result
+@router.get("/audit-logs", response_model=List[AuditLogWithActor])
+@query_budget(1)
+async def get_audit_logs(
+    response: Response,
+    entity_type: Optional[str] = Query(None, description="Filter by entity type"),
+    entity_id: Optional[str] = Query(None, description="Filter by entity ID"),
+    action: Optional[str] = Query(None, description="Filter by action"),
+    actor_id: Optional[str] = Query(None, description="Filter by actor ID"),
+    start_date: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only logs before this time"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor value from the previous page"),
+    skip: int = Query(0, ge=0, description="Deprecated - use cursor"),
+    limit: int = Query(50, ge=1, le=100),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """
+    Get audit logs with filtering.
+
+    Paginate with `cursor`: when more rows exist, the response carries an
+    X-Next-Cursor header to pass back for the next page. `skip` still works
+    for existing clients but degrades on large tables.
+    """
+    query = build_audit_log_query(
+        db,
+        entity_type=entity_type,
+        entity_id=entity_id,
+        action=action,
+        actor_id=actor_id,
+        start_date=start_date,
+        end_date=end_date,
+        cursor=cursor
+    )
+    if skip and not cursor:
+        query = query.offset(skip)
+
+    # Fetch one extra row to know whether there is a next page
+    rows = query.limit(limit + 1).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    if has_more:
+        last_log = rows[-1][0]
+        response.headers["X-Next-Cursor"] = encode_audit_cursor(last_log.created_at, last_log.id)
+
+    return [audit_row_to_schema(row) for row in rows]
+
+
+@router.get("/audit-logs/export")
+async def export_audit_logs(
+    entity_type: Optional[str] = Query(None, description="Filter by entity type"),
+    entity_id: Optional[str] = Query(None, description="Filter by entity ID"),
+    action: Optional[str] = Query(None, description="Filter by action"),
+    actor_id: Optional[str] = Query(None, description="Filter by actor ID"),
+    start_date: Optional[datetime] = Query(None, description="Only logs at or after this time"),
+    end_date: Optional[datetime] = Query(None, description="Only logs before this time"),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """
+    Stream matching audit logs as NDJSON (one JSON object per line) for compliance pulls.
+
+    Rows are read in keyset batches, so memory stays flat for any date range.
+    """
+    def generate():
+        # The request-scoped session is closed before streaming starts, so use our own
+        export_db = ReadSessionLocal()
+        try:
+            cursor = None
+            while True:
+                rows = build_audit_log_query(
+                    export_db,
+                    entity_type=entity_type,
+                    entity_id=entity_id,
+                    action=action,
+                    actor_id=actor_id,
+                    start_date=start_date,
+                    end_date=end_date,
+                    cursor=cursor
+                ).limit(AUDIT_LOG_EXPORT_BATCH_SIZE).all()
+
+                lines = [audit_row_to_schema(row).model_dump_json() + "\n" for row in rows]
+                done = len(rows) < AUDIT_LOG_EXPORT_BATCH_SIZE
+                if not done:
+                    last_log = rows[-1][0]
+                    cursor = encode_audit_cursor(last_log.created_at, last_log.id)
+
+                # End the transaction before yielding: keyset paging needs no
+                # snapshot, and a slow reader must not leave the session idle
+                # in transaction (killed by idle_in_transaction_session_timeout)
+                export_db.rollback()
+                yield "".join(lines)
+
+                if done:
+                    break
+        finally:
+            export_db.close()
+
+    filename = f"audit-logs-{datetime.now(timezone.utc).strftime('%Y-%m-%d')}.ndjson"
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
 
 
 # ============================================================================
 # ANNUAL RESET
 # ============================================================================
 
-@router.post("/annual-reset", response_model=AnnualResetResult)
+@router.post(
+    "/annual-reset",
+    response_model=None,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        200: {"model": AnnualResetResult, "description": "Dry run: what the reset would do"},
+        202: {"model": JobAccepted, "description": "Reset queued as an 'annual_reset' job"},
+    },
+)
 async def perform_annual_reset(
     reset_request: AnnualResetRequest,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
     """
     Perform annual reset of applications for the new camp season.
 
-    This endpoint:
+    Dry runs are answered directly. A real reset touches every application,
+    so it is queued as an 'annual_reset' background job: the response is 202
+    with a job_id, and GET /api/jobs/{job_id} returns the AnnualResetResult
+    once it has finished. See run_annual_reset for what the reset does.
+    """
+    if reset_request.dry_run:
+        result = run_annual_reset(db, reset_request, actor_id=current_user.id)
+        return FastJSONResponse(result.model_dump(mode="json"))
+
+    from app.api.jobs import accept_job
+    return accept_job(
+        db, background_tasks, 'annual_reset', reset_request.model_dump(), current_user
+    )
+
+
+def run_annual_reset(
+    db: Session,
+    reset_request: AnnualResetRequest,
+    actor_id: UUID,
+    job: Optional[JobContext] = None
+) -> AnnualResetResult:
+    """
+    Reset applications for the new camp season (or preview it with dry_run).
+
+    This:
     1. Resets all active applications to status='applicant', sub_status='not_started'
     2. Preserves responses for questions marked with persist_annually=True
     3. Deletes all other responses and admin notes
     4. Resets approval tracking, timestamps, and payment tracking
     5. Logs the action for audit purposes
 
+    Before anything is pruned, the season's applications, responses, approvals,
+    notes and invoices are copied into the season_archive_* tables under
+    archive_year (same transaction, so a failed reset archives nothing).
+
     By default, paid campers ARE reset (since they're returning campers).
     Use exclude_paid=True to skip campers who have paid.
     Use dry_run=True to preview changes without applying them.
@@ -1565,13 +1788,26 @@ async def perform_annual_reset(
         ).all()
     )
 
+    # Snapshot the season into the archive tables before pruning anything
+    archived_rows = None
+    if not reset_request.dry_run:
+        # Only the applications being reset: skipped ones keep their live rows
+        archived_rows = season_archive.archive_season(
+            db,
+            season_year=archive_year,
+            application_ids=[app.id for app in applications_to_reset]
+        )
+
     # Process each application
     application_results = []
     total_responses_deleted = 0
     total_responses_preserved = 0
     total_notes_deleted = 0
 
-    for app in applications_to_reset:
+    for index, app in enumerate(applications_to_reset):
+        if job:
+            job.progress(index, len(applications_to_reset), "Resetting applications")
+
         camper_name = f"{app.camper_first_name or ''} {app.camper_last_name or ''}".strip() or "Unknown"
         previous_status = app.status
 
@@ -1662,14 +1898,15 @@ async def perform_annual_reset(
             entity_type='system',
             entity_id=None,
             action='annual_reset',
-            actor_id=current_user.id,
+            actor_id=actor_id,
             details={
                 'archive_year': archive_year,
                 'applications_reset': len(applications_to_reset),
                 'responses_deleted': total_responses_deleted,
                 'responses_preserved': total_responses_preserved,
                 'notes_deleted': total_notes_deleted,
-                'skipped_statuses': skipped_by_status
+                'skipped_statuses': skipped_by_status,
+                'archived_rows': archived_rows
             }
         )
         db.add(audit_log)
@@ -1683,7 +1920,8 @@ async def perform_annual_reset(
         total_responses_preserved=total_responses_preserved,
         total_notes_deleted=total_notes_deleted,
         applications_reset=application_results,
-        skipped_statuses=skipped_by_status
+        skipped_statuses=skipped_by_status,
+        archived_rows=archived_rows
     )
 
 
@@ -1701,20 +1939,207 @@ async def preview_annual_reset(
     (since they're returning campers who need to reapply).
     Set exclude_paid=True to skip paid applications.
     """
-    return await perform_annual_reset(
+    return run_annual_reset(
+        db,
         AnnualResetRequest(dry_run=True, exclude_paid=exclude_paid),
-        db=db,
-        current_user=current_user
+        actor_id=current_user.id
     )
 
 
+# ============================================================================
+# SEASON ARCHIVE (past seasons are read from season_archive_* tables)
+# ============================================================================
+
+@router.get("/archive/seasons")
+async def get_archived_seasons(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """List archived camp seasons with their application counts"""
+    return season_archive.get_archived_seasons(db)
+
+
+@router.get("/archive/{season_year}/applications")
+async def get_archived_applications(
+    season_year: int,
+    status_filter: Optional[str] = Query(None, alias="status", description="Filter by status"),
+    sub_status: Optional[str] = Query(None, description="Filter by sub_status"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=500),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """List applications as they were at the end of a past season"""
+    return season_archive.get_archived_applications(
+        db,
+        season_year=season_year,
+        status=status_filter,
+        sub_status=sub_status,
+        skip=skip,
+        limit=limit
+    )
+
+
+@router.get("/archive/{season_year}/applications/{application_id}")
+async def get_archived_application(
+    season_year: int,
+    application_id: UUID,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """Get an archived application with its responses, approvals, notes and invoices"""
+    bundle = season_archive.get_archived_application(db, season_year, application_id)
+    if not bundle:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Application not found in {season_year} archive"
+        )
+    return bundle
+
+
+# ============================================================================
+# SCHEDULER
+# ============================================================================
+
+@router.get("/scheduler/runs")
+async def get_scheduler_runs(
+    task: Optional[str] = Query(None, description="Filter by task name"),
+    limit: int = Query(50, ge=1, le=500),
+    db: Session = Depends(get_read_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """Recent scheduled task runs (status, duration, result) and each task's last tick"""
+    from app.services import scheduler
+
+    last_ticks = scheduler.get_last_ticks(db)
+    return {
+        "tasks": [
+            {
+                "name": name,
+                "every_seconds": scheduled.every_seconds,
+                "catch_up": scheduled.catch_up,
+                "last_tick_at": last_ticks.get(name)
+            }
+            for name, scheduled in scheduler.get_tasks().items()
+        ],
+        "runs": scheduler.get_recent_runs(db, task_name=task, limit=limit)
+    }
+
+
+# ============================================================================
+# REQUEST PROFILING
+# ============================================================================
+
+@router.post("/profiles/token")
+async def create_profile_token(
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """
+    Get a short-lived token that turns on profiling for requests carrying it.
+    Send it as the X-Profile-Token header on the request(s) to profile.
+    """
+    from app.core.config import settings
+    from app.core.profiling import make_profile_token, TOKEN_TTL_SECONDS
+
+    if not settings.PROFILING_ENABLED or not settings.PROFILING_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Profiling is not enabled on this deployment"
+        )
+
+    return {
+        "token": make_profile_token(),
+        "header": "X-Profile-Token",
+        "expires_in": TOKEN_TTL_SECONDS
+    }
+
+
+@router.get("/profiles")
+async def get_request_profiles(
+    route: Optional[str] = Query(None, description="Filter by route template"),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """List stored request profiles, newest first (without stack data)"""
+    filters = "WHERE route = :route" if route else ""
+    rows = db.execute(
+        text(f"""
+            SELECT id, method, path, route, status_code, duration_ms, trigger,
+                   sample_count, sections, created_at
+            FROM request_profiles
+            {filters}
+            ORDER BY created_at DESC
+            LIMIT :limit
+        """),
+        {'route': route, 'limit': limit}
+    ).fetchall()
+
+    return [
+        {
+            "id": str(row.id),
+            "method": row.method,
+            "path": row.path,
+            "route": row.route,
+            "status_code": row.status_code,
+            "duration_ms": float(row.duration_ms) if row.duration_ms is not None else None,
+            "trigger": row.trigger,
+            "sample_count": row.sample_count,
+            "sections": row.sections,
+            "created_at": row.created_at.isoformat() if row.created_at else None
+        }
+        for row in rows
+    ]
+
+
+@router.get("/profiles/{profile_id}")
+async def get_request_profile(
+    profile_id: UUID,
+    format: str = Query("json", pattern="^(json|folded)$", description="'folded' returns flame graph input as text"),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_super_admin_user)
+):
+    """
+    Get one request profile.
+    format=folded returns the raw folded stacks (load into speedscope.app or flamegraph.pl).
+    """
+    row = db.execute(
+        text("SELECT * FROM request_profiles WHERE id = :id"),
+        {'id': str(profile_id)}
+    ).fetchone()
+
+    if not row:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+
+    if format == "folded":
+        return PlainTextResponse(row.folded_stacks or "")
+
+    return {
+        "id": str(row.id),
+        "method": row.method,
+        "path": row.path,
+        "route": row.route,
+        "status_code": row.status_code,
+        "duration_ms": float(row.duration_ms) if row.duration_ms is not None else None,
+        "trigger": row.trigger,
+        "sample_count": row.sample_count,
+        "sections": row.sections,
+        "folded_stacks": row.folded_stacks,
+        "created_at": row.created_at.isoformat() if row.created_at else None
+    }
+
+
 # ============================================================================
 # APPLICATION DELETION (Super Admin Only)
 # ============================================================================
 
-@router.delete("/applications/{application_id}")
+@router.delete("/applications/{application_id}", response_model=JobAccepted, status_code=status.HTTP_202_ACCEPTED)
 async def delete_application(
     application_id: str,
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_super_admin_user)
 ):
@@ -1733,16 +2158,38 @@ async def delete_application(
 
     This action CANNOT be undone.
 
-    Only super admins can perform this action.
+    Only super admins can perform this action. Runs as a 'delete_application'
+    background job: the response is 202 with a job_id, and the job's result
+    is {success, message, summary}.
     """
-    # Get the application with related data
-    application = db.query(Application).filter(Application.id == application_id).first()
+    application = db.query(Application.id).filter(Application.id == application_id).first()
     if not application:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Application not found"
         )
 
+    from app.api.jobs import accept_job
+    return accept_job(
+        db, background_tasks, 'delete_application', {'application_id': str(application.id)}, current_user
+    )
+
+
+def delete_application_data(
+    db: Session,
+    application_id: str,
+    actor: User,
+    job: Optional[JobContext] = None
+) -> dict:
+    """Void invoices, delete files and delete the application (see delete_application)"""
+    application = db.query(Application).filter(Application.id == application_id).first()
+    if not application:
+        raise ValueError("Application not found")
+
+    # Last point a cancel can take effect: after this, invoices and files go
+    if job:
+        job.progress(0, 1, "Deleting application")
+
     # Collect deletion summary for audit log
     deletion_summary = {
         'application_id': str(application.id),
@@ -1764,8 +2211,8 @@ async def delete_application(
                 result = stripe_service.void_invoice(
                     db=db,
                     invoice_id=invoice.id,
-                    reason=f"Application deleted by super admin {current_user.email}",
-                    admin_id=current_user.id
+                    reason=f"Application deleted by super admin {actor.email}",
+                    admin_id=actor.id
                 )
                 if result.get('success'):
                     deletion_summary['invoices_voided'] += 1
@@ -1801,7 +2248,7 @@ async def delete_application(
         entity_type='application',
         entity_id=None,  # Application no longer exists
         action='deleted',
-        actor_id=current_user.id,
+        actor_id=actor.id,
         details=deletion_summary
     )
     db.add(audit_log)
@@ -14,12 +14,17 @@ Usage:
         details={"old_status": "applicant", "new_status": "camper"},
         request=request  # Optional - extracts IP and user agent
     )
+
+Events are buffered and written in batches by app.core.audit_buffer.
+Security events and the actions in SYNC_AUDIT_ACTIONS are always written
+synchronously; pass sync=True to force a synchronous write for any event.
 """
 
 from typing import Optional, Any, Dict
 from uuid import UUID
 from sqlalchemy.orm import Session
 from fastapi import Request
+from app.core.config import settings
 from app.models.super_admin import AuditLog
 
 
@@ -73,6 +78,15 @@ ACTION_TEMPLATE_UPDATED = "template_updated"
 ACTION_TEAM_CREATED = "team_created"
 ACTION_TEAM_UPDATED = "team_updated"
 
+# Events that must be durable before the request returns - never buffered
+SYNC_AUDIT_ENTITY_TYPES = {ENTITY_SECURITY}
+SYNC_AUDIT_ACTIONS = {
+    ACTION_ROLE_CHANGED,
+    ACTION_PASSWORD_CHANGED,
+    ACTION_PASSWORD_RESET,
+    ACTION_ANNUAL_RESET,
+}
+
 
 def log_audit_event(
     db: Session,
@@ -83,7 +97,8 @@ def log_audit_event(
     details: Optional[Dict[str, Any]] = None,
     request: Optional[Request] = None,
     ip_address: Optional[str] = None,
-    user_agent: Optional[str] = None
+    user_agent: Optional[str] = None,
+    sync: Optional[bool] = None
 ) -> AuditLog:
     """
     Log an audit event to the database.
@@ -98,9 +113,11 @@ def log_audit_event(
         request: FastAPI request object (for extracting IP and user agent)
         ip_address: Override IP address (if not using request)
         user_agent: Override user agent (if not using request)
+        sync: Force (True) or skip (False) a synchronous write. Defaults to
+              synchronous for security-critical events, buffered otherwise.
 
     Returns:
-        The created AuditLog object
+        The created AuditLog object (not yet persisted when buffered)
     """
     # Extract IP and user agent from request if provided
     if request:
@@ -115,6 +132,13 @@ def log_audit_event(
         if not user_agent:
             user_agent = request.headers.get("user-agent")
 
+    if sync is None:
+        sync = (
+            not settings.AUDIT_BUFFER_ENABLED
+            or entity_type in SYNC_AUDIT_ENTITY_TYPES
+            or action in SYNC_AUDIT_ACTIONS
+        )
+
     audit_log = AuditLog(
         entity_type=entity_type,
         entity_id=entity_id,
@@ -125,9 +149,29 @@ def log_audit_event(
         user_agent=user_agent
     )
 
-    db.add(audit_log)
+    if sync:
+        db.add(audit_log)
+        db.commit()
+        return audit_log
+
+    # Callers rely on this commit for their own pending changes. Without the
+    # audit INSERT in it, a transaction with nothing to write does no WAL flush.
+    # Enqueue only once it succeeded: a failed commit raises, and the action
+    # it would have recorded never happened.
     db.commit()
 
+    from app.core.audit_buffer import audit_buffer
+
+    audit_buffer.enqueue({
+        'entity_type': entity_type,
+        'entity_id': entity_id,
+        'action': action,
+        'actor_id': actor_id,
+        'details': details,
+        'ip_address': ip_address,
+        'user_agent': user_agent,
+    })
+
     return audit_log
 
 
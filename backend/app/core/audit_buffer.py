@@ -0,0 +1,292 @@
+"""
+Buffered Audit Log Writer
+
+log_audit_event() used to INSERT + COMMIT one audit_logs row inside every
+audited request. This module keeps audit events in memory and writes them in
+batches (one multi-row INSERT) when either:
+- the buffer reaches AUDIT_BUFFER_MAX_SIZE events, or
+- AUDIT_BUFFER_FLUSH_INTERVAL seconds have passed (background flusher thread)
+
+Durability:
+- If the database can't be reached, the events are appended to a JSONL spool
+  file (AUDIT_BUFFER_SPOOL_PATH) and replayed by a later flush. The spool is
+  shared by every worker process on the host: appends and replay claims take
+  an flock on "<spool>.lock", and a replay first renames the spool to a
+  per-process file, so two workers never replay the same events.
+- If the batch is rejected by the database (an event for a deleted user
+  fails the actor_id FK, etc.), it is retried row by row; rows that still
+  fail are logged and appended to "<spool>.dead" instead of blocking every
+  later flush. Spool lines that can't be parsed go there too.
+- The buffer is flushed on application shutdown and at interpreter exit.
+- Security-critical events bypass the buffer entirely (see audit.py).
+
+Usage:
+    from app.core.audit_buffer import audit_buffer
+
+    audit_buffer.enqueue({...})  # normally called by log_audit_event
+    audit_buffer.flush()         # force a write (shutdown, tests, scripts)
+"""
+
+import atexit
+import json
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+from sqlalchemy import exc, insert
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logging_config import get_logger
+from app.models.super_admin import AuditLog
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows dev machines; one process there
+    fcntl = None
+
+logger = get_logger("audit")
+
+
+def _is_connection_error(error: Exception) -> bool:
+    """The database couldn't be reached (retry later) - as opposed to rejecting the data"""
+    if isinstance(error, (exc.OperationalError, exc.InterfaceError, exc.DisconnectionError, exc.TimeoutError)):
+        return True
+    return isinstance(error, exc.DBAPIError) and error.connection_invalidated
+
+
+def _json_default(value: Any) -> Any:
+    """JSON encoder for spool rows (UUIDs and timestamps)"""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class AuditBuffer:
+    """In-memory audit event buffer with batched writes and a file spool fallback"""
+
+    def __init__(self, max_size: int, flush_interval: float, spool_path: str):
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self.spool_path = spool_path
+        self._events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def enqueue(self, event: Dict[str, Any]) -> None:
+        """Add an event to the buffer, flushing inline if the size trigger is hit"""
+        event.setdefault('created_at', datetime.now(timezone.utc))
+
+        with self._lock:
+            self._events.append(event)
+            should_flush = len(self._events) >= self.max_size
+
+        self._ensure_flusher()
+
+        if should_flush:
+            self.flush()
+
+    def flush(self) -> int:
+        """
+        Write all buffered (and previously spooled) events in one INSERT.
+
+        Returns:
+            Number of events written to the database
+        """
+        # Only one flush at a time; a concurrent caller's events are picked up
+        # by the flush already in progress or the next one
+        with self._flush_lock:
+            with self._lock:
+                events, self._events = self._events, []
+
+            spooled, claimed_path = self._claim_spool()
+            events = spooled + events
+            if not events:
+                self._release_claim(claimed_path)
+                return 0
+
+            try:
+                self._insert(events)
+                return len(events)
+            except Exception as e:
+                if _is_connection_error(e):
+                    logger.error(f"Audit flush failed, spooling {len(events)} events: {e}")
+                    self._append_spool(self.spool_path, events)
+                    return 0
+                logger.warning(f"Audit batch of {len(events)} rejected, writing row by row: {e}")
+                return self._insert_rows(events)
+            finally:
+                # Every claimed event is now written, re-spooled or dead-lettered
+                self._release_claim(claimed_path)
+
+    def _insert(self, events: List[Dict[str, Any]]) -> None:
+        db = SessionLocal()
+        try:
+            db.execute(insert(AuditLog.__table__), events)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    def _insert_rows(self, events: List[Dict[str, Any]]) -> int:
+        """Insert one event per transaction; dead-letter the ones the database rejects"""
+        written = 0
+        for index, event in enumerate(events):
+            try:
+                self._insert([event])
+                written += 1
+            except Exception as e:
+                if _is_connection_error(e):
+                    logger.error(f"Audit flush failed, spooling {len(events) - index} events: {e}")
+                    self._append_spool(self.spool_path, events[index:])
+                    break
+                logger.error(f"Audit event rejected, moved to {self.dead_letter_path}: {e}")
+                self._append_spool(self.dead_letter_path, [event])
+        return written
+
+    def pending_count(self) -> int:
+        """Number of events waiting in memory"""
+        with self._lock:
+            return len(self._events)
+
+    def shutdown(self) -> None:
+        """Stop the background flusher and write anything left in the buffer"""
+        self._stopped.set()
+        self.flush()
+
+    # ------------------------------------------------------------------
+    # Background flusher
+    # ------------------------------------------------------------------
+
+    def _ensure_flusher(self) -> None:
+        if self._flusher is not None and self._flusher.is_alive():
+            return
+        with self._lock:
+            if self._flusher is not None and self._flusher.is_alive():
+                return
+            self._stopped.clear()
+            self._flusher = threading.Thread(
+                target=self._run_flusher, name="audit-flusher", daemon=True
+            )
+            self._flusher.start()
+
+    def _run_flusher(self) -> None:
+        while not self._stopped.wait(self.flush_interval):
+            if self.pending_count():
+                try:
+                    self.flush()
+                except Exception as e:
+                    logger.error(f"Audit background flush error: {e}")
+
+    # ------------------------------------------------------------------
+    # Spool file (durable fallback, shared by the host's worker processes)
+    # ------------------------------------------------------------------
+
+    @property
+    def dead_letter_path(self) -> str:
+        return f"{self.spool_path}.dead"
+
+    @contextmanager
+    def _spool_lock(self):
+        """Exclusive lock between processes for spool appends and claims"""
+        with open(f"{self.spool_path}.lock", 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _append_spool(self, path: str, events: List[Dict[str, Any]]) -> None:
+        try:
+            with self._spool_lock(), open(path, 'a', encoding='utf-8') as f:
+                for event in events:
+                    f.write(json.dumps(event, default=_json_default) + "\n")
+        except OSError as e:
+            # Last resort - keep the events in the log output so they aren't lost silently
+            logger.critical(f"Audit spool write to {path} failed ({e}); dropped events: "
+                            f"{json.dumps(events, default=_json_default)}")
+
+    def _claim_spool(self) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Take the spooled events for this process: the spool is renamed to a
+        per-process file under the lock, so no other worker replays them and
+        events spooled meanwhile go to a fresh spool. The claimed file stays
+        on disk until the flush is done with its events (_release_claim).
+
+        Returns:
+            (events, claimed file path or None)
+        """
+        claimed_path = f"{self.spool_path}.{os.getpid()}.replay"
+        try:
+            with self._spool_lock():
+                if not os.path.exists(self.spool_path):
+                    return [], None
+                os.replace(self.spool_path, claimed_path)
+        except OSError as e:
+            logger.error(f"Audit spool claim failed: {e}")
+            return [], None
+
+        events, bad_lines = [], []
+        try:
+            with open(claimed_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        events.append(self._parse_spool_line(line))
+                    except ValueError as e:
+                        logger.error(f"Unreadable audit spool line, moved to {self.dead_letter_path}: {e}")
+                        bad_lines.append(line if line.endswith("\n") else line + "\n")
+        except OSError as e:
+            # Leave the claimed file where it is rather than losing it
+            logger.error(f"Audit spool read failed, left in {claimed_path}: {e}")
+            return [], None
+
+        if bad_lines:
+            try:
+                with self._spool_lock(), open(self.dead_letter_path, 'a', encoding='utf-8') as f:
+                    f.writelines(bad_lines)
+            except OSError as e:
+                logger.error(f"Audit dead-letter write failed, left in {claimed_path}: {e}")
+                return [], None
+
+        return events, claimed_path
+
+    def _release_claim(self, claimed_path: Optional[str]) -> None:
+        if claimed_path is None:
+            return
+        try:
+            os.remove(claimed_path)
+        except OSError as e:
+            logger.error(f"Audit spool cleanup failed: {e}")
+
+    @staticmethod
+    def _parse_spool_line(line: str) -> Dict[str, Any]:
+        event = json.loads(line)
+        if not isinstance(event, dict):
+            raise ValueError("spool line is not an event object")
+        if event.get('created_at'):
+            event['created_at'] = datetime.fromisoformat(event['created_at'])
+        for key in ('entity_id', 'actor_id'):
+            if event.get(key):
+                event[key] = UUID(event[key])
+        return event
+
+
+audit_buffer = AuditBuffer(
+    max_size=settings.AUDIT_BUFFER_MAX_SIZE,
+    flush_interval=settings.AUDIT_BUFFER_FLUSH_INTERVAL,
+    spool_path=settings.AUDIT_BUFFER_SPOOL_PATH,
+)
+
+# Scripts and workers that never run the FastAPI shutdown hook still flush on exit
+atexit.register(audit_buffer.shutdown)
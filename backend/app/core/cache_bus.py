@@ -0,0 +1,302 @@
+"""
+In-process caches with cross-worker invalidation over Postgres LISTEN/NOTIFY.
+
+Each Uvicorn worker / serverless instance keeps its own LocalCache objects.
+Writers invalidate after their commit; every other process evicts the same
+keys when the message reaches it:
+
+- "listen" mode: a daemon thread holds one dedicated connection with
+  LISTEN cache_invalidation and evicts as NOTIFYs arrive (milliseconds).
+- "poll" mode, for instances that can't keep a connection open (Vercel,
+  transaction pooler - LISTEN needs a session): cache reads check the
+  cache_versions table at most every CACHE_VERSION_CHECK_SECONDS and evict
+  namespaces whose version moved. Listen mode uses the same check while its
+  connection is down, so nothing is missed during a reconnect.
+
+Entries also expire after their TTL, which bounds staleness if both paths fail.
+
+Usage:
+    teams_cache = LocalCache(CACHE_TEAMS, ttl_seconds=300)
+    teams = teams_cache.get_or_load("active", lambda: load_teams(db))
+
+    # Writers: publish after commit...
+    publish(db, CACHE_TEAMS)
+    # ...or declare it on the route (runs after the endpoint succeeds)
+    @router.patch("/teams/{team_id}", dependencies=[Depends(invalidates(CACHE_TEAMS))])
+
+Keys are strings (they travel in NOTIFY payloads). Cached values are
+shared between requests: treat them as read-only.
+"""
+
+import json
+import os
+import select
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+from fastapi import Depends, Request
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.core.database import engine, get_db
+from app.core.logging_config import get_logger
+
+logger = get_logger("cache_bus")
+
+CHANNEL = "cache_invalidation"
+
+# Namespaces (one per kind of cached data)
+CACHE_FORM = "form"  # Sections / questions / headers (application builder)
+CACHE_SYSTEM_CONFIG = "system_config"  # system_configuration rows, keyed by config key
+CACHE_TEAMS = "teams"
+CACHE_USERS = "users"  # Keyed by user id
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+_MISSING = object()
+
+
+class LocalCache:
+    """Per-process key/value cache for one namespace, evicted by the bus"""
+
+    registry: Dict[str, "LocalCache"] = {}
+
+    def __init__(self, namespace: str, ttl_seconds: Optional[float] = None):
+        self.namespace = namespace
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CACHE_DEFAULT_TTL_SECONDS
+        self._entries: Dict[str, tuple] = {}
+        self._generation = 0  # Bumped by every eviction
+        self._lock = threading.Lock()
+        LocalCache.registry[namespace] = self
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if cache_bus.mode == "off":
+            return default
+        cache_bus.sync()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return default
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        if cache_bus.mode == "off":
+            return
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def get_or_load(self, key: str, loader: Callable[[], Any]) -> Any:
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            generation = self._generation
+            value = loader()
+            with self._lock:
+                # An invalidation that arrived while loading may mean the value
+                # is already stale: return it, but don't keep it
+                if generation == self._generation and cache_bus.mode != "off":
+                    self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+        return value
+
+    def evict(self, key: Optional[str] = None) -> None:
+        """Drop one key, or the whole namespace when key is None"""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+def evict_local(namespace: str, key: Optional[str] = None) -> None:
+    cache = LocalCache.registry.get(namespace)
+    if cache is not None:
+        cache.evict(key)
+
+
+class CacheBus:
+    """Delivers invalidations to this process (listener thread or version polling)"""
+
+    def __init__(self):
+        self.mode = self._resolve_mode(settings.CACHE_BUS_MODE)
+        self.version_check_seconds = settings.CACHE_VERSION_CHECK_SECONDS
+        self._versions: Optional[Dict[str, int]] = None  # None = no baseline yet
+        self._last_check = 0.0
+        self._check_lock = threading.Lock()
+        self._listening = False
+        self._listener: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    @staticmethod
+    def _resolve_mode(mode: str) -> str:
+        if mode != "auto":
+            return mode
+        # LISTEN needs a long-lived session: not through a transaction pooler,
+        # and pointless on instances frozen between requests
+        if settings.DB_TRANSACTION_POOLER or os.environ.get("VERCEL"):
+            return "poll"
+        return "listen"
+
+    # ------------------------------------------------------------------
+    # Receiving
+    # ------------------------------------------------------------------
+
+    def handle(self, payload: str) -> None:
+        """Apply one NOTIFY payload: {"namespace": ..., "key": ...}"""
+        try:
+            message = json.loads(payload)
+            evict_local(message["namespace"], message.get("key"))
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed cache invalidation: {payload!r}")
+
+    def sync(self) -> None:
+        """Evict namespaces whose cache_versions row changed (rate limited)"""
+        if self.mode == "off" or self._listening:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.version_check_seconds:
+            return
+        if not self._check_lock.acquire(blocking=False):
+            return  # Another thread is checking
+        try:
+            self._last_check = now
+            with engine.connect() as conn:
+                versions = dict(conn.execute(text("SELECT namespace, version FROM cache_versions")).all())
+            if self._versions is not None:
+                for namespace in set(versions) | set(self._versions):
+                    if versions.get(namespace, 0) != self._versions.get(namespace, 0):
+                        evict_local(namespace)
+            self._versions = versions
+        except Exception as e:
+            # Keep serving from cache; TTLs still bound staleness
+            logger.warning(f"Cache version check failed: {e}")
+        finally:
+            self._check_lock.release()
+
+    def start(self) -> None:
+        """Start the LISTEN thread (listen mode only)"""
+        if self.mode != "listen" or self._listener is not None:
+            return
+        self._stopped.clear()
+        self._listener = threading.Thread(target=self._listen_forever, name="cache-bus-listener", daemon=True)
+        self._listener.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._listener is not None:
+            self._listener.join(timeout=2)
+            self._listener = None
+
+    def _listen_forever(self) -> None:
+        backoff = 1.0
+        while not self._stopped.is_set():
+            try:
+                self._listen_once()
+                backoff = 1.0
+            except Exception as e:
+                logger.warning(f"Cache bus listener disconnected ({e}); retrying in {backoff:.0f}s")
+            self._listening = False
+            self._stopped.wait(backoff)
+            backoff = min(backoff * 2, 30.0)
+
+    def _listen_once(self) -> None:
+        # A connection of our own, taken out of the pool for good
+        pooled = engine.raw_connection()
+        pooled.detach()
+        conn = pooled.driver_connection
+        try:
+            if not hasattr(conn, "notifies"):
+                logger.warning("Database driver has no LISTEN support; cache bus falls back to polling")
+                self.mode = "poll"
+                self._stopped.set()
+                return
+
+            conn.rollback()
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+
+            # Messages sent while we were disconnected are lost: start clean
+            for cache in LocalCache.registry.values():
+                cache.evict()
+            self._listening = True
+            logger.info("Cache bus listening for invalidations")
+
+            while not self._stopped.is_set():
+                if select.select([conn], [], [], 5.0) == ([], [], []):
+                    continue
+                conn.poll()
+                while conn.notifies:
+                    self.handle(conn.notifies.pop(0).payload)
+        finally:
+            self._listening = False
+            pooled.close()
+
+
+cache_bus = CacheBus()
+
+
+# ============================================================================
+# PUBLISHING
+# ============================================================================
+
+def publish(db: Session, namespace: str, key: Optional[str] = None) -> None:
+    """
+    Invalidate `namespace` (or one key of it) in every process.
+
+    Call after the write has been committed: the NOTIFY and the version bump
+    are committed together in their own transaction. Failures are logged,
+    not raised - the write itself already succeeded.
+    """
+    evict_local(namespace, key)
+    if cache_bus.mode == "off":
+        return
+    try:
+        publish_in_transaction(db, namespace, key)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Failed to publish cache invalidation for {namespace}: {e}")
+
+
+def publish_in_transaction(db: Session, namespace: str, key: Optional[str] = None) -> None:
+    """
+    Bump the version and queue the NOTIFY inside the caller's open
+    transaction, so the invalidation commits (or rolls back) atomically with
+    the write. Doesn't commit, and raises like any other statement of it.
+    """
+    if cache_bus.mode == "off":
+        return
+    payload = json.dumps({"namespace": namespace, "key": key})
+    db.execute(
+        text("""
+            INSERT INTO cache_versions (namespace, version, updated_at)
+            VALUES (:namespace, 1, NOW())
+            ON CONFLICT (namespace)
+            DO UPDATE SET version = cache_versions.version + 1, updated_at = NOW()
+        """),
+        {"namespace": namespace}
+    )
+    db.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": CHANNEL, "payload": payload})
+
+
+def invalidates(namespace: str, key_param: Optional[str] = None) -> Callable:
+    """
+    Route dependency: publish an invalidation after a successful write.
+
+    Runs once the endpoint has returned (and committed), before the response
+    is sent; skipped when the endpoint raises and for GET/HEAD/OPTIONS, so it
+    can be set on a whole router. `key_param` names the path parameter that
+    identifies the key (default: invalidate the whole namespace).
+    """
+    def dependency(request: Request, db: Session = Depends(get_db)):
+        yield
+        if request.method in SAFE_METHODS:
+            return
+        key = request.path_params.get(key_param) if key_param else None
+        publish(db, namespace, key)
+
+    return dependency
@@ -0,0 +1,163 @@
+"""
+Response compression (brotli / gzip) negotiated from Accept-Encoding.
+
+Pure ASGI middleware. Responses smaller than COMPRESSION_MIN_SIZE, already
+encoded responses, and event streams pass through untouched. Complete
+bodies are compressed in one go (with an accurate Content-Length);
+streamed bodies (e.g. the audit log export) are compressed chunk by chunk
+without buffering the whole response.
+
+Brotli is used when the client accepts it and the `brotli` package is
+installed; otherwise gzip. Both use fast settings, since for JSON most of
+the size win comes at low levels and the CPU cost grows quickly after.
+"""
+
+import zlib
+from typing import Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 4
+
+# Content types that are already compressed or must not be delayed
+SKIP_CONTENT_TYPES = (b"text/event-stream", b"image/", b"video/", b"audio/", b"application/zip",
+                      b"application/pdf", b"application/gzip", b"application/octet-stream")
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick "br" or "gzip" from an Accept-Encoding header (None = leave uncompressed)"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        pieces = part.strip().split(";")
+        coding = pieces[0].strip().lower()
+        quality = 1.0
+        for param in pieces[1:]:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            accepted[coding] = quality
+
+    if brotli is not None and accepted.get("br", 0) > 0:
+        return "br"
+    if accepted.get("gzip", 0) > 0:
+        return "gzip"
+    return None
+
+
+class Compressor:
+    """Incremental brotli / gzip compressor"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip container
+
+    def compress(self, data: bytes) -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.flush()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self, data: bytes = b"") -> bytes:
+        if self.encoding == "br":
+            return self._brotli.process(data) + self._brotli.finish()
+        return self._zlib.compress(data) + self._zlib.flush(zlib.Z_FINISH)
+
+
+class CompressionMiddleware:
+    """Compress responses above `minimum_size` bytes with brotli or gzip"""
+
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = ""
+        for name, value in scope["headers"]:
+            if name == b"accept-encoding":
+                accept_encoding = value.decode("latin-1")
+                break
+
+        encoding = choose_encoding(accept_encoding)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Optional[Message] = None
+        compressor: Optional[Compressor] = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                for name, value in headers:
+                    if name == b"content-encoding" or (
+                        name == b"content-type" and value.startswith(SKIP_CONTENT_TYPES)
+                    ):
+                        passthrough = True
+                        break
+                if passthrough:
+                    await send(message)
+                else:
+                    # Hold the headers until the first body chunk shows whether to compress
+                    start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+            if start_message is not None:
+                first = start_message
+                start_message = None
+
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(first)
+                    await send(message)
+                    return
+
+                headers = [
+                    (name, value) for name, value in first.get("headers", [])
+                    if name != b"content-length"
+                ]
+                headers.append((b"content-encoding", encoding.encode()))
+                headers.append((b"vary", b"Accept-Encoding"))
+                compressor = Compressor(encoding)
+
+                if not more_body:
+                    compressed = compressor.finish(body)
+                    headers.append((b"content-length", str(len(compressed)).encode()))
+                    await send({**first, "headers": headers})
+                    await send({"type": "http.response.body", "body": compressed})
+                    return
+
+                await send({**first, "headers": headers})
+
+            if more_body:
+                chunk = compressor.compress(body)
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+            else:
+                await send({"type": "http.response.body", "body": compressor.finish(body)})
+
+        await self.app(scope, receive, send_wrapper)
@@ -37,6 +37,8 @@ class Settings(BaseSettings):
     STRIPE_SECRET_KEY: str
     STRIPE_PUBLISHABLE_KEY: str
     STRIPE_WEBHOOK_SECRET: str
+    STRIPE_API_BASE: str = ""  # Local stand-in for checks/dev, e.g. stripe-mock at http://localhost:12111 (empty = api.stripe.com)
+    STRIPE_CUSTOMER_CACHE_SECONDS: int = 7 * 24 * 3600  # Re-verify a cached customer with Stripe after this long (webhooks invalidate sooner)
 
     # Resend (Email Service)
     RESEND_API_KEY: str = ""  # Will be set via environment variable
@@ -62,8 +64,84 @@ class Settings(BaseSettings):
         """Parse ALLOWED_ORIGINS into a list"""
         return [origin.strip() for origin in self.ALLOWED_ORIGINS.split(",")]
 
+    # Audit Logging
+    # Buffered audit writes batch audit_logs INSERTs off the request path.
+    # Off on hosts that can freeze the process between requests without a shutdown hook
+    # (Vercel sets VERCEL): buffered events and the per-instance spool would be lost there.
+    AUDIT_BUFFER_ENABLED: bool = not os.getenv("VERCEL")
+    AUDIT_BUFFER_MAX_SIZE: int = 50  # Flush when this many events are buffered
+    AUDIT_BUFFER_FLUSH_INTERVAL: float = 2.0  # Seconds between background flushes
+    AUDIT_BUFFER_SPOOL_PATH: str = "/tmp/camp_fasd_audit_spool.jsonl"  # Fallback when the DB write fails
+
+    # Rate Limiting
+    # "campdb://" keeps counters in Postgres (shared across instances); "memory://" is per-process
+    RATE_LIMIT_STORAGE_URI: str = "campdb://"
+
+    # Performance Metrics
+    METRICS_ENABLED: bool = True  # Server-Timing headers + /api/metrics
+    METRICS_TOKEN: str = ""  # Bearer token for /api/metrics (required outside DEBUG)
+
+    # Query Diagnostics
+    QUERY_DEBUG: bool = False  # Log repeated statement shapes (N+1) per request with call sites
+    QUERY_BUDGET_ENFORCE: bool = False  # Raise instead of warn when @query_budget is exceeded (tests/dev)
+    N_PLUS_ONE_THRESHOLD: int = 5  # Same statement shape this many times in one request is reported
+
+    # Request Profiling (off by default - zero overhead when disabled)
+    PROFILING_ENABLED: bool = False
+    PROFILING_SECRET: str = ""  # Signs X-Profile-Token values; required for on-demand profiling
+    PROFILING_SAMPLE_RATE: float = 0.0  # Fraction of requests profiled automatically (0.0 - 1.0)
+    PROFILING_INTERVAL_MS: float = 5.0  # Stack sampling interval
+
+    # Database Connection Pool
+    # Per worker/instance; keep pool_size * instances below the database (or pooler) connection limit
+    DB_POOL_SIZE: int = 5  # Connections kept open
+    DB_MAX_OVERFLOW: int = 10  # Extra connections opened under load, closed when returned
+    DB_POOL_TIMEOUT: int = 10  # Seconds to wait for a free connection before failing the request
+    DB_POOL_RECYCLE: int = 1800  # Replace connections older than this (before the server/pooler drops them)
+    DB_POOL_PING_IDLE_SECONDS: int = 300  # Ping on checkout only if the connection sat idle this long
+    DB_TRANSACTION_POOLER: bool = False  # True behind PgBouncer transaction mode / Supavisor port 6543
+    # Request-path limits; season archiving and partition DDL lift them
+    DB_STATEMENT_TIMEOUT_MS: int = 30000  # Cancel statements running longer than this (0 = no limit)
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000  # Kill sessions left idle inside a transaction (0 = no limit)
+
+    # Read Replica (optional)
+    # Read-only admin/reporting endpoints use it via get_read_db; empty = read from the primary
+    DATABASE_REPLICA_URL: str = ""
+    REPLICA_STICKY_SECONDS: int = 10  # After a user's own write, read from the primary for this long
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # Fall back to the primary when the replica is further behind
+    REPLICA_LAG_CHECK_INTERVAL: float = 5.0  # Seconds between replica lag checks
+
+    # Serverless Warmup
+    WARMUP_ON_STARTUP: bool = True  # Prefill the DB pool and load SDK clients in the background at startup
+    WARMUP_DB_CONNECTIONS: int = 2  # Connections opened by warmup (capped at DB_POOL_SIZE)
+
+    # Response Compression
+    COMPRESSION_ENABLED: bool = True  # brotli (if installed) or gzip, negotiated via Accept-Encoding
+    COMPRESSION_MIN_SIZE: int = 1024  # Bytes; smaller responses aren't worth compressing
+
+    # In-process Caches (app/core/cache_bus.py)
+    # "listen": LISTEN/NOTIFY thread per worker; "poll": check cache_versions on read;
+    # "auto": poll behind a transaction pooler or on Vercel, listen otherwise; "off": no caching
+    CACHE_BUS_MODE: str = "auto"
+    CACHE_VERSION_CHECK_SECONDS: float = 2.0  # Max staleness in poll mode
+    CACHE_DEFAULT_TTL_SECONDS: float = 300.0  # Entries expire even if no invalidation arrives
+
+    # Background Jobs (background_jobs table, worker: python -m app.worker)
+    JOBS_RUN_AFTER_RESPONSE: bool = True  # Also run a new job in-process after the response (no dedicated worker, e.g. Vercel)
+    JOB_WORKER_POLL_SECONDS: float = 2.0  # Worker sleep when the queue is empty
+    JOB_RETRY_BASE_SECONDS: int = 30  # Backoff: base * 2^(attempt - 1), capped at 1 hour
+    JOB_HEARTBEAT_SECONDS: float = 30.0  # How often a running job refreshes its heartbeat
+    JOB_STALE_SECONDS: int = 120  # Running jobs without a heartbeat this long are re-queued
+
+    # Scheduler (cron workloads run by the worker; each tick claimed by one live instance)
+    SCHEDULER_ENABLED: bool = True  # Start the scheduler thread in python -m app.worker
+    SCHEDULER_POLL_SECONDS: float = 30.0  # How often due ticks are checked
+    SCHEDULER_HEARTBEAT_SECONDS: float = 30.0  # How often a running task refreshes its run's heartbeat
+    SCHEDULER_RUN_STALE_SECONDS: int = 180  # Runs without a heartbeat this long are abandoned and re-run
+
     # Email Configuration
     EMAIL_REMINDER_INTERVALS: List[int] = [60, 80]  # Completion percentages
+    EMAIL_SEND_CLAIM_STALE_SECONDS: int = 600  # Send ledger claims older than this are taken over by the next run
 
     class Config:
         env_file = ".env"
@@ -15,18 +15,19 @@ This is a defense-in-depth measure that works alongside:
 - SameSite cookies (if using cookie-based sessions)
 """
 
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
-from typing import Callable
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
-class CSRFProtectionMiddleware(BaseHTTPMiddleware):
+class CSRFProtectionMiddleware:
     """
     Middleware to protect against CSRF attacks.
 
     Requires X-Requested-With header for state-changing requests.
     This header cannot be set by simple HTML forms, providing CSRF protection.
+
+    Pure ASGI: only the method, path and headers are inspected, so request and
+    response bodies (uploads, streaming exports) pass through untouched.
     """
 
     # HTTP methods that change state and require CSRF protection
@@ -54,37 +55,41 @@ class CSRFProtectionMiddleware(BaseHTTPMiddleware):
         "/api/public/",
     }
 
-    def __init__(self, app, debug: bool = False):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, debug: bool = False):
+        self.app = app
         self.debug = debug
+        self._skip_prefixes = tuple(self.EXEMPT_PATHS | self.SAFE_PATHS)
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def requires_check(self, scope: Scope) -> bool:
         # Skip CSRF check for safe methods (GET, HEAD, OPTIONS)
-        if request.method not in self.PROTECTED_METHODS:
-            return await call_next(request)
-
-        # Skip CSRF check for exempt paths
-        path = request.url.path
-        for exempt_path in self.EXEMPT_PATHS:
-            if path.startswith(exempt_path):
-                return await call_next(request)
+        if scope["method"] not in self.PROTECTED_METHODS:
+            return False
 
-        # Skip CSRF check for safe/public paths
-        for safe_path in self.SAFE_PATHS:
-            if path.startswith(safe_path):
-                return await call_next(request)
+        # Skip CSRF check for exempt and safe/public paths
+        if scope["path"].startswith(self._skip_prefixes):
+            return False
 
         # In debug mode, allow requests without CSRF header
-        if self.debug:
-            return await call_next(request)
+        return not self.debug
 
-        # Require X-Requested-With header for CSRF protection
-        x_requested_with = request.headers.get("X-Requested-With", "")
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.requires_check(scope):
+            await self.app(scope, receive, send)
+            return
 
-        if x_requested_with.lower() != "xmlhttprequest":
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="CSRF validation failed: Missing or invalid X-Requested-With header"
+        # Require X-Requested-With header for CSRF protection
+        x_requested_with = b""
+        for name, value in scope["headers"]:
+            if name == b"x-requested-with":
+                x_requested_with = value
+                break
+
+        if x_requested_with.lower() != b"xmlhttprequest":
+            response = JSONResponse(
+                status_code=403,
+                content={"detail": "CSRF validation failed: Missing or invalid X-Requested-With header"}
             )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
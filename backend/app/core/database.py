@@ -1,27 +1,345 @@
 """
 Database connection and session management
+
+Pool behaviour is configured from settings (DB_POOL_*):
+- Direct connections (port 5432 / Supavisor session mode): statement_timeout
+  and idle_in_transaction_session_timeout are sent as startup options, so
+  they cost nothing per request.
+- Transaction poolers (PgBouncer transaction mode / Supavisor port 6543,
+  DB_TRANSACTION_POOLER=true): startup options are not forwarded and a
+  server connection is shared between clients, so the timeouts are applied
+  with SET LOCAL at the start of each transaction and server-side prepared
+  statements are disabled.
+
+Known long-running work (season archiving, partition DDL) lifts both
+timeouts for its own transaction with lift_timeouts(db).
+
+Liveness: instead of pinging on every checkout (pool_pre_ping), a connection
+is only pinged when it has been idle in the pool for DB_POOL_PING_IDLE_SECONDS,
+and connections are recycled before the server/pooler closes them.
+
+Read replica: when DATABASE_REPLICA_URL is set, endpoints that depend on
+get_read_db instead of get_db are served from the replica, except for users
+who committed a write in the last REPLICA_STICKY_SECONDS (read-your-writes)
+or while the replica lags more than REPLICA_MAX_LAG_SECONDS.
 """
 
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Dict, Optional
+from fastapi import Request
+from sqlalchemy import create_engine, event, exc, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import QueuePool
 from app.core.config import settings
+from app.core.logging_config import get_logger
+from app.core.query_recorder import UNRECORDED
+
+logger = get_logger("database")
+
+
+# ============================================================================
+# POOL TELEMETRY
+# ============================================================================
+
+class PoolStats:
+    """Checkout wait and timeout counters for the connection pools"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.timeouts = 0
+        self.liveness_failures = 0
+
+    def record_checkout(self, wait: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_seconds += wait
+            if wait > self.max_wait_seconds:
+                self.max_wait_seconds = wait
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def record_liveness_failure(self) -> None:
+        with self._lock:
+            self.liveness_failures += 1
+
+
+pool_stats = PoolStats()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            pool_stats.record_timeout()
+            raise
+        wait = time.perf_counter() - start
+        pool_stats.record_checkout(wait)
+
+        # Attribute the wait to the current request (Server-Timing / metrics)
+        from app.core.metrics import current_request_stats
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.pool_wait += wait
+        return connection
+
+
+def pool_status() -> Dict[str, float]:
+    """Snapshot of pool usage for /api/metrics and diagnostics"""
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "idle": pool.checkedin(),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checkouts": pool_stats.checkouts,
+        "wait_seconds": pool_stats.wait_seconds,
+        "max_wait_seconds": pool_stats.max_wait_seconds,
+        "timeouts": pool_stats.timeouts,
+        "liveness_failures": pool_stats.liveness_failures,
+    }
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+
+def build_connect_args() -> dict:
+    """Driver connect arguments for the configured pooling mode"""
+    connect_args = {}
+    driver = make_url(settings.DATABASE_URL).drivername
+
+    if settings.DB_TRANSACTION_POOLER:
+        # psycopg 3 prepares repeated statements server-side, which breaks when the
+        # next transaction lands on a different server connection. psycopg2 never
+        # prepares, so there is nothing to turn off for the default driver.
+        if driver.endswith("+psycopg"):
+            connect_args["prepare_threshold"] = None
+        elif driver.endswith("+asyncpg"):
+            connect_args["statement_cache_size"] = 0
+    else:
+        options = []
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            options.append(f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}")
+        if settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS:
+            options.append(f"-c idle_in_transaction_session_timeout={settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS}")
+        if options:
+            connect_args["options"] = " ".join(options)
+
+    return connect_args
+
+
+def build_engine(url: str, **overrides):
+    """Create an engine with the app's pool, timeout and liveness settings"""
+    options = dict(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_use_lifo=True,  # Reuse warm connections; surplus ones go idle and get recycled
+        pool_pre_ping=False,  # Replaced by the idle-based check in configure_engine_events
+        connect_args=build_connect_args(),
+        echo=settings.DEBUG,  # Log SQL queries in debug mode
+    )
+    options.update(overrides)
+    new_engine = create_engine(url, **options)
+    configure_engine_events(new_engine)
+    return new_engine
+
+
+def configure_engine_events(target_engine) -> None:
+    """Idle-based liveness checks and (in transaction-pooler mode) per-transaction timeouts"""
+
+    @event.listens_for(target_engine, "checkin")
+    def _mark_idle(dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+
+    @event.listens_for(target_engine, "checkout")
+    def _check_liveness(dbapi_connection, connection_record, connection_proxy):
+        """Ping only connections that sat idle long enough to have been dropped"""
+        checked_in_at = connection_record.info.get("checked_in_at")
+        if checked_in_at is None or time.monotonic() - checked_in_at < settings.DB_POOL_PING_IDLE_SECONDS:
+            return
+
+        cursor = dbapi_connection.cursor()
+        try:
+            cursor.execute("SELECT 1")
+        except Exception:
+            pool_stats.record_liveness_failure()
+            # The pool discards this connection and retries the checkout with a fresh one
+            raise exc.DisconnectionError()
+        finally:
+            try:
+                cursor.close()
+            except Exception:
+                pass
+
+    if settings.DB_TRANSACTION_POOLER and (settings.DB_STATEMENT_TIMEOUT_MS or settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS):
+        _set_local_timeouts = "; ".join(
+            statement for statement in (
+                f"SET LOCAL statement_timeout = {settings.DB_STATEMENT_TIMEOUT_MS}"
+                if settings.DB_STATEMENT_TIMEOUT_MS else None,
+                f"SET LOCAL idle_in_transaction_session_timeout = {settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS}"
+                if settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS else None,
+            )
+            if statement
+        )
+
+        @event.listens_for(target_engine, "begin")
+        def _apply_transaction_timeouts(conn):
+            conn.exec_driver_sql(_set_local_timeouts, execution_options=UNRECORDED)
+
+
+def lift_timeouts(db) -> None:
+    """
+    Disable statement_timeout and idle_in_transaction_session_timeout for the
+    rest of the current transaction (SET LOCAL: the next transaction on the
+    connection is back to the configured limits). Takes a Session or Connection.
+    """
+    db.execute(text("SET LOCAL statement_timeout = 0"), execution_options=UNRECORDED)
+    db.execute(text("SET LOCAL idle_in_transaction_session_timeout = 0"), execution_options=UNRECORDED)
+
+
+# Create database engines
+engine = build_engine(settings.DATABASE_URL)
+
+# Optional read replica (None when DATABASE_REPLICA_URL is unset: reads use the primary)
+replica_engine = build_engine(settings.DATABASE_REPLICA_URL) if settings.DATABASE_REPLICA_URL else None
 
-# Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,  # Verify connections before using
-    echo=settings.DEBUG,  # Log SQL queries in debug mode
-)
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+
+# ============================================================================
+# READ REPLICA ROUTING
+# ============================================================================
+
+class ReadYourWrites:
+    """
+    Remembers which users committed a write recently, so their next reads go
+    to the primary instead of a replica that may not have the write yet.
+
+    Kept per process; across instances the replica lag check covers the gap.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last_write: Dict[str, float] = {}
+
+    def mark(self, user_id: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            if len(self._last_write) > 10000:
+                cutoff = now - settings.REPLICA_STICKY_SECONDS
+                self._last_write = {k: v for k, v in self._last_write.items() if v > cutoff}
+
+    def is_sticky(self, user_id: Optional[str]) -> bool:
+        if not user_id:
+            return False
+        with self._lock:
+            last_write = self._last_write.get(user_id)
+        return last_write is not None and time.monotonic() - last_write < settings.REPLICA_STICKY_SECONDS
+
+
+read_your_writes = ReadYourWrites()
+
+
+class ReplicaHealth:
+    """Replica lag, re-checked at most every REPLICA_LAG_CHECK_INTERVAL seconds"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._usable = False
+
+    def usable(self) -> bool:
+        now = time.monotonic()
+        if now - self._checked_at < settings.REPLICA_LAG_CHECK_INTERVAL:
+            return self._usable
+        with self._lock:
+            if now - self._checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL:
+                self._usable = self._check()
+                self._checked_at = now
+        return self._usable
+
+    def _check(self) -> bool:
+        try:
+            with replica_engine.connect() as conn:
+                # A plain Postgres instance (local testing) isn't in recovery: no lag
+                lag = conn.execute(text("""
+                    SELECT CASE
+                        WHEN NOT pg_is_in_recovery() THEN 0
+                        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                        ELSE COALESCE(EXTRACT(EPOCH FROM NOW() - pg_last_xact_replay_timestamp()), 0)
+                    END
+                """), execution_options=UNRECORDED).scalar()
+        except exc.SQLAlchemyError as e:
+            logger.warning(f"Read replica unavailable, reading from primary: {e}")
+            return False
+        if lag > settings.REPLICA_MAX_LAG_SECONDS:
+            logger.warning(f"Read replica {lag:.1f}s behind, reading from primary")
+            return False
+        return True
+
+
+replica_health = ReplicaHealth()
+
+# Reads served by target, for /api/metrics
+read_routing_counts: Dict[str, int] = {"replica": 0, "primary": 0}
+
+
+class RoutingSession(Session):
+    """
+    Session for read-only endpoints: statements go to the replica unless the
+    user is sticky to the primary or the replica is unhealthy. The target is
+    chosen once, on first use, so a request never mixes snapshots. Flushes
+    always go to the primary.
+    """
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if replica_engine is None or self._flushing:
+            return engine
+
+        target = self.info.get("target")
+        if target is None:
+            target = "primary"
+            request = self.info.get("request")
+            user_id = getattr(request.state, "user_id", None) if request is not None else None
+            if not read_your_writes.is_sticky(user_id) and replica_health.usable():
+                target = "replica"
+            self.info["target"] = target
+            read_routing_counts[target] += 1
+
+        return replica_engine if target == "replica" else engine
+
+
+ReadSessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine)
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _remember_write(session):
+    session.info["wrote"] = True
+
 # Base class for models
 Base = declarative_base()
 
 
-def get_db():
+def get_db(request: Request = None):
     """
     Dependency to get database session
 
@@ -32,4 +350,28 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        # Users who just wrote read from the primary for a while (see get_read_db)
+        if db.info.get("wrote") and request is not None:
+            user_id = getattr(request.state, "user_id", None)
+            if user_id:
+                read_your_writes.mark(user_id)
+        db.close()
+
+
+def get_read_db(request: Request):
+    """
+    Dependency for read-only endpoints: a session served from the read replica
+    when one is configured (falls back to the primary otherwise).
+
+    The user is resolved lazily on first query, after the auth dependency has
+    set request.state.user_id.
+
+    Yields:
+        Database session (do not write with it)
+    """
+    db = ReadSessionLocal()
+    try:
+        db.info["request"] = request
+        yield db
+    finally:
+        db.close()
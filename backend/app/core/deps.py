@@ -5,7 +5,7 @@ Supports both Supabase Auth JWTs and legacy custom JWTs for backward compatibili
 
 import traceback
 from typing import Optional
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
 from jose import jwt, JWTError
@@ -101,6 +101,7 @@ def decode_legacy_token(token: str) -> Optional[str]:
 
 
 async def get_current_user(
+    request: Request,
     credentials: HTTPAuthorizationCredentials = Depends(security),
     db: Session = Depends(get_db)
 ) -> User:
@@ -108,7 +109,11 @@ async def get_current_user(
     Get current authenticated user from JWT token.
     Supports both Supabase Auth tokens and legacy custom tokens.
 
+    Also sets request.state.user_id so rate limits key on the user
+    instead of the client IP.
+
     Args:
+        request: Incoming request
         credentials: Bearer token from Authorization header
         db: Database session
 
@@ -146,6 +151,8 @@ async def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
+    request.state.user_id = str(user.id)
+
     return user
 
 
@@ -0,0 +1,115 @@
+"""
+Conditional GETs (ETag / If-None-Match) for per-application resources.
+
+Every change to an application or one of its child rows (responses, files,
+notes, approvals, medications, doses, allergies, invoices) bumps
+applications.revision via database triggers (migration 043). That single
+integer (plus the owner's updated_at, for views that embed user info) is a
+cheap version tag: one primary-key lookup tells whether the client's copy
+is current, before the endpoint loads the object graph.
+
+The tag also covers the resource scope and the requesting user, so the same
+application seen through different endpoints (or by different users, whose
+views may differ) never shares a tag.
+
+Usage (after the auth dependency, so request.state.user_id is set):
+
+    @router.get("/{application_id}")
+    async def get_application(
+        application_id: str,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_user),
+        etag: Optional[str] = Depends(application_etag("application")),
+    ):
+"""
+
+import hashlib
+import uuid
+from typing import Callable, Optional
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from app.core.database import get_db
+
+# Clients must revalidate every time, but may keep (and revalidate) their copy
+CACHE_CONTROL = "private, no-cache"
+
+
+def get_application_version(db: Session, application_id: str) -> Optional[str]:
+    """
+    Version string for an application: its revision plus the owner's
+    updated_at (admin views embed the parent's name and email).
+    None if the id is invalid or doesn't exist.
+    """
+    try:
+        uuid.UUID(str(application_id))
+    except ValueError:
+        return None
+    row = db.execute(
+        text("""
+            SELECT a.revision, u.updated_at
+            FROM applications a
+            LEFT JOIN users u ON u.id = a.user_id
+            WHERE a.id = :id
+        """),
+        {"id": str(application_id)}
+    ).first()
+    if row is None:
+        return None
+    revision, user_updated_at = row
+    return f"{revision}:{user_updated_at.isoformat() if user_updated_at else ''}"
+
+
+def build_etag(scope: str, application_id: str, version: str, user_id: Optional[str]) -> str:
+    digest = hashlib.sha1(f"{scope}:{application_id}:{version}:{user_id}".encode()).hexdigest()[:16]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    # "*" is not honoured: it would answer 304 for any existing application,
+    # revealing existence to users who can't read it
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def application_etag(scope: str) -> Callable:
+    """
+    Dependency factory: tag the response with the application's ETag, and
+    answer 304 Not Modified when If-None-Match already has it.
+
+    Unknown applications pass through (returning None) so the endpoint
+    raises its usual 404.
+    """
+    def dependency(
+        application_id: str,
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db),
+    ) -> Optional[str]:
+        version = get_application_version(db, application_id)
+        if version is None:
+            return None
+
+        user_id = getattr(request.state, "user_id", None)
+        etag = build_etag(scope, application_id, version, user_id)
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED,
+                headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+            )
+
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return etag
+
+    return dependency
@@ -16,7 +16,7 @@ from datetime import datetime, timezone
 
 from fastapi import HTTPException, Request
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 # Configure logging
 logger = logging.getLogger("camp_fasd.errors")
@@ -189,28 +189,47 @@ def handle_exception_safely(
     return JSONResponse(status_code=status_code, content=response_data)
 
 
-class ErrorHandlingMiddleware(BaseHTTPMiddleware):
+class ErrorHandlingMiddleware:
     """
     Middleware to catch unhandled exceptions and return sanitized responses.
 
+    Pure ASGI, so streaming responses and background tasks run unbuffered.
+    If the exception happens after the response has started (e.g. mid-stream)
+    a JSON error can no longer be sent; it is logged and re-raised.
+
     Add to FastAPI app:
         app.add_middleware(ErrorHandlingMiddleware, debug=settings.DEBUG)
     """
 
-    def __init__(self, app, debug: bool = False):
-        super().__init__(app)
+    def __init__(self, app: ASGIApp, debug: bool = False):
+        self.app = app
         self.debug = debug
 
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
         try:
-            return await call_next(request)
+            await self.app(scope, receive, send_wrapper)
         except Exception as exc:
             # Don't catch HTTPExceptions - let FastAPI handle them normally
             if isinstance(exc, HTTPException):
                 raise
 
-            return handle_exception_safely(
+            response = handle_exception_safely(
                 exception=exc,
-                request=request,
+                request=Request(scope),
                 debug_mode=self.debug,
             )
+            if response_started:
+                raise
+            await response(scope, receive, send)
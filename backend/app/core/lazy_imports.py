@@ -0,0 +1,51 @@
+"""
+Deferred imports for heavy third-party SDKs.
+
+Stripe, Resend, markdown2 and the Supabase client together add a large part
+of the app's import time, but most requests never touch them. A LazyModule
+stands in for the module at import time and loads (and configures) it on
+first attribute access, so a serverless cold start only pays for what the
+first request actually uses.
+
+Usage:
+    stripe = LazyModule("stripe", configure=lambda m: setattr(m, "api_key", key))
+
+    stripe.Customer.create(...)   # imports + configures stripe here
+"""
+
+import importlib
+import threading
+from types import ModuleType
+from typing import Callable, Optional
+
+
+class LazyModule:
+    """Proxy that imports a module the first time one of its attributes is used"""
+
+    def __init__(self, name: str, configure: Optional[Callable[[ModuleType], None]] = None):
+        self._name = name
+        self._configure = configure
+        self._module: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def load(self) -> ModuleType:
+        """Import (and configure) the module now; used by warmup"""
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    module = importlib.import_module(self._name)
+                    if self._configure is not None:
+                        self._configure(module)
+                    self._module = module
+        return self._module
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._module is not None
+
+    def __getattr__(self, attr: str):
+        return getattr(self.load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self.is_loaded else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
@@ -0,0 +1,343 @@
+"""
+Request performance metrics.
+
+Records, per route template:
+- request latency histogram
+- DB query count and time (SQLAlchemy engine events)
+- DB connection pool usage and checkout wait (app.core.database.pool_status)
+- outbound HTTP time to Supabase, Resend and Stripe (httpx / requests hooks)
+
+Each response gets a Server-Timing header (visible in browser dev tools), and
+the aggregated numbers are served in Prometheus text format at /api/metrics.
+
+Everything is kept in-process with plain counters behind one lock; the per
+request cost is a few perf_counter() calls and dict updates.
+
+Usage (main.py):
+    from app.core.metrics import MetricsMiddleware, instrument_engine, instrument_http_clients
+
+    instrument_engine(engine)
+    instrument_http_clients()
+    app.add_middleware(MetricsMiddleware)
+"""
+
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+# Latency histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Outbound host suffix -> service label
+EXTERNAL_SERVICES = (
+    ("supabase.co", "supabase"),
+    ("supabase.com", "supabase"),
+    ("resend.com", "resend"),
+    ("stripe.com", "stripe"),
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestStats:
+    """Timing collected while handling a single request"""
+
+    __slots__ = ("db_count", "db_time", "pool_wait", "external")
+
+    def __init__(self):
+        self.db_count = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.external: Dict[str, float] = {}
+
+    def add_external(self, service: str, duration: float) -> None:
+        self.external[service] = self.external.get(service, 0.0) + duration
+
+
+# The stats object is shared by reference, so sync endpoints running in the
+# threadpool (which copies the context) still record into the same request
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+class MetricsRegistry:
+    """Process-wide aggregates rendered as Prometheus text"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (method, route, status) -> [bucket counts..., +Inf count, sum]
+        self._latency: Dict[Tuple[str, str, str], List[float]] = {}
+        # route -> [query count, query seconds]
+        self._db: Dict[str, List[float]] = {}
+        # service -> [request count, seconds]
+        self._external: Dict[str, List[float]] = {}
+
+    def observe_request(self, method: str, route: str, status: int, duration: float, stats: RequestStats) -> None:
+        key = (method, route, str(status))
+        with self._lock:
+            series = self._latency.get(key)
+            if series is None:
+                series = self._latency[key] = [0.0] * (len(LATENCY_BUCKETS) + 2)
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if duration <= bound:
+                    series[i] += 1
+            series[-2] += 1
+            series[-1] += duration
+
+            db = self._db.get(route)
+            if db is None:
+                db = self._db[route] = [0.0, 0.0]
+            db[0] += stats.db_count
+            db[1] += stats.db_time
+
+    def observe_external(self, service: str, duration: float) -> None:
+        with self._lock:
+            series = self._external.get(service)
+            if series is None:
+                series = self._external[service] = [0.0, 0.0]
+            series[0] += 1
+            series[1] += duration
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            lines.append("# HELP http_request_duration_seconds Request latency by route template")
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for (method, route, status), series in sorted(self._latency.items()):
+                labels = f'method="{method}",route="{route}",status="{status}"'
+                for i, bound in enumerate(LATENCY_BUCKETS):
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {int(series[i])}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {int(series[-2])}')
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {int(series[-2])}")
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {series[-1]:.6f}")
+
+            lines.append("# HELP db_queries_total SQL statements executed, by route template")
+            lines.append("# TYPE db_queries_total counter")
+            for route, (count, _) in sorted(self._db.items()):
+                lines.append(f'db_queries_total{{route="{route}"}} {int(count)}')
+
+            lines.append("# HELP db_query_duration_seconds_total Time spent in SQL statements, by route template")
+            lines.append("# TYPE db_query_duration_seconds_total counter")
+            for route, (_, seconds) in sorted(self._db.items()):
+                lines.append(f'db_query_duration_seconds_total{{route="{route}"}} {seconds:.6f}')
+
+            lines.append("# HELP external_http_requests_total Outbound HTTP requests by service")
+            lines.append("# TYPE external_http_requests_total counter")
+            for service, (count, _) in sorted(self._external.items()):
+                lines.append(f'external_http_requests_total{{service="{service}"}} {int(count)}')
+
+            lines.append("# HELP external_http_duration_seconds_total Outbound HTTP time by service")
+            lines.append("# TYPE external_http_duration_seconds_total counter")
+            for service, (_, seconds) in sorted(self._external.items()):
+                lines.append(f'external_http_duration_seconds_total{{service="{service}"}} {seconds:.6f}')
+
+        lines.extend(render_pool_metrics())
+        return "\n".join(lines) + "\n"
+
+
+def render_pool_metrics() -> List[str]:
+    """Connection pool gauges and counters from app.core.database"""
+    from app.core.database import pool_status, read_routing_counts
+
+    pool = pool_status()
+    return [
+        "# HELP db_read_sessions_total Read-only sessions by the database that served them",
+        "# TYPE db_read_sessions_total counter",
+        *(f'db_read_sessions_total{{target="{target}"}} {count}' for target, count in sorted(read_routing_counts.items())),
+        "# HELP db_pool_connections Connections in the pool by state",
+        "# TYPE db_pool_connections gauge",
+        f'db_pool_connections{{state="in_use"}} {pool["checked_out"]}',
+        f'db_pool_connections{{state="idle"}} {pool["idle"]}',
+        f'db_pool_connections{{state="overflow"}} {pool["overflow"]}',
+        "# HELP db_pool_size Configured pool size (max connections = size + max_overflow)",
+        "# TYPE db_pool_size gauge",
+        f"db_pool_size {pool['size']}",
+        f"db_pool_max_overflow {pool['max_overflow']}",
+        "# HELP db_pool_checkout_wait_seconds_total Time spent waiting for a pooled connection",
+        "# TYPE db_pool_checkout_wait_seconds_total counter",
+        f"db_pool_checkout_wait_seconds_total {pool['wait_seconds']:.6f}",
+        f"db_pool_checkouts_total {pool['checkouts']}",
+        f"db_pool_checkout_wait_seconds_max {pool['max_wait_seconds']:.6f}",
+        "# HELP db_pool_timeouts_total Checkouts that gave up after DB_POOL_TIMEOUT",
+        "# TYPE db_pool_timeouts_total counter",
+        f"db_pool_timeouts_total {pool['timeouts']}",
+        f"db_pool_liveness_failures_total {pool['liveness_failures']}",
+    ]
+
+
+registry = MetricsRegistry()
+
+
+# ============================================================================
+# SQLALCHEMY HOOKS
+# ============================================================================
+
+def instrument_engine(engine) -> None:
+    """Count and time every SQL statement executed during a request"""
+    from sqlalchemy import event
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("query_start")
+        if not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        stats = current_request_stats.get()
+        if stats is not None:
+            stats.db_count += 1
+            stats.db_time += duration
+
+
+# ============================================================================
+# OUTBOUND HTTP HOOKS
+# ============================================================================
+
+def classify_host(url) -> Optional[str]:
+    """Map an outbound URL to a service label (None for untracked hosts)"""
+    host = urlsplit(str(url)).hostname or ""
+    for suffix, service in EXTERNAL_SERVICES:
+        if host == suffix or host.endswith("." + suffix):
+            return service
+    return None
+
+
+def record_external(service: str, duration: float) -> None:
+    registry.observe_external(service, duration)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.add_external(service, duration)
+
+
+def instrument_http_clients() -> None:
+    """
+    Time outbound calls made through httpx (Supabase) and requests (Resend, Stripe).
+    Safe to call more than once; missing libraries are skipped.
+    """
+    try:
+        import httpx
+
+        if not getattr(httpx.Client.send, "_camp_metrics", False):
+            original_httpx_send = httpx.Client.send
+
+            def httpx_send(self, request, *args, **kwargs):
+                service = classify_host(request.url)
+                if service is None:
+                    return original_httpx_send(self, request, *args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return original_httpx_send(self, request, *args, **kwargs)
+                finally:
+                    record_external(service, time.perf_counter() - start)
+
+            httpx_send._camp_metrics = True
+            httpx.Client.send = httpx_send
+    except ImportError:
+        pass
+
+    try:
+        import requests
+
+        if not getattr(requests.Session.send, "_camp_metrics", False):
+            original_requests_send = requests.Session.send
+
+            def requests_send(self, request, **kwargs):
+                service = classify_host(request.url)
+                if service is None:
+                    return original_requests_send(self, request, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return original_requests_send(self, request, **kwargs)
+                finally:
+                    record_external(service, time.perf_counter() - start)
+
+            requests_send._camp_metrics = True
+            requests.Session.send = requests_send
+    except ImportError:
+        pass
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+def format_server_timing(total: float, stats: RequestStats) -> str:
+    """Build a Server-Timing header value (durations in milliseconds)"""
+    parts = [f"app;dur={total * 1000:.1f}"]
+    if stats.pool_wait >= 0.001:
+        parts.append(f"pool;dur={stats.pool_wait * 1000:.1f}")
+    if stats.db_count:
+        parts.append(f'db;dur={stats.db_time * 1000:.1f};desc="{stats.db_count} queries"')
+    for service, seconds in stats.external.items():
+        parts.append(f"{service};dur={seconds * 1000:.1f}")
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware: times each HTTP request, adds Server-Timing and
+    records the request under its route template (e.g. /api/applications/{application_id}).
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._route_paths: Dict[object, str] = {}
+
+    def route_template(self, scope) -> str:
+        route = scope.get("route")
+        if route is not None:
+            return getattr(route, "path_format", None) or getattr(route, "path", UNMATCHED_ROUTE)
+
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        path = self._route_paths.get(endpoint)
+        if path is None:
+            router = scope.get("router")
+            for candidate in getattr(router, "routes", []):
+                if getattr(candidate, "endpoint", None) is endpoint:
+                    path = getattr(candidate, "path_format", None) or candidate.path
+                    break
+            path = path or UNMATCHED_ROUTE
+            self._route_paths[endpoint] = path
+        return path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    format_server_timing(time.perf_counter() - start, stats).encode("latin-1"),
+                ))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_stats.reset(token)
+            registry.observe_request(
+                scope["method"],
+                self.route_template(scope),
+                status_code,
+                time.perf_counter() - start,
+                stats,
+            )
@@ -0,0 +1,266 @@
+"""
+Opt-in sampling profiler for production requests.
+
+Disabled unless PROFILING_ENABLED=true. When disabled the middleware isn't
+installed and @profiled_section returns the wrapped function unchanged, so
+there is no per-request or per-call cost.
+
+When enabled, a request is profiled if either:
+- it carries a valid X-Profile-Token header (HMAC-signed, short-lived; super
+  admins get one from POST /api/super-admin/profiles/token), or
+- it is picked by random sampling (PROFILING_SAMPLE_RATE, default 0)
+
+While a request is profiled, a background thread samples the Python stacks
+of the process every PROFILING_INTERVAL_MS and keeps the ones that run app/
+code. Stacks are stored in the "folded" format (frame;frame;frame count)
+that speedscope and flamegraph.pl read directly. Named sections
+(completion calculation, email rendering, Stripe calls) are also timed.
+
+Note: the sampler sees the whole process, so requests running concurrently
+in the same worker can show up in each other's profiles.
+
+Profiles are saved to request_profiles (migration 042) and listed under
+/api/super-admin/profiles.
+"""
+
+import functools
+import hashlib
+import hmac
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger("profiling")
+
+PROFILE_HEADER = b"x-profile-token"
+TOKEN_TTL_SECONDS = 600
+MAX_STACK_DEPTH = 64
+
+
+class RequestProfile:
+    """Samples and section timings collected for one request"""
+
+    def __init__(self, method: str, path: str, trigger: str):
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.samples: Counter = Counter()
+        self.sections: Dict[str, List[float]] = {}  # name -> [calls, seconds]
+        self._lock = threading.Lock()
+
+    def add_section(self, name: str, duration: float) -> None:
+        with self._lock:
+            entry = self.sections.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+
+    def folded_stacks(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+
+current_profile: ContextVar[Optional[RequestProfile]] = ContextVar("current_profile", default=None)
+# Sections currently running, so nested calls (apply_scholarship -> void_invoice) aren't double counted
+active_sections: ContextVar[frozenset] = ContextVar("active_sections", default=frozenset())
+
+
+# ============================================================================
+# SIGNED TRIGGER TOKENS
+# ============================================================================
+
+def _sign(payload: str) -> str:
+    return hmac.new(settings.PROFILING_SECRET.encode(), payload.encode(), hashlib.sha256).hexdigest()
+
+
+def make_profile_token(ttl_seconds: int = TOKEN_TTL_SECONDS) -> str:
+    """Create a token ("<expires_at>.<signature>") that enables profiling until it expires"""
+    expires_at = str(int(time.time()) + ttl_seconds)
+    return f"{expires_at}.{_sign(expires_at)}"
+
+
+def verify_profile_token(token: str) -> bool:
+    if not settings.PROFILING_SECRET or "." not in token:
+        return False
+    expires_at, signature = token.split(".", 1)
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(expires_at))
+
+
+# ============================================================================
+# SAMPLER
+# ============================================================================
+
+def _frame_label(frame) -> str:
+    filename = frame.f_code.co_filename.replace("\\", "/")
+    if "/app/" in filename:
+        filename = filename[filename.rindex("/app/") + 1:]
+    else:
+        filename = filename.rsplit("/", 1)[-1]
+    return f"{frame.f_code.co_name} ({filename}:{frame.f_lineno})"
+
+
+class StackSampler(threading.Thread):
+    """Samples every thread's stack at a fixed interval until stopped"""
+
+    def __init__(self, profile: RequestProfile, interval: float):
+        super().__init__(name="request-profiler", daemon=True)
+        self.profile = profile
+        self.interval = interval
+        self._stop_event = threading.Event()
+
+    def run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                labels = []
+                while frame is not None and len(labels) < MAX_STACK_DEPTH:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                if any("(app/" in label for label in labels):
+                    self.profile.samples[";".join(reversed(labels))] += 1
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self.join(timeout=1)
+
+
+# ============================================================================
+# SECTION TIMING HOOK
+# ============================================================================
+
+def profiled_section(name: str):
+    """
+    Time a function as a named section of the current profile.
+    Returns the function unchanged when profiling is disabled.
+    """
+    def decorator(func):
+        if not settings.PROFILING_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = current_profile.get()
+            running = active_sections.get()
+            if profile is None or name in running:
+                return func(*args, **kwargs)
+            token = active_sections.set(running | {name})
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add_section(name, time.perf_counter() - start)
+                active_sections.reset(token)
+        return wrapper
+
+    return decorator
+
+
+# ============================================================================
+# STORAGE
+# ============================================================================
+
+def save_profile(profile: RequestProfile, route: Optional[str], status_code: int, duration: float) -> None:
+    """Persist a finished profile on its own session (never fails the request)"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        db.execute(
+            text("""
+                INSERT INTO request_profiles (
+                    method, path, route, status_code, duration_ms, trigger,
+                    sample_count, sections, folded_stacks
+                ) VALUES (
+                    :method, :path, :route, :status_code, :duration_ms, :trigger,
+                    :sample_count, CAST(:sections AS JSONB), :folded_stacks
+                )
+            """),
+            {
+                'method': profile.method,
+                'path': profile.path,
+                'route': route,
+                'status_code': status_code,
+                'duration_ms': round(duration * 1000, 1),
+                'trigger': profile.trigger,
+                'sample_count': sum(profile.samples.values()),
+                'sections': json.dumps({
+                    name: {'calls': calls, 'ms': round(seconds * 1000, 1)}
+                    for name, (calls, seconds) in profile.sections.items()
+                }),
+                'folded_stacks': profile.folded_stacks(),
+            }
+        )
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Failed to save request profile: {e}")
+    finally:
+        db.close()
+
+
+# ============================================================================
+# MIDDLEWARE
+# ============================================================================
+
+class ProfilingMiddleware:
+    """Pure ASGI middleware that profiles token-carrying or sampled requests"""
+
+    def __init__(self, app, sample_rate: float = 0.0, interval_ms: float = 5.0):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+
+    def trigger_for(self, scope) -> Optional[str]:
+        for name, value in scope.get("headers", []):
+            if name == PROFILE_HEADER:
+                return "token" if verify_profile_token(value.decode("latin-1")) else None
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self.trigger_for(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], trigger)
+        token = current_profile.set(profile)
+        sampler = StackSampler(profile, self.interval)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        start = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            sampler.stop()
+            current_profile.reset(token)
+            route = scope.get("route")
+            route_path = getattr(route, "path_format", None) or getattr(route, "path", None)
+            threading.Thread(
+                target=save_profile,
+                args=(profile, route_path, status_code, duration),
+                daemon=True
+            ).start()
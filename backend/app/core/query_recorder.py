@@ -0,0 +1,249 @@
+"""
+SQL query recorder, N+1 detection and query budgets.
+
+Records every statement executed on the engine while a recorder is active and
+groups them by "shape" (the SQL with parameters and literals stripped). The
+same shape executed many times in one request is the signature of an N+1
+loop (a query per row of a previous result).
+
+Three ways to use it:
+
+1. Query budgets on endpoints or helpers. Exceeding the budget logs a
+   warning, or raises QueryBudgetExceeded when QUERY_BUDGET_ENFORCE=true
+   (set that in test and dev environments):
+
+    @router.get("/teams")
+    @query_budget(2)
+    async def get_all_teams(...):
+        ...
+
+2. Assertions in tests / scripts:
+
+    with assert_query_budget(3, max_repeats=1):
+        client.get("/api/super-admin/teams", headers=...)
+
+3. Per-request N+1 logging (QUERY_DEBUG=true): NPlusOneDetectionMiddleware
+   logs every repeated shape with the application call sites that issued it.
+
+Statements the infrastructure issues on its own (per-transaction SET LOCAL
+timeouts, replica lag checks) are executed with UNRECORDED and don't count:
+
+    conn.exec_driver_sql("SET LOCAL ...", execution_options=UNRECORDED)
+"""
+
+import asyncio
+import functools
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger("queries")
+
+# Execution options marking a statement as infrastructure, not endpoint work
+UNRECORDED = {"query_recorder_skip": True}
+
+_PARAM_RE = re.compile(r"%\(\w+\)s|%s|\$\d+|\?")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_IN_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so executions that differ only in values compare equal"""
+    shape = _PARAM_RE.sub("?", statement)
+    shape = _LITERAL_RE.sub("?", shape)
+    shape = _IN_LIST_RE.sub("(?)", shape)
+    return _WHITESPACE_RE.sub(" ", shape).strip()
+
+
+def application_call_site() -> Optional[str]:
+    """Innermost stack frame inside app/ that isn't this module (file:line in function)"""
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename.replace("\\", "/")
+        if "/app/" in filename and not filename.endswith("app/core/query_recorder.py"):
+            short_name = filename[filename.rindex("/app/") + 1:]
+            return f"{short_name}:{frame.lineno} in {frame.name}"
+    return None
+
+
+class QueryRecorder:
+    """Collects statements executed while it is active"""
+
+    def __init__(self, capture_call_sites: bool = False):
+        self.capture_call_sites = capture_call_sites
+        self.count = 0
+        self.total_time = 0.0
+        self.shapes: Counter = Counter()
+        self.call_sites: Dict[str, Counter] = {}
+
+    def record(self, statement: str, duration: float) -> None:
+        shape = statement_shape(statement)
+        self.count += 1
+        self.total_time += duration
+        self.shapes[shape] += 1
+
+        if self.capture_call_sites:
+            site = application_call_site()
+            if site:
+                self.call_sites.setdefault(shape, Counter())[site] += 1
+
+    def repeated_shapes(self, threshold: int) -> List[Tuple[str, int]]:
+        """Shapes executed at least `threshold` times, most frequent first"""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= threshold]
+
+    def summary(self, threshold: int = 2, max_sql_length: int = 200) -> str:
+        lines = [f"{self.count} queries in {self.total_time * 1000:.1f}ms"]
+        for shape, n in self.repeated_shapes(threshold):
+            lines.append(f"  {n}x {shape[:max_sql_length]}")
+            for site, site_count in self.call_sites.get(shape, Counter()).most_common(3):
+                lines.append(f"      {site_count}x from {site}")
+        return "\n".join(lines)
+
+
+# Active recorders for the current context (nested recorders all receive statements)
+active_recorders: ContextVar[Tuple[QueryRecorder, ...]] = ContextVar("active_recorders", default=())
+
+_instrumented_engines = set()
+
+
+def install_query_recorder(engine) -> None:
+    """Attach the recorder hooks to an engine (idempotent)"""
+    if id(engine) in _instrumented_engines:
+        return
+    _instrumented_engines.add(id(engine))
+
+    from sqlalchemy import event
+
+    def _unrecorded(context) -> bool:
+        return context is not None and context.execution_options.get("query_recorder_skip", False)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if active_recorders.get() and not _unrecorded(context):
+            conn.info.setdefault("recorder_start", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _unrecorded(context):
+            return
+        recorders = active_recorders.get()
+        starts = conn.info.get("recorder_start")
+        if not recorders or not starts:
+            return
+        duration = time.perf_counter() - starts.pop()
+        for recorder in recorders:
+            recorder.record(statement, duration)
+
+
+@contextmanager
+def record_queries(capture_call_sites: bool = False):
+    """Record statements executed inside the block"""
+    from app.core.database import engine, replica_engine
+    install_query_recorder(engine)
+    if replica_engine is not None:
+        install_query_recorder(replica_engine)
+
+    recorder = QueryRecorder(capture_call_sites=capture_call_sites)
+    token = active_recorders.set(active_recorders.get() + (recorder,))
+    try:
+        yield recorder
+    finally:
+        active_recorders.reset(token)
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised when a block or endpoint runs more queries than its budget"""
+
+
+def check_query_budget(recorder: QueryRecorder, max_queries: int, max_repeats: Optional[int], label: str) -> Optional[str]:
+    """Return a failure message if the recorder broke the budget, else None"""
+    problems = []
+    if recorder.count > max_queries:
+        problems.append(f"{recorder.count} queries (budget {max_queries})")
+    if max_repeats is not None:
+        repeated = recorder.repeated_shapes(max_repeats + 1)
+        if repeated:
+            problems.append(f"{len(repeated)} statement shape(s) repeated more than {max_repeats}x")
+    if not problems:
+        return None
+    return f"{label}: {', '.join(problems)}\n{recorder.summary()}"
+
+
+@contextmanager
+def assert_query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """Raise QueryBudgetExceeded if the block runs more than max_queries statements"""
+    with record_queries(capture_call_sites=True) as recorder:
+        yield recorder
+    failure = check_query_budget(recorder, max_queries, max_repeats, "Query budget exceeded")
+    if failure:
+        raise QueryBudgetExceeded(failure)
+
+
+def query_budget(max_queries: int, max_repeats: Optional[int] = None):
+    """
+    Decorator declaring how many queries a function may run.
+
+    Over budget: raises QueryBudgetExceeded when QUERY_BUDGET_ENFORCE is on,
+    otherwise logs a warning with the repeated statements.
+    """
+    def report(func, recorder):
+        failure = check_query_budget(
+            recorder, max_queries, max_repeats, f"{func.__module__}.{func.__qualname__}"
+        )
+        if not failure:
+            return
+        if settings.QUERY_BUDGET_ENFORCE:
+            raise QueryBudgetExceeded(failure)
+        logger.warning(failure)
+
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with record_queries(capture_call_sites=settings.QUERY_DEBUG) as recorder:
+                    result = await func(*args, **kwargs)
+                report(func, recorder)
+                return result
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with record_queries(capture_call_sites=settings.QUERY_DEBUG) as recorder:
+                result = func(*args, **kwargs)
+            report(func, recorder)
+            return result
+        return wrapper
+
+    return decorator
+
+
+class NPlusOneDetectionMiddleware:
+    """
+    Pure ASGI middleware (enable with QUERY_DEBUG): records each request's
+    queries and logs statement shapes repeated N_PLUS_ONE_THRESHOLD+ times,
+    with the call sites that issued them.
+    """
+
+    def __init__(self, app, threshold: int = 5):
+        self.app = app
+        self.threshold = threshold
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with record_queries(capture_call_sites=True) as recorder:
+            await self.app(scope, receive, send)
+
+        if recorder.repeated_shapes(self.threshold):
+            logger.warning(
+                f"Possible N+1 in {scope['method']} {scope['path']}: "
+                f"{recorder.summary(threshold=self.threshold)}"
+            )
@@ -2,6 +2,9 @@
 Rate limiting configuration for API endpoints.
 
 Uses slowapi library for rate limiting based on IP address and/or user.
+Counters live in Postgres by default (see rate_limit_storage.py) so limits are
+shared across workers and serverless instances. RATE_LIMIT_STORAGE_URI can
+point at "memory://" for local development.
 
 Rate limits help prevent:
 - Brute force attacks on login/registration
@@ -29,6 +32,8 @@ from slowapi.errors import RateLimitExceeded
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from typing import Optional
+from app.core.config import settings
+from app.core import rate_limit_storage  # noqa: F401 - registers the campdb:// storage scheme
 
 
 def get_user_or_ip(request: Request) -> str:
@@ -38,7 +43,7 @@ def get_user_or_ip(request: Request) -> str:
     This allows authenticated users to have separate rate limits from
     anonymous users, and prevents one malicious user from affecting others.
     """
-    # Try to get user ID from request state (set by auth middleware)
+    # Try to get user ID from request state (set by the get_current_user dependency)
     user_id = getattr(request.state, "user_id", None)
     if user_id:
         return f"user:{user_id}"
@@ -48,11 +53,12 @@ def get_user_or_ip(request: Request) -> str:
 
 
 # Create limiter instance
-# Uses IP address as the default key function
+# Keys on the authenticated user when the route depends on get_current_user,
+# otherwise on the client IP address
 limiter = Limiter(
-    key_func=get_remote_address,
+    key_func=get_user_or_ip,
     default_limits=["60/minute"],  # Default rate limit for all endpoints
-    storage_uri="memory://",  # In-memory storage (use Redis for production scale)
+    storage_uri=settings.RATE_LIMIT_STORAGE_URI,  # Shared Postgres counters by default
 )
 
 
@@ -0,0 +1,177 @@
+"""
+Postgres storage backend for slowapi / limits.
+
+The default "memory://" storage keeps counters per process, so every Uvicorn
+worker and every Vercel instance had its own budget and the effective limit
+grew with the number of instances. This backend keeps fixed-window counters
+in the UNLOGGED rate_limit_counters table (migration 041), shared by every
+instance that talks to the same database.
+
+Each hit is a single upsert round trip on the app's existing engine.
+
+Fast path: once a key is over its limit, further hits in the same window are
+answered from a small in-process cache without touching the database. That
+is the brute-force / abuse case, where the traffic volume is highest.
+
+If the database is unreachable the limiter fails open (logs and allows the
+request) rather than taking the API down with it.
+
+Usage:
+    limiter = Limiter(key_func=..., storage_uri="campdb://")
+"""
+
+import random
+import threading
+import time
+from typing import Dict, Optional, Tuple
+from limits.storage import Storage
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.logging_config import get_logger
+
+logger = get_logger("rate_limit")
+
+# Roughly one in this many hits also deletes expired counter rows
+CLEANUP_PROBABILITY = 1 / 500
+# Upper bound on keys remembered by the over-limit fast path
+LOCAL_CACHE_MAX_KEYS = 10000
+
+
+def limit_amount_from_key(key: str) -> Optional[int]:
+    """
+    Extract the limit amount from a limits key.
+
+    limits builds keys as "LIMITER/<identifiers...>/<amount>/<multiples>/<granularity>",
+    so the amount is the third segment from the end.
+    """
+    parts = key.rsplit("/", 3)
+    if len(parts) != 4:
+        return None
+    try:
+        return int(parts[1])
+    except ValueError:
+        return None
+
+
+class PostgresStorage(Storage):
+    """Fixed / elastic window rate limit counters stored in Postgres"""
+
+    STORAGE_SCHEME = ["campdb"]
+
+    def __init__(self, uri: Optional[str] = None, **options):
+        # key -> (count, expires_at epoch seconds) for keys known to be over their limit
+        self._blocked: Dict[str, Tuple[int, float]] = {}
+        self._blocked_lock = threading.Lock()
+        super().__init__(uri, **options)
+
+    @property
+    def base_exceptions(self):
+        return SQLAlchemyError
+
+    @property
+    def engine(self):
+        # Imported lazily so configuring the limiter doesn't create the engine
+        from app.core.database import engine
+        return engine
+
+    def incr(self, key: str, expiry: int, elastic_expiry: bool = False, amount: int = 1) -> int:
+        now = time.time()
+
+        # Fast path: already over the limit in this window, no DB round trip
+        if not elastic_expiry:
+            with self._blocked_lock:
+                cached = self._blocked.get(key)
+                if cached and cached[1] > now:
+                    count = cached[0] + amount
+                    self._blocked[key] = (count, cached[1])
+                    return count
+                if cached:
+                    self._blocked.pop(key, None)
+
+        try:
+            with self.engine.begin() as conn:
+                row = conn.execute(
+                    text("""
+                        INSERT INTO rate_limit_counters (key, count, expires_at)
+                        VALUES (:key, :amount, NOW() + make_interval(secs => :expiry))
+                        ON CONFLICT (key) DO UPDATE SET
+                            count = CASE
+                                WHEN rate_limit_counters.expires_at <= NOW() THEN EXCLUDED.count
+                                ELSE rate_limit_counters.count + EXCLUDED.count
+                            END,
+                            expires_at = CASE
+                                WHEN rate_limit_counters.expires_at <= NOW() OR :elastic THEN EXCLUDED.expires_at
+                                ELSE rate_limit_counters.expires_at
+                            END
+                        RETURNING count, EXTRACT(EPOCH FROM expires_at)
+                    """),
+                    {'key': key, 'amount': amount, 'expiry': expiry, 'elastic': elastic_expiry}
+                ).fetchone()
+
+                if random.random() < CLEANUP_PROBABILITY:
+                    conn.execute(text("DELETE FROM rate_limit_counters WHERE expires_at <= NOW()"))
+        except SQLAlchemyError as e:
+            logger.error(f"Rate limit storage unavailable, allowing request: {e}")
+            return 0
+
+        count, expires_at = int(row[0]), float(row[1])
+
+        limit_amount = limit_amount_from_key(key)
+        if limit_amount is not None and count > limit_amount and not elastic_expiry:
+            with self._blocked_lock:
+                if len(self._blocked) >= LOCAL_CACHE_MAX_KEYS:
+                    self._blocked.clear()
+                self._blocked[key] = (count, expires_at)
+
+        return count
+
+    def get(self, key: str) -> int:
+        try:
+            with self.engine.connect() as conn:
+                count = conn.execute(
+                    text("""
+                        SELECT count FROM rate_limit_counters
+                        WHERE key = :key AND expires_at > NOW()
+                    """),
+                    {'key': key}
+                ).scalar()
+        except SQLAlchemyError as e:
+            logger.error(f"Rate limit storage unavailable: {e}")
+            return 0
+        return int(count or 0)
+
+    def get_expiry(self, key: str) -> int:
+        try:
+            with self.engine.connect() as conn:
+                expires_at = conn.execute(
+                    text("""
+                        SELECT EXTRACT(EPOCH FROM expires_at) FROM rate_limit_counters
+                        WHERE key = :key
+                    """),
+                    {'key': key}
+                ).scalar()
+        except SQLAlchemyError as e:
+            logger.error(f"Rate limit storage unavailable: {e}")
+            expires_at = None
+        return int(expires_at) if expires_at else int(time.time())
+
+    def check(self) -> bool:
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1 FROM rate_limit_counters LIMIT 1"))
+            return True
+        except SQLAlchemyError:
+            return False
+
+    def reset(self) -> Optional[int]:
+        with self._blocked_lock:
+            self._blocked.clear()
+        with self.engine.begin() as conn:
+            result = conn.execute(text("DELETE FROM rate_limit_counters"))
+        return result.rowcount
+
+    def clear(self, key: str) -> None:
+        with self._blocked_lock:
+            self._blocked.pop(key, None)
+        with self.engine.begin() as conn:
+            conn.execute(text("DELETE FROM rate_limit_counters WHERE key = :key"), {'key': key})
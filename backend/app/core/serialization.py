@@ -0,0 +1,123 @@
+"""
+Fast JSON serialization for API responses.
+
+FastJSONResponse is the app's default response class: it renders with orjson
+(stdlib json fallback if orjson isn't installed), which is several times
+faster than json.dumps and handles UUID / datetime natively. UTC datetimes
+are written with a "Z" suffix, as pydantic writes them, so endpoints that
+skip pydantic serialization return the same format as the rest of the API.
+
+For the largest list endpoints, returning dicts still costs two passes
+before rendering: pydantic validation of every row (model_validate +
+model_dump) and FastAPI's jsonable_encoder walk over the result. A
+Projection builds the same dict shape straight from ORM attributes, driven
+by the schema's field list so the two can't drift apart; returning
+FastJSONResponse(...) directly then skips FastAPI's re-encoding. Such
+routes don't declare response_model (FastAPI would not apply it to a
+returned Response anyway).
+
+Usage:
+    application_projection = Projection(ApplicationWithUser)
+
+    return FastJSONResponse([application_projection(app) for app in applications])
+"""
+
+import json
+import typing
+from datetime import date, datetime, time
+from decimal import Decimal
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Type
+from uuid import UUID
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+
+def json_default(value: Any) -> Any:
+    """Encode types neither orjson nor json handle (same results as FastAPI's jsonable_encoder)"""
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (UUID,)):
+        return str(value)
+    if isinstance(value, datetime) and value.utcoffset() is not None and not value.utcoffset():
+        return value.isoformat().replace("+00:00", "Z")  # pydantic's format (orjson: OPT_UTC_Z)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=json_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+    return json.dumps(content, default=json_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# ============================================================================
+# PROJECTIONS
+# ============================================================================
+
+def _nested_schema(annotation) -> Tuple[Optional[Type[BaseModel]], bool]:
+    """(nested model, is_list) for annotations like UserInfo, Optional[UserInfo], List[UserInfo]"""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        return _nested_schema(args[0]) if len(args) == 1 else (None, False)
+    if origin in (list, List):
+        args = typing.get_args(annotation)
+        model, _ = _nested_schema(args[0]) if args else (None, False)
+        return model, model is not None
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation, False
+    return None, False
+
+
+class Projection:
+    """
+    Dumps an ORM object to a dict shaped like `schema`, without validation.
+
+    Values are read as-is (UUIDs and datetimes are left for the JSON encoder);
+    attributes the object doesn't have fall back to the schema default, as
+    model_validate would. Nested schemas (UserInfo, List[ApplicationResponse])
+    are projected recursively.
+    """
+
+    _cache: Dict[Type[BaseModel], "Projection"] = {}
+
+    def __init__(self, schema: Type[BaseModel]):
+        self.schema = schema
+        self.fields = []
+        Projection._cache[schema] = self
+        for name, field in schema.model_fields.items():
+            nested, is_list = _nested_schema(field.annotation)
+            nested_projection = None
+            if nested is not None:
+                nested_projection = Projection._cache.get(nested) or Projection(nested)
+            default = None if field.is_required() else field.get_default(call_default_factory=True)
+            self.fields.append((name, default, nested_projection, is_list))
+
+    def __call__(self, obj: Any) -> Dict[str, Any]:
+        data = {}
+        for name, default, nested, is_list in self.fields:
+            value = getattr(obj, name, default)
+            if nested is not None and value is not None:
+                value = [nested(item) for item in value] if is_list else nested(value)
+            data[name] = value
+        return data
@@ -0,0 +1,83 @@
+"""
+Instance warmup.
+
+Heavy SDKs and external clients are created lazily (see lazy_imports), which
+keeps cold-start imports small. Once the instance is up, warm_up() pays
+those costs in a background thread so they don't land on a user request:
+
+- opens WARMUP_DB_CONNECTIONS pooled connections (primary and replica)
+- configures the ORM mappers and compiles the hot startup queries
+- imports Stripe / Resend / markdown2 and creates the Supabase clients
+
+Started from the FastAPI startup event when WARMUP_ON_STARTUP is true.
+"""
+
+import threading
+import time
+from app.core.config import settings
+from app.core.logging_config import get_logger
+
+logger = get_logger("warmup")
+
+
+def prefill_pool(target_engine, connections: int) -> None:
+    """Open `connections` connections at once so the pool keeps them"""
+    opened = []
+    try:
+        for _ in range(connections):
+            conn = target_engine.connect()
+            conn.exec_driver_sql("SELECT 1")
+            opened.append(conn)
+    finally:
+        for conn in opened:
+            conn.close()
+
+
+def warm_database() -> None:
+    from sqlalchemy.orm import configure_mappers
+    from app.core.database import engine, replica_engine, SessionLocal
+    from app.models.super_admin import SystemConfiguration, Team
+
+    connections = min(settings.WARMUP_DB_CONNECTIONS, settings.DB_POOL_SIZE)
+    prefill_pool(engine, connections)
+    if replica_engine is not None:
+        prefill_pool(replica_engine, connections)
+
+    configure_mappers()
+
+    # Fills SQLAlchemy's compiled statement cache for queries every page load runs
+    db = SessionLocal()
+    try:
+        db.query(Team).filter(Team.is_active == True).order_by(Team.order_index).all()
+        db.query(SystemConfiguration).filter(SystemConfiguration.is_public == True).first()
+    finally:
+        db.close()
+
+
+def warm_clients() -> None:
+    from app.services import email_service, storage_service, stripe_service
+
+    stripe_service.stripe.load()
+    email_service.resend.load()
+    email_service.markdown2.load()
+    storage_service.get_supabase()
+
+
+def warm_up() -> None:
+    """Run every warmup step; failures are logged and never raised"""
+    start = time.perf_counter()
+    for step in (warm_database, warm_clients):
+        step_start = time.perf_counter()
+        try:
+            step()
+            logger.info(f"Warmup {step.__name__} took {(time.perf_counter() - step_start) * 1000:.0f}ms")
+        except Exception as e:
+            logger.warning(f"Warmup {step.__name__} failed: {e}")
+    logger.info(f"Warmup finished in {(time.perf_counter() - start) * 1000:.0f}ms")
+
+
+def start_warmup() -> threading.Thread:
+    """Run warm_up() in a daemon thread so startup doesn't wait for it"""
+    thread = threading.Thread(target=warm_up, name="warmup", daemon=True)
+    thread.start()
+    return thread
@@ -2,14 +2,19 @@
 CAMP FASD Application Portal - Main FastAPI Application
 """
 
-from fastapi import FastAPI, HTTPException, status, Depends
+import hmac
+from typing import Optional
+from fastapi import FastAPI, HTTPException, status, Depends, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from sqlalchemy.orm import Session
 from app.core.config import settings
-from app.core.database import get_db
+from app.core.database import get_db, engine, replica_engine
 from app.core.csrf import CSRFProtectionMiddleware
 from app.core.exceptions import ErrorHandlingMiddleware
 from app.core.rate_limit import limiter, rate_limit_exceeded_handler
+from app.core.serialization import FastJSONResponse
+from app.core.metrics import MetricsMiddleware, instrument_engine, instrument_http_clients, registry as metrics_registry
 from slowapi.errors import RateLimitExceeded
 
 app = FastAPI(
@@ -17,7 +22,8 @@ app = FastAPI(
     description="API for managing camper applications",
     version="1.0.0",
     docs_url="/api/docs",
-    redoc_url="/api/redoc"
+    redoc_url="/api/redoc",
+    default_response_class=FastJSONResponse  # orjson rendering for every endpoint
 )
 
 # CORS middleware - restrict to specific methods and headers for security
@@ -26,7 +32,8 @@ app.add_middleware(
     allow_origins=settings.allowed_origins_list,
     allow_credentials=True,
     allow_methods=["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"],
-    allow_headers=["Authorization", "Content-Type", "X-Requested-With", "Accept"],
+    allow_headers=["Authorization", "Content-Type", "X-Requested-With", "Accept", "X-Profile-Token", "If-None-Match"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
 
 # CSRF Protection middleware
@@ -37,11 +44,68 @@ app.add_middleware(CSRFProtectionMiddleware, debug=settings.DEBUG)
 # Catches unhandled exceptions and returns sanitized responses with correlation IDs
 app.add_middleware(ErrorHandlingMiddleware, debug=settings.DEBUG)
 
+# N+1 query detection (development only)
+if settings.QUERY_DEBUG:
+    from app.core.query_recorder import NPlusOneDetectionMiddleware
+    app.add_middleware(NPlusOneDetectionMiddleware, threshold=settings.N_PLUS_ONE_THRESHOLD)
+
+# On-demand request profiling (only installed when enabled)
+if settings.PROFILING_ENABLED:
+    from app.core.profiling import ProfilingMiddleware
+    app.add_middleware(
+        ProfilingMiddleware,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval_ms=settings.PROFILING_INTERVAL_MS
+    )
+
+# Response compression (brotli/gzip above COMPRESSION_MIN_SIZE bytes)
+if settings.COMPRESSION_ENABLED:
+    from app.core.compression import CompressionMiddleware
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MIN_SIZE)
+
+# Performance metrics (outermost, so timings include every other middleware)
+# Adds Server-Timing headers and feeds /api/metrics
+if settings.METRICS_ENABLED:
+    instrument_engine(engine)
+    if replica_engine is not None:
+        instrument_engine(replica_engine)
+    instrument_http_clients()
+    app.add_middleware(MetricsMiddleware)
+
 # Rate limiting setup
 # Prevents brute force attacks and API abuse
 app.state.limiter = limiter
 app.add_exception_handler(RateLimitExceeded, rate_limit_exceeded_handler)
 
+
+@app.on_event("startup")
+def warm_up_instance():
+    """Prefill the DB pool and load lazy SDK clients off the request path"""
+    if settings.WARMUP_ON_STARTUP:
+        from app.core.warmup import start_warmup
+        start_warmup()
+
+
+@app.on_event("startup")
+def start_cache_bus():
+    """Listen for cache invalidations from other workers (listen mode only)"""
+    from app.core.cache_bus import cache_bus
+    cache_bus.start()
+
+
+@app.on_event("shutdown")
+def stop_cache_bus():
+    from app.core.cache_bus import cache_bus
+    cache_bus.stop()
+
+
+@app.on_event("shutdown")
+def flush_audit_buffer():
+    """Write any buffered audit events before the worker exits"""
+    from app.core.audit_buffer import audit_buffer
+    audit_buffer.shutdown()
+
+
 @app.get("/")
 async def root():
     """Health check endpoint"""
@@ -61,10 +125,37 @@ async def health_check():
     }
 
 
+@app.get("/api/metrics", include_in_schema=False)
+async def metrics(authorization: Optional[str] = Header(None)):
+    """
+    Prometheus metrics (text exposition format).
+    Requires "Authorization: Bearer <METRICS_TOKEN>"; without a token configured
+    the endpoint is only available in DEBUG mode.
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    if settings.METRICS_TOKEN:
+        expected = f"Bearer {settings.METRICS_TOKEN}"
+        if not authorization or not hmac.compare_digest(authorization, expected):
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid metrics token")
+    elif not settings.DEBUG:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not found")
+
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
+
+
 # ============================================================================
 # PUBLIC CONFIGURATION ENDPOINTS (No Authentication Required)
 # ============================================================================
 from app.models.super_admin import SystemConfiguration, Team
+from app.core.cache_bus import LocalCache, CACHE_SYSTEM_CONFIG, CACHE_TEAMS
+
+public_config_cache = LocalCache(CACHE_SYSTEM_CONFIG)
+public_teams_cache = LocalCache(CACHE_TEAMS)
 
 @app.get("/api/public/config/{key}", tags=["Public"])
 async def get_public_configuration(
@@ -76,18 +167,24 @@ async def get_public_configuration(
     Only returns configurations where is_public = true.
     Used for things like status colors that need to be loaded before user logs in.
     """
-    config = db.query(SystemConfiguration).filter(
-        SystemConfiguration.key == key,
-        SystemConfiguration.is_public == True
-    ).first()
-
-    if not config:
+    def load():
+        config = db.query(SystemConfiguration).filter(
+            SystemConfiguration.key == key,
+            SystemConfiguration.is_public == True
+        ).first()
+        return {"key": config.key, "value": config.value} if config else None
+
+    # Loaded before login on every page: served from the per-process cache,
+    # evicted when a super admin updates the key
+    result = public_config_cache.get_or_load(key, load)
+
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Configuration not found or not public"
         )
 
-    return {"key": config.key, "value": config.value}
+    return result
 
 
 @app.get("/api/public/teams", tags=["Public"])
@@ -99,20 +196,22 @@ async def get_public_teams(
     Returns only active teams with their colors for use in UI throughout the app.
     Used by TeamColorsContext to provide team colors app-wide.
     """
-    teams = db.query(Team).filter(Team.is_active == True).order_by(Team.order_index).all()
+    def load():
+        teams = db.query(Team).filter(Team.is_active == True).order_by(Team.order_index).all()
+        return [
+            {
+                "key": team.key,
+                "name": team.name,
+                "color": team.color
+            }
+            for team in teams
+        ]
 
-    return [
-        {
-            "key": team.key,
-            "name": team.name,
-            "color": team.color
-        }
-        for team in teams
-    ]
+    return public_teams_cache.get_or_load("active", load)
 
 
 # Import and include routers
-from app.api import auth, auth_google, applications, files, admin, super_admin, application_builder, medications, emails, cron, invoices, stripe_webhooks
+from app.api import auth, auth_google, applications, files, admin, super_admin, application_builder, medications, emails, cron, invoices, stripe_webhooks, jobs
 
 app.include_router(auth.router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(auth_google.router, prefix="/api/auth", tags=["Authentication"])
@@ -126,6 +225,7 @@ app.include_router(emails.router, prefix="/api/emails", tags=["Emails"])
 app.include_router(cron.router, prefix="/api/cron", tags=["Cron Jobs"])
 app.include_router(invoices.router, prefix="/api", tags=["Invoices"])
 app.include_router(stripe_webhooks.router, prefix="/api", tags=["Webhooks"])
+app.include_router(jobs.router, prefix="/api", tags=["Background Jobs"])
 
 if __name__ == "__main__":
     import uvicorn
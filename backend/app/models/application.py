@@ -2,7 +2,7 @@
 Application-related database models
 """
 
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, Text, DECIMAL, text, ForeignKey
+from sqlalchemy import Column, String, Integer, BigInteger, Boolean, DateTime, Text, DECIMAL, text, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -122,6 +122,9 @@ class Application(Base):
     # Legacy WordPress migration fields
     legacy_wp_camper_id = Column(Integer, nullable=True, index=True)  # WordPress camper post ID from migration
 
+    # Bumped by DB triggers on any change to the application or its child rows (ETag source)
+    revision = Column(BigInteger, nullable=False, server_default="1")
+
     # Timestamps
     created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
     updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
@@ -161,6 +164,7 @@ class ApplicationResponse(Base):
     question_id = Column(UUID(as_uuid=True), ForeignKey("application_questions.id", ondelete="CASCADE"))
     response_value = Column(Text)
     file_id = Column(UUID(as_uuid=True), ForeignKey("files.id", ondelete="SET NULL"))
+    revision = Column(BigInteger, nullable=False, server_default="0")  # Stamped by DB trigger on every write
     created_at = Column(DateTime(timezone=True), server_default=text("NOW()"))
     updated_at = Column(DateTime(timezone=True), server_default=text("NOW()"), onupdate=text("NOW()"))
 
@@ -5,6 +5,7 @@ Application Pydantic schemas
 from typing import Optional, List, Any, Dict, Union
 from datetime import datetime
 from pydantic import BaseModel, UUID4
+from app.schemas.medication import Medication, Allergy
 
 
 # Application Section Schemas
@@ -99,6 +100,7 @@ class ApplicationResponseCreate(ApplicationResponseBase):
 class ApplicationResponse(ApplicationResponseBase):
     id: UUID4
     application_id: UUID4
+    revision: Optional[int] = None  # Application revision at which this response was last written
     created_at: datetime
     updated_at: datetime
 
@@ -106,6 +108,13 @@ class ApplicationResponse(ApplicationResponseBase):
         from_attributes = True
 
 
+class ApplicationResponsesDelta(BaseModel):
+    """Responses changed since a revision (delta sync)"""
+    revision: int  # Pass back as ?since= on the next sync
+    responses: List[ApplicationResponse] = []  # Created or updated after `since`
+    deleted_question_ids: List[UUID4] = []  # Responses removed after `since`
+
+
 # Application Schemas
 class ApplicationBase(BaseModel):
     camper_first_name: Optional[str] = None
@@ -120,6 +129,9 @@ class ApplicationUpdate(BaseModel):
     camper_first_name: Optional[str] = None
     camper_last_name: Optional[str] = None
     responses: Optional[List[ApplicationResponseCreate]] = None
+    # Revision the client's copy is based on. When set, responses changed by
+    # someone else since then are rejected with 409 instead of overwritten.
+    base_revision: Optional[int] = None
 
 
 class Application(ApplicationBase):
@@ -139,6 +151,7 @@ class Application(ApplicationBase):
     tuition_status: Optional[str] = None
     # FASD BeST Score - auto-calculated from FASD Screener responses
     fasd_best_score: Optional[int] = None  # NULL if not all questions answered
+    revision: Optional[int] = None  # Increases on every change (delta sync / optimistic concurrency)
     # Profile photo URL (pre-signed URL for displaying camper photo)
     profile_photo_url: Optional[str] = None
     created_at: datetime
@@ -207,6 +220,29 @@ class ApplicationProgress(BaseModel):
     section_progress: List[SectionProgress]
 
 
+class SectionSummary(BaseModel):
+    """Lightweight per-section counts, to decide what to prefetch"""
+    section_id: UUID4
+    section_title: str
+    order_index: int
+    question_count: int
+    response_count: int  # Responses with a value or a file
+    file_count: int
+    medication_count: int
+    allergy_count: int
+    revision: int  # Latest response revision in the section (0 = no responses)
+
+
+class SectionResponses(BaseModel):
+    """Everything the form needs to render one section"""
+    section_id: UUID4
+    revision: int  # Application revision, usable as ?since= for delta sync
+    responses: List[ApplicationResponse] = []
+    files: List[Dict[str, Any]] = []  # Same shape as POST /api/files/batch
+    medications: List[Medication] = []
+    allergies: List[Allergy] = []
+
+
 # File schemas
 class FileBase(BaseModel):
     file_name: str
@@ -0,0 +1,40 @@
+"""
+Background job Pydantic schemas
+"""
+
+from typing import Optional, Any, Dict
+from datetime import datetime
+from pydantic import BaseModel, UUID4
+
+
+class JobAccepted(BaseModel):
+    """Returned (202) by endpoints that queue their work as a background job"""
+    job_id: UUID4
+    job_type: str
+    status: str
+    status_url: str
+
+
+class JobProgress(BaseModel):
+    current: int = 0
+    total: Optional[int] = None
+    message: Optional[str] = None
+
+
+class Job(BaseModel):
+    """Background job status; result holds the handler's return value once completed"""
+    id: UUID4
+    job_type: str
+    status: str  # pending, running, completed, failed, cancelled
+    priority: int
+    attempts: int
+    max_attempts: int
+    cancel_requested: bool
+    progress: JobProgress
+    result: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    created_by: Optional[UUID4] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    run_at: datetime
@@ -104,16 +104,27 @@ class Allergy(AllergyBase):
         from_attributes = True
 
 
-# Bulk save schemas for saving all medications/allergies for a question at once
-class MedicationListSave(BaseModel):
-    """Save all medications for a specific question in one request"""
-    application_id: UUID4
-    question_id: UUID4
-    medications: List[MedicationCreate]
+# Bulk replace schemas: the full list for one question, diffed against what's stored.
+# Items with the id of an existing row update it, items without an id are created,
+# and stored rows missing from the list are deleted.
+class MedicationDoseItem(MedicationDoseBase):
+    id: Optional[UUID4] = None
 
 
-class AllergyListSave(BaseModel):
-    """Save all allergies for a specific question in one request"""
-    application_id: UUID4
-    question_id: UUID4
-    allergies: List[AllergyCreate]
+class MedicationItem(MedicationBase):
+    id: Optional[UUID4] = None
+    doses: List[MedicationDoseItem] = []
+
+
+class MedicationListReplace(BaseModel):
+    """Replace all medications (and their doses) for a question in one request"""
+    medications: List[MedicationItem]
+
+
+class AllergyItem(AllergyBase):
+    id: Optional[UUID4] = None
+
+
+class AllergyListReplace(BaseModel):
+    """Replace all allergies for a question in one request"""
+    allergies: List[AllergyItem]
@@ -396,3 +396,4 @@ class AnnualResetResult(BaseModel):
     total_notes_deleted: int
     applications_reset: List[AnnualResetApplicationResult]
     skipped_statuses: Dict[str, int]  # Count of applications skipped by status
+    archived_rows: Optional[Dict[str, int]] = None  # Rows copied per season_archive_* table (None on dry run)
@@ -55,6 +55,7 @@ from app.models.super_admin import EmailAutomation, EmailTemplate
 from app.models.user import User
 from app.models.application import Application
 from app.services import email_service
+from app.services.send_ledger import SendLedger
 import logging
 
 logger = logging.getLogger(__name__)
@@ -65,7 +66,8 @@ async def fire_email_event(
     event: str,
     application_id: Optional[UUID] = None,
     user_id: Optional[UUID] = None,
-    extra_context: Optional[dict] = None
+    extra_context: Optional[dict] = None,
+    dedupe_key: Optional[str] = None
 ) -> int:
     """
     Fire an email event and process any matching automations.
@@ -76,6 +78,9 @@ async def fire_email_event(
         application_id: Optional application ID for context
         user_id: Optional user ID for context
         extra_context: Optional additional context data
+        dedupe_key: Optional identity of the occurrence (e.g. a Stripe invoice
+            id) for events that can be fired again by retries; recipients who
+            already got an automation's email for it are skipped
 
     Returns:
         Number of emails queued/sent
@@ -123,6 +128,11 @@ async def fire_email_event(
                 # Determine recipients based on audience_filter
                 recipients = get_recipients_for_automation(db, automation, user, application)
 
+                ledger = None
+                if dedupe_key:
+                    ledger = SendLedger(db, f"event:{event}:{automation.id}", dedupe_key)
+                    recipients = ledger.unsent(recipients, lambda r: (r['email'], application_id))
+
                 if not recipients:
                     logger.debug(f"No recipients for automation '{automation.name}'")
                     continue
@@ -155,7 +165,13 @@ async def fire_email_event(
                 # Send to each recipient using send_template_email
                 # This properly handles both HTML and Markdown templates
                 for recipient in recipients:
+                    idempotency_key = None
                     try:
+                        if ledger:
+                            idempotency_key = ledger.claim(recipient['email'], application_id)
+                            if idempotency_key is None:
+                                continue
+
                         # Build recipient-specific variables
                         recipient_vars = {
                             **context,
@@ -181,7 +197,10 @@ async def fire_email_event(
                             to_name=f"{recipient.get('first_name', '')} {recipient.get('last_name', '')}".strip(),
                             user_id=recipient.get('user_id'),
                             application_id=application_id,
+                            idempotency_key=idempotency_key,
                         )
+                        if ledger:
+                            ledger.record(recipient['email'], application_id, result)
 
                         if result.get('success'):
                             emails_sent += 1
@@ -191,6 +210,9 @@ async def fire_email_event(
 
                     except Exception as e:
                         logger.error(f"Error sending to {recipient.get('email')}: {str(e)}")
+                        if idempotency_key:
+                            db.rollback()
+                            ledger.record(recipient['email'], application_id, {'error': str(e)})
 
             except Exception as e:
                 logger.error(f"Error processing automation '{automation.name}': {str(e)}")
@@ -10,17 +10,18 @@ import base64
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
 from uuid import UUID
-import resend
-import markdown2
 from sqlalchemy.orm import Session
 
 from ..core.config import get_settings
+from ..core.lazy_imports import LazyModule
+from ..core.profiling import profiled_section
 from ..models.super_admin import EmailTemplate, SystemConfiguration
 
 settings = get_settings()
 
-# Initialize Resend with API key
-resend.api_key = settings.RESEND_API_KEY
+# Resend and markdown2 are imported on first use (keeps them out of cold starts)
+resend = LazyModule("resend", configure=lambda module: setattr(module, "api_key", settings.RESEND_API_KEY))
+markdown2 = LazyModule("markdown2")
 
 
 def get_system_config(db: Session, key: str, default: Any = None) -> Any:
@@ -49,6 +50,7 @@ def get_email_config(db: Session) -> Dict[str, Any]:
     }
 
 
+@profiled_section("email_render")
 def render_template(template: str, variables: Dict[str, Any]) -> str:
     """
     Render a template string with variable substitution.
@@ -69,6 +71,7 @@ def render_template(template: str, variables: Dict[str, Any]) -> str:
     return result
 
 
+@profiled_section("email_render")
 def markdown_to_html(markdown_text: str) -> str:
     """
     Convert markdown to HTML with inline styles for email compatibility.
@@ -325,6 +328,7 @@ def get_base_variables(db: Session) -> Dict[str, Any]:
     }
 
 
+@profiled_section("email_render")
 def get_branded_email_wrapper(db: Session, content: str, subject: str = "") -> str:
     """
     Wrap content in the branded CAMP email template.
@@ -465,6 +469,7 @@ def send_email(
     template_key: Optional[str] = None,
     email_type: Optional[str] = None,
     reply_to: Optional[str] = None,
+    idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Send an email using Resend and log it to the database.
@@ -481,6 +486,8 @@ def send_email(
         template_key: Template key used (optional)
         email_type: Type of email (e.g., 'welcome', 'reminder', 'mass') (optional)
         reply_to: Reply-to email address (optional)
+        idempotency_key: Resend idempotency key; a repeat send with the same
+            key within 24 hours is not delivered again (optional)
 
     Returns:
         dict with success status and resend_id
@@ -521,7 +528,10 @@ def send_email(
         if reply_to:
             params["reply_to"] = reply_to
 
-        result = resend.Emails.send(params)
+        if idempotency_key:
+            result = resend.Emails.send(params, {"idempotency_key": idempotency_key})
+        else:
+            result = resend.Emails.send(params)
 
         resend_id = result.get('id') if result else None
 
@@ -579,6 +589,7 @@ def send_template_email(
     to_name: Optional[str] = None,
     user_id: Optional[UUID] = None,
     application_id: Optional[UUID] = None,
+    idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
     """
     Send an email using a template from the database.
@@ -600,6 +611,7 @@ def send_template_email(
         to_name: Recipient name (optional)
         user_id: Associated user ID (optional)
         application_id: Associated application ID (optional)
+        idempotency_key: Passed through to send_email (optional)
 
     Returns:
         dict with success status and resend_id
@@ -659,7 +671,8 @@ def send_template_email(
         user_id=user_id,
         application_id=application_id,
         template_key=template_key,
-        email_type=template.trigger_event
+        email_type=template.trigger_event,
+        idempotency_key=idempotency_key
     )
 
 
@@ -878,6 +891,11 @@ def process_email_queue(db: Session, batch_size: int = 10) -> Dict[str, Any]:
         db.commit()
         processed += 1
 
+    # Status changes above only appended stats deltas (migration 050); fold
+    # them into the counters once per batch, not once per row
+    db.execute(text("SELECT fold_email_queue_stats()"))
+    db.commit()
+
     return {
         'processed': processed,
         'succeeded': succeeded,
@@ -886,24 +904,29 @@ def process_email_queue(db: Session, batch_size: int = 10) -> Dict[str, Any]:
 
 
 def get_queue_stats(db: Session) -> Dict[str, int]:
-    """Get current email queue statistics"""
+    """
+    Get current email queue statistics.
+
+    Reads the email_queue_stats counters plus the deltas not yet folded into
+    them (appended by triggers on email_queue) instead of counting the queue.
+    Archived rows count as completed.
+    """
     from sqlalchemy import text
 
-    result = db.execute(
-        text("""
-            SELECT
-                COUNT(*) FILTER (WHERE status = 'pending') as pending,
-                COUNT(*) FILTER (WHERE status = 'processing') as processing,
-                COUNT(*) FILTER (WHERE status = 'completed') as completed,
-                COUNT(*) FILTER (WHERE status = 'failed') as failed
-            FROM email_queue
-        """)
-    )
+    result = db.execute(text("""
+        SELECT status, SUM(count)
+        FROM (
+            SELECT status, count FROM email_queue_stats
+            UNION ALL
+            SELECT status, delta FROM email_queue_stats_deltas
+        ) counters
+        GROUP BY status
+    """))
+    counts = {row[0]: int(row[1] or 0) for row in result}
 
-    row = result.fetchone()
     return {
-        'pending': row[0] or 0,
-        'processing': row[1] or 0,
-        'completed': row[2] or 0,
-        'failed': row[3] or 0
+        'pending': counts.get('pending', 0),
+        'processing': counts.get('processing', 0),
+        'completed': counts.get('completed', 0) + counts.get('archived', 0),
+        'failed': counts.get('failed', 0)
     }
@@ -0,0 +1,59 @@
+"""
+Background job handlers
+
+One handler per job type queued by the API. Each one calls the function the
+endpoint used to run inline; the work itself stays next to its endpoint.
+Imported by job_queue on first use, which registers them.
+
+Retries: only handlers whose work is atomic (a single transaction, or safe
+to repeat) get more than one attempt. Mass email is safe to repeat because
+its sends go through the send ledger (a re-run only sends to the recipients
+that are left). Payment plans call Stripe, which can't be rolled back, and
+the annual reset must not run twice after its commit.
+"""
+
+from app.services.job_queue import job_handler, JobContext
+
+
+@job_handler("annual_reset", max_attempts=1, priority=10)
+def run_annual_reset(job: JobContext, payload: dict) -> dict:
+    from app.api.super_admin import run_annual_reset as reset
+    from app.schemas.super_admin import AnnualResetRequest
+
+    result = reset(job.db, AnnualResetRequest(**payload), actor_id=job.created_by, job=job)
+    return result.model_dump(mode="json")
+
+
+@job_handler("mass_email", max_attempts=3)
+def send_mass_email(job: JobContext, payload: dict) -> dict:
+    from app.api.emails import send_mass_email_batch, SendMassEmailRequest
+
+    return send_mass_email_batch(job.db, SendMassEmailRequest(**payload), actor_id=job.created_by, job=job)
+
+
+@job_handler("delete_application")
+def delete_application(job: JobContext, payload: dict) -> dict:
+    from app.api.super_admin import delete_application_data
+    from app.models.user import User
+
+    actor = job.db.query(User).filter(User.id == job.created_by).first()
+    if not actor:
+        raise ValueError("The user who requested the deletion no longer exists")
+    return delete_application_data(job.db, payload['application_id'], actor, job=job)
+
+
+@job_handler("delete_user")
+def delete_user(job: JobContext, payload: dict) -> dict:
+    from app.api.super_admin import delete_user_account
+
+    job.progress(0, 1, "Deleting user")
+    return delete_user_account(job.db, payload['user_id'], actor_id=job.created_by)
+
+
+@job_handler("payment_plan", max_attempts=1, priority=5)
+async def create_payment_plan(job: JobContext, payload: dict) -> dict:
+    from app.api.invoices import create_payment_plan_for_application
+
+    return await create_payment_plan_for_application(
+        job.db, payload['application_id'], payload['payments'], actor_id=job.created_by
+    )
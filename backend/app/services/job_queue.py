@@ -0,0 +1,473 @@
+"""
+Background Job Queue
+
+Postgres-backed queue (background_jobs, migration 046) for work that is too
+slow to run inside an HTTP request. Endpoints enqueue a job and return its id;
+the client polls GET /api/jobs/{id} for progress and the result.
+
+Jobs are run by whichever of these claims them first (FOR UPDATE SKIP LOCKED,
+so a job never runs twice at the same time):
+- the worker process: python -m app.worker
+- the /api/cron/process-jobs endpoint (Vercel Cron)
+- the enqueuing instance itself, after the response (JOBS_RUN_AFTER_RESPONSE)
+
+Handlers are registered by job type:
+
+    @job_handler("annual_reset", max_attempts=1)
+    def run_annual_reset(job: JobContext, payload: dict) -> dict:
+        for i, item in enumerate(items):
+            job.progress(i, len(items), "Resetting applications")  # raises JobCancelled
+            ...
+        return {...}  # Stored as the job result (JSON)
+
+A handler gets its own session (job.db) and must commit its work. If it
+raises, the session is rolled back and the job is retried with exponential
+backoff until max_attempts, then marked failed. Handlers for work with
+external side effects (emails, Stripe) should use max_attempts=1, unless a
+re-run skips what was already done (mass email: the send ledger).
+
+While a handler runs, a heartbeat thread refreshes the job's heartbeat_at
+every JOB_HEARTBEAT_SECONDS. A job whose process died (crash, serverless
+timeout) stops heartbeating and is re-queued after JOB_STALE_SECONDS.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import threading
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+
+logger = logging.getLogger(__name__)
+
+JOB_STATUSES = ('pending', 'running', 'completed', 'failed', 'cancelled')
+
+MAX_RETRY_DELAY_SECONDS = 3600
+
+JOB_COLUMNS = """
+    id, job_type, status, priority, attempts, max_attempts, cancel_requested,
+    progress_current, progress_total, progress_message, result, error_message,
+    created_by, created_at, started_at, finished_at, run_at
+"""
+
+
+class JobCancelled(Exception):
+    """Raised from JobContext.progress() once a cancel has been requested"""
+
+
+class JobHandler:
+    def __init__(self, func: Callable, max_attempts: int, priority: int):
+        self.func = func
+        self.max_attempts = max_attempts
+        self.priority = priority
+
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(job_type: str, max_attempts: int = 3, priority: int = 0) -> Callable:
+    """Register `func(job, payload) -> dict` as the handler for job_type"""
+    def decorator(func: Callable) -> Callable:
+        _handlers[job_type] = JobHandler(func, max_attempts, priority)
+        return func
+    return decorator
+
+
+def get_handler(job_type: str) -> Optional[JobHandler]:
+    # Handlers live next to the code they call; importing the module registers them
+    from app.services import job_handlers  # noqa: F401
+    return _handlers.get(job_type)
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Heartbeat:
+    """
+    Runs `sql` on its own connection every `interval` seconds from a daemon
+    thread for as long as the `with` block runs, so long work that doesn't
+    report progress still shows its owner is alive. Stops with the block,
+    or with the process, which is what lets a dead owner be detected.
+
+        with Heartbeat("UPDATE ... SET heartbeat_at = NOW() WHERE id = :id", {'id': ...}, 30):
+            ...
+    """
+
+    def __init__(self, sql: str, params: Dict[str, Any], interval: float):
+        self.sql = text(sql)
+        self.params = params
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "Heartbeat":
+        self._thread = threading.Thread(target=self._beat, name="heartbeat", daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _beat(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                with engine.begin() as conn:
+                    conn.execute(self.sql, self.params)
+            except Exception as e:
+                # Missed beats only matter if they add up to the stale timeout
+                logger.warning(f"Heartbeat failed: {e}")
+
+
+class JobContext:
+    """What a handler gets: its session, and progress/cancellation reporting"""
+
+    def __init__(self, db: Session, job_id: UUID, job_type: str, attempt: int, created_by: Optional[UUID]):
+        self.db = db
+        self.job_id = job_id
+        self.job_type = job_type
+        self.attempt = attempt
+        self.created_by = created_by
+
+    def progress(self, current: int, total: Optional[int] = None, message: Optional[str] = None) -> None:
+        """
+        Record progress (and refresh the heartbeat). Raises JobCancelled if a
+        cancel was requested - call it between units of work.
+
+        Written on a separate connection so pollers see it while the handler's
+        own transaction is still open.
+        """
+        with engine.begin() as conn:
+            cancel_requested = conn.execute(
+                text("""
+                    UPDATE background_jobs
+                    SET progress_current = :current,
+                        progress_total = COALESCE(:total, progress_total),
+                        progress_message = COALESCE(:message, progress_message),
+                        heartbeat_at = NOW(),
+                        updated_at = NOW()
+                    WHERE id = :id
+                    RETURNING cancel_requested
+                """),
+                {'id': str(self.job_id), 'current': current, 'total': total, 'message': message}
+            ).scalar()
+        if cancel_requested:
+            raise JobCancelled()
+
+
+# ============================================================================
+# ENQUEUE / READ / CANCEL
+# ============================================================================
+
+def enqueue(
+    db: Session,
+    job_type: str,
+    payload: Optional[Dict[str, Any]] = None,
+    created_by: Optional[UUID] = None,
+    priority: Optional[int] = None,
+    max_attempts: Optional[int] = None,
+    run_at: Optional[datetime] = None
+) -> UUID:
+    """
+    Add a job to the queue (committed). Priority and max_attempts default to
+    the handler's registration.
+
+    Returns:
+        UUID of the queued job
+    """
+    handler = get_handler(job_type)
+    if handler is None:
+        raise ValueError(f"No handler registered for job type '{job_type}'")
+
+    job_id = db.execute(
+        text("""
+            INSERT INTO background_jobs (job_type, payload, created_by, priority, max_attempts, run_at)
+            VALUES (:job_type, CAST(:payload AS jsonb), :created_by, :priority, :max_attempts, :run_at)
+            RETURNING id
+        """),
+        {
+            'job_type': job_type,
+            'payload': json.dumps(payload or {}, default=str),
+            'created_by': str(created_by) if created_by else None,
+            'priority': handler.priority if priority is None else priority,
+            'max_attempts': handler.max_attempts if max_attempts is None else max_attempts,
+            'run_at': run_at or datetime.now(timezone.utc),
+        }
+    ).scalar()
+    db.commit()
+    return job_id
+
+
+def job_row_to_dict(row) -> Dict[str, Any]:
+    (job_id, job_type, status, priority, attempts, max_attempts, cancel_requested,
+     progress_current, progress_total, progress_message, result, error_message,
+     created_by, created_at, started_at, finished_at, run_at) = row
+    return {
+        'id': job_id,
+        'job_type': job_type,
+        'status': status,
+        'priority': priority,
+        'attempts': attempts,
+        'max_attempts': max_attempts,
+        'cancel_requested': cancel_requested,
+        'progress': {
+            'current': progress_current,
+            'total': progress_total,
+            'message': progress_message,
+        },
+        'result': result,
+        'error_message': error_message,
+        'created_by': created_by,
+        'created_at': created_at,
+        'started_at': started_at,
+        'finished_at': finished_at,
+        'run_at': run_at,
+    }
+
+
+def get_job(db: Session, job_id: UUID) -> Optional[Dict[str, Any]]:
+    row = db.execute(
+        text(f"SELECT {JOB_COLUMNS} FROM background_jobs WHERE id = :id"),
+        {'id': str(job_id)}
+    ).fetchone()
+    return job_row_to_dict(row) if row else None
+
+
+def list_jobs(
+    db: Session,
+    status: Optional[str] = None,
+    job_type: Optional[str] = None,
+    created_by: Optional[UUID] = None,
+    limit: int = 50
+) -> List[Dict[str, Any]]:
+    """Most recent jobs first"""
+    rows = db.execute(
+        text(f"""
+            SELECT {JOB_COLUMNS} FROM background_jobs
+            WHERE (CAST(:status AS varchar) IS NULL OR status = :status)
+              AND (CAST(:job_type AS varchar) IS NULL OR job_type = :job_type)
+              AND (CAST(:created_by AS uuid) IS NULL OR created_by = CAST(:created_by AS uuid))
+            ORDER BY created_at DESC
+            LIMIT :limit
+        """),
+        {
+            'status': status,
+            'job_type': job_type,
+            'created_by': str(created_by) if created_by else None,
+            'limit': limit,
+        }
+    ).fetchall()
+    return [job_row_to_dict(row) for row in rows]
+
+
+def cancel_job(db: Session, job_id: UUID) -> Optional[str]:
+    """
+    Cancel a job. Pending jobs are cancelled at once; running jobs stop at
+    their handler's next progress report.
+
+    Returns:
+        The job's status afterwards, or None if it had already finished
+    """
+    new_status = db.execute(
+        text("""
+            UPDATE background_jobs
+            SET cancel_requested = TRUE,
+                status = CASE WHEN status = 'pending' THEN 'cancelled' ELSE status END,
+                finished_at = CASE WHEN status = 'pending' THEN NOW() ELSE finished_at END,
+                updated_at = NOW()
+            WHERE id = :id AND status IN ('pending', 'running')
+            RETURNING status
+        """),
+        {'id': str(job_id)}
+    ).scalar()
+    db.commit()
+    return new_status
+
+
+# ============================================================================
+# CLAIM / RUN
+# ============================================================================
+
+def claim_jobs(db: Session, worker: str, limit: int = 1, job_id: Optional[UUID] = None) -> List[tuple]:
+    """
+    Claim up to `limit` due pending jobs (or only `job_id`) for this worker.
+    Rows another worker is claiming are skipped, not waited for.
+    """
+    rows = db.execute(
+        text("""
+            UPDATE background_jobs
+            SET status = 'running',
+                attempts = attempts + 1,
+                locked_by = :worker,
+                started_at = COALESCE(started_at, NOW()),
+                heartbeat_at = NOW(),
+                updated_at = NOW()
+            WHERE id IN (
+                SELECT id FROM background_jobs
+                WHERE status = 'pending'
+                  AND run_at <= NOW()
+                  AND (CAST(:job_id AS uuid) IS NULL OR id = CAST(:job_id AS uuid))
+                ORDER BY priority DESC, run_at, created_at
+                LIMIT :limit
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, job_type, payload, attempts, max_attempts, created_by
+        """),
+        {'worker': worker, 'limit': limit, 'job_id': str(job_id) if job_id else None}
+    ).fetchall()
+    db.commit()
+    return rows
+
+
+def _finish(job_id: UUID, worker: str, values: Dict[str, Any], set_clause: str) -> None:
+    # Only while we still hold the claim (a stale job may have been re-queued)
+    with engine.begin() as conn:
+        conn.execute(
+            text(f"""
+                UPDATE background_jobs
+                SET {set_clause}, locked_by = NULL, updated_at = NOW()
+                WHERE id = :id AND status = 'running' AND locked_by = :worker
+            """),
+            {'id': str(job_id), 'worker': worker, **values}
+        )
+
+
+def retry_delay_seconds(attempts: int) -> int:
+    return min(settings.JOB_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), MAX_RETRY_DELAY_SECONDS)
+
+
+def run_claimed_job(row: tuple, worker: str) -> str:
+    """Run one claimed job to completion. Returns its final (or retry) status."""
+    job_id, job_type, payload, attempts, max_attempts, created_by = row
+    handler = get_handler(job_type)
+
+    if handler is None:
+        _finish(job_id, worker, {'error': f"No handler for job type '{job_type}'"},
+                "status = 'failed', error_message = :error, finished_at = NOW()")
+        return 'failed'
+
+    db = SessionLocal()
+    try:
+        job = JobContext(db, job_id, job_type, attempts, created_by)
+        # Handlers that rarely report progress still keep the claim alive; a
+        # killed process stops beating and is re-queued after JOB_STALE_SECONDS
+        with Heartbeat(
+            "UPDATE background_jobs SET heartbeat_at = NOW() "
+            "WHERE id = :id AND status = 'running' AND locked_by = :worker",
+            {'id': str(job_id), 'worker': worker},
+            settings.JOB_HEARTBEAT_SECONDS
+        ):
+            if asyncio.iscoroutinefunction(handler.func):
+                result = asyncio.run(handler.func(job, payload or {}))
+            else:
+                result = handler.func(job, payload or {})
+        db.commit()
+    except JobCancelled:
+        db.rollback()
+        _finish(job_id, worker, {},
+                "status = 'cancelled', error_message = 'Cancelled', finished_at = NOW()")
+        logger.info(f"Job {job_id} ({job_type}) cancelled")
+        return 'cancelled'
+    except Exception as e:
+        db.rollback()
+        if attempts < max_attempts:
+            delay = retry_delay_seconds(attempts)
+            _finish(job_id, worker, {'error': str(e), 'delay': delay},
+                    "status = CASE WHEN cancel_requested THEN 'cancelled' ELSE 'pending' END, "
+                    "error_message = :error, run_at = NOW() + make_interval(secs => :delay), "
+                    "finished_at = CASE WHEN cancel_requested THEN NOW() END")
+            logger.warning(f"Job {job_id} ({job_type}) attempt {attempts}/{max_attempts} failed, retrying in {delay}s: {e}")
+            return 'pending'
+        _finish(job_id, worker, {'error': str(e)},
+                "status = 'failed', error_message = :error, finished_at = NOW()")
+        logger.error(f"Job {job_id} ({job_type}) failed after {attempts} attempts: {e}")
+        return 'failed'
+    finally:
+        db.close()
+
+    _finish(job_id, worker, {'result': json.dumps(result, default=str)},
+            "status = 'completed', result = CAST(:result AS jsonb), error_message = NULL, "
+            "progress_current = COALESCE(progress_total, progress_current), finished_at = NOW()")
+    return 'completed'
+
+
+def run_job_now(job_id: UUID) -> Optional[str]:
+    """
+    Claim and run one specific job in this process (used after the enqueuing
+    response has been sent). No-op if a worker already took it.
+    """
+    db = SessionLocal()
+    try:
+        rows = claim_jobs(db, worker_id(), job_id=job_id)
+    finally:
+        db.close()
+    if not rows:
+        return None
+    return run_claimed_job(rows[0], worker_id())
+
+
+def requeue_stale_jobs(db: Session, stale_seconds: Optional[int] = None) -> int:
+    """
+    Put back running jobs whose worker stopped heartbeating (crashed, killed,
+    serverless instance frozen). Jobs out of attempts are marked failed.
+    """
+    count = db.execute(
+        text("""
+            UPDATE background_jobs
+            SET status = CASE
+                    WHEN cancel_requested THEN 'cancelled'
+                    WHEN attempts < max_attempts THEN 'pending'
+                    ELSE 'failed'
+                END,
+                error_message = 'Worker stopped responding',
+                finished_at = CASE
+                    WHEN cancel_requested OR attempts >= max_attempts THEN NOW()
+                END,
+                locked_by = NULL,
+                updated_at = NOW()
+            WHERE status = 'running'
+              AND heartbeat_at < NOW() - make_interval(secs => :stale_seconds)
+        """),
+        {'stale_seconds': stale_seconds or settings.JOB_STALE_SECONDS}
+    ).rowcount
+    db.commit()
+    if count:
+        logger.warning(f"Re-queued {count} stale background jobs")
+    return count
+
+
+def process_jobs(db: Session, batch_size: int = 5, worker: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Re-queue stale jobs, then claim and run up to batch_size due jobs one at
+    a time.
+
+    Returns:
+        dict with processing results
+    """
+    worker = worker or worker_id()
+    requeued = requeue_stale_jobs(db)
+
+    outcomes = {'completed': 0, 'failed': 0, 'retrying': 0, 'cancelled': 0}
+    processed = 0
+    while processed < batch_size:
+        rows = claim_jobs(db, worker)
+        if not rows:
+            break
+        outcome = run_claimed_job(rows[0], worker)
+        outcomes['retrying' if outcome == 'pending' else outcome] += 1
+        processed += 1
+
+    return {
+        'processed': processed,
+        'requeued_stale': requeued,
+        **outcomes
+    }
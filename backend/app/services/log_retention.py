@@ -0,0 +1,154 @@
+"""
+Log Retention Service
+
+audit_logs and email_logs are partitioned by month (migration 040). This
+service keeps the partition set healthy and applies retention:
+1. Creates partitions for the upcoming months so inserts never hit DEFAULT
+2. Drops whole partitions older than the retention window (no row deletes)
+3. Moves old completed email_queue rows into email_queue_archive
+4. Deletes old scheduled_task_runs history and email_send_ledger rows
+
+Retention windows come from system_configuration:
+    audit_log_retention_months  (default 24, 0 = keep forever)
+    email_log_retention_months  (default 12, 0 = keep forever)
+    email_queue_archive_days    (default 30, 0 = never archive)
+    scheduler_run_retention_days (default 30, 0 = keep forever)
+    email_send_ledger_retention_days (default 90, 0 = keep forever)
+
+Runs daily as the log_maintenance scheduled task (worker scheduler or the
+/api/cron/log-maintenance endpoint).
+"""
+
+from typing import Any, Dict, List
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.database import lift_timeouts
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table -> retention config key
+PARTITIONED_LOG_TABLES = {
+    'audit_logs': 'audit_log_retention_months',
+    'email_logs': 'email_log_retention_months',
+}
+
+PARTITION_MONTHS_AHEAD = 3
+QUEUE_ARCHIVE_BATCH_SIZE = 5000
+
+
+def ensure_partitions(db: Session, months_ahead: int = PARTITION_MONTHS_AHEAD) -> Dict[str, int]:
+    """Create monthly partitions from the current month through months_ahead"""
+    created = {}
+    lift_timeouts(db)  # DDL can wait on locks held by long-running log writers/readers
+    for table in PARTITIONED_LOG_TABLES:
+        created[table] = db.execute(
+            text("SELECT ensure_monthly_partitions(:table, :months_ahead)"),
+            {'table': table, 'months_ahead': months_ahead}
+        ).scalar() or 0
+    db.commit()
+    return created
+
+
+def drop_expired_partitions(db: Session, table: str, retain_months: int) -> List[str]:
+    """Drop monthly partitions of `table` older than retain_months. Returns dropped names."""
+    if not retain_months or retain_months <= 0:
+        return []
+
+    lift_timeouts(db)  # DETACH/DROP waits for queries still reading the partition
+    result = db.execute(
+        text("SELECT drop_expired_monthly_partitions(:table, :retain_months)"),
+        {'table': table, 'retain_months': retain_months}
+    )
+    dropped = [row[0] for row in result]
+    db.commit()
+
+    if dropped:
+        logger.info(f"Dropped expired {table} partitions: {', '.join(dropped)}")
+    return dropped
+
+
+def archive_completed_queue(db: Session, older_than_days: int) -> int:
+    """Move completed email_queue rows older than older_than_days into email_queue_archive"""
+    if not older_than_days or older_than_days <= 0:
+        return 0
+
+    total = 0
+    while True:
+        moved = db.execute(
+            text("SELECT archive_completed_email_queue(make_interval(days => :days), :batch_size)"),
+            {'days': older_than_days, 'batch_size': QUEUE_ARCHIVE_BATCH_SIZE}
+        ).scalar() or 0
+        db.commit()
+        total += moved
+        if moved < QUEUE_ARCHIVE_BATCH_SIZE:
+            break
+
+    return total
+
+
+def prune_scheduler_runs(db: Session, older_than_days: int) -> int:
+    """Delete scheduled_task_runs rows older than older_than_days"""
+    if not older_than_days or older_than_days <= 0:
+        return 0
+
+    deleted = db.execute(
+        text("DELETE FROM scheduled_task_runs WHERE started_at < NOW() - make_interval(days => :days)"),
+        {'days': older_than_days}
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def prune_send_ledger(db: Session, older_than_days: int) -> int:
+    """Delete email_send_ledger rows older than older_than_days (long past any retry)"""
+    if not older_than_days or older_than_days <= 0:
+        return 0
+
+    deleted = db.execute(
+        text("DELETE FROM email_send_ledger WHERE claimed_at < NOW() - make_interval(days => :days)"),
+        {'days': older_than_days}
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def run_log_maintenance(db: Session, config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Run all log maintenance steps.
+
+    Args:
+        db: Database session
+        config: Retention settings keyed by the system_configuration keys above
+
+    Returns:
+        dict with partitions created, partitions dropped, queue rows archived,
+        scheduler runs and send ledger rows pruned
+    """
+    results = {
+        'partitions_created': ensure_partitions(db),
+        'partitions_dropped': {},
+        'queue_rows_archived': 0,
+        'scheduler_runs_pruned': 0,
+        'send_ledger_pruned': 0,
+    }
+
+    for table, config_key in PARTITIONED_LOG_TABLES.items():
+        results['partitions_dropped'][table] = drop_expired_partitions(
+            db, table, int(config.get(config_key) or 0)
+        )
+
+    results['queue_rows_archived'] = archive_completed_queue(
+        db, int(config.get('email_queue_archive_days') or 0)
+    )
+
+    results['scheduler_runs_pruned'] = prune_scheduler_runs(
+        db, int(config.get('scheduler_run_retention_days') or 0)
+    )
+
+    results['send_ledger_pruned'] = prune_send_ledger(
+        db, int(config.get('email_send_ledger_retention_days') or 0)
+    )
+
+    return results
@@ -5,12 +5,13 @@ This service processes scheduled email automations that are configured via the
 super admin UI. Unlike event-based automations which fire immediately when an
 event occurs, scheduled automations run at specific times (day + hour).
 
-The cron job calls process_all_due_automations() hourly, which:
+The scheduler (or the cron endpoint) calls process_all_due_automations() hourly, which:
 1. Determines the current day/hour in America/Chicago timezone (CST/CDT)
 2. Queries email_automations table for matching scheduled automations
 3. Filters out recently-run automations (using last_sent_at)
-4. Sends emails to recipients based on audience_filter
-5. Updates last_sent_at to prevent duplicates
+4. Sends emails to recipients based on audience_filter, skipping the ones the
+   send ledger says already got this run's email, so overlapping, retried or
+   resumed runs only send to the recipients that are left
 
 TIMEZONE: All schedule_day and schedule_hour values are interpreted as
 America/Chicago (Central Time). This automatically handles CST/CDT transitions.
@@ -38,6 +39,7 @@ from app.models.user import User
 from app.models.application import Application
 from app.services import email_service
 from app.services.email_events import get_recipients_for_automation, build_email_context
+from app.services.send_ledger import SendLedger
 
 logger = logging.getLogger(__name__)
 
@@ -268,7 +270,8 @@ def get_due_scheduled_automations(
 async def process_scheduled_automation(
     db: Session,
     automation: EmailAutomation,
-    camp_year: int
+    camp_year: int,
+    period: str
 ) -> Dict[str, Any]:
     """
     Process a single scheduled automation: find recipients and send emails.
@@ -277,6 +280,8 @@ async def process_scheduled_automation(
         db: Database session
         automation: The EmailAutomation to process
         camp_year: Current camp year for email variables
+        period: The run's Chicago date; a recipient gets the automation's
+            email at most once per period
 
     Returns:
         Dict with results: {'sent': int, 'errors': list, 'automation_name': str}
@@ -316,6 +321,12 @@ async def process_scheduled_automation(
         result['recipients_found'] = len(recipients)
         logger.info(f"Automation '{automation.name}': Found {len(recipients)} recipients")
 
+        # Overlapping, retried or resumed runs skip whoever already got this
+        # run's email (checked before anything is rendered)
+        ledger = SendLedger(db, f"automation:{automation.id}", period)
+        recipients = ledger.unsent(recipients, lambda r: (r['email'], r.get('application_id')))
+        result['already_sent'] = result['recipients_found'] - len(recipients)
+
         # Build base context with ALL standard variables
         base_context = email_service.get_base_variables(db)
 
@@ -325,6 +336,7 @@ async def process_scheduled_automation(
 
         # Send to each recipient
         for recipient in recipients:
+            idempotency_key = None
             try:
                 # Check if user has email receiving enabled
                 user_id = recipient.get('user_id')
@@ -334,6 +346,11 @@ async def process_scheduled_automation(
                         logger.debug(f"Skipping {recipient['email']} - receive_emails disabled")
                         continue
 
+                idempotency_key = ledger.claim(recipient['email'], recipient.get('application_id'))
+                if idempotency_key is None:
+                    result['already_sent'] += 1
+                    continue
+
                 # Build recipient-specific variables
                 recipient_vars = {
                     **base_context,
@@ -379,7 +396,9 @@ async def process_scheduled_automation(
                     to_name=f"{recipient.get('first_name', '')} {recipient.get('last_name', '')}".strip(),
                     user_id=user_id,
                     application_id=recipient.get('application_id'),
+                    idempotency_key=idempotency_key,
                 )
+                ledger.record(recipient['email'], recipient.get('application_id'), send_result)
 
                 if send_result.get('success'):
                     result['sent'] += 1
@@ -390,6 +409,9 @@ async def process_scheduled_automation(
                     logger.error(f"Failed to send to {recipient['email']}: {error}")
 
             except Exception as e:
+                db.rollback()
+                if idempotency_key:
+                    ledger.record(recipient['email'], recipient.get('application_id'), {'error': str(e)})
                 error_msg = f"{recipient.get('email', 'unknown')}: {str(e)}"
                 result['errors'].append(error_msg)
                 logger.error(f"Error sending scheduled email: {e}")
@@ -428,7 +450,8 @@ def update_last_sent_at(db: Session, automation_id: UUID) -> None:
 
 async def process_all_due_automations(
     db: Session,
-    camp_year: int
+    camp_year: int,
+    at: Optional[datetime] = None
 ) -> Dict[str, Any]:
     """
     Main entry point: process all scheduled automations that are due to run.
@@ -442,12 +465,14 @@ async def process_all_due_automations(
     Args:
         db: Database session
         camp_year: Current camp year from system configuration
+        at: Hour to process (default now); the scheduler passes missed hours
+            when catching up
 
     Returns:
         Dict with overall results including list of processed automations
     """
     # Get current time in Chicago timezone (CST/CDT)
-    now_chicago = datetime.now(SCHEDULE_TIMEZONE)
+    now_chicago = (at or datetime.now(timezone.utc)).astimezone(SCHEDULE_TIMEZONE)
     current_hour = now_chicago.hour
     current_day = python_weekday_to_db_day(now_chicago.weekday())
 
@@ -472,7 +497,9 @@ async def process_all_due_automations(
 
     # Process each automation
     for automation in automations:
-        automation_result = await process_scheduled_automation(db, automation, camp_year)
+        automation_result = await process_scheduled_automation(
+            db, automation, camp_year, now_chicago.date().isoformat()
+        )
         results['automations_processed'].append(automation_result)
         results['total_sent'] += automation_result['sent']
         results['total_errors'] += len(automation_result['errors'])
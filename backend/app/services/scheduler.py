@@ -0,0 +1,362 @@
+"""
+In-process Scheduler
+
+Runs the cron workloads (email queue, scheduled automations, log maintenance)
+from inside the worker process instead of relying only on external HTTP
+triggers. Tasks are registered where they are defined (app/api/cron.py):
+
+    @scheduled_task("log_maintenance", every_seconds=86400, offset_seconds=3 * 3600 + 1800)
+    def run_log_maintenance_task(db: Session, slot: datetime) -> dict:
+        ...
+
+Ticks ("slots") are aligned to the UTC epoch plus offset_seconds, so every
+instance agrees on them. Running a slot (run_task):
+1. Claims it in one short, committed transaction: pg_try_advisory_xact_lock
+   serializes claimers (losers skip), an instance whose run of the task is
+   still heartbeating blocks the claim, scheduled_tasks.last_tick_at is
+   advanced to the slot only if it is behind (a slot another instance
+   already ran is skipped), and a 'running' row is added to
+   scheduled_task_runs.
+2. Runs the task with its own session while a heartbeat thread refreshes
+   the run's heartbeat_at every SCHEDULER_HEARTBEAT_SECONDS.
+3. Records the outcome (status, duration, result) on the run row.
+No transaction stays open while the task runs, so DB timeouts and the
+transaction pooler don't interfere.
+
+Slots run at least once, not exactly once. A run whose heartbeat is older
+than SCHEDULER_RUN_STALE_SECONDS (instance crashed or was killed) is marked
+failed by the next claim, and its slot runs again: catch-up tasks re-run
+that exact slot, others run the latest one. A run that is alive but stalled
+that long can overlap its re-run, so tasks must be safe to repeat (queue
+claims, the email send ledger).
+
+Catch-up: each loop runs the slots missed since last_tick_at. Tasks with
+catch_up=True run every missed slot (up to max_catch_up); others run once for
+the latest slot.
+
+Every instance may run the loop (SCHEDULER_ENABLED) and the Vercel Cron
+endpoints call run_task too - the claim keeps it to one run per slot while
+the running instance is alive.
+"""
+
+import asyncio
+import json
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.services.job_queue import Heartbeat, worker_id
+
+logger = logging.getLogger(__name__)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class ScheduledTask:
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        every_seconds: int,
+        offset_seconds: int,
+        catch_up: bool,
+        max_catch_up: int
+    ):
+        self.name = name
+        self.func = func
+        self.every_seconds = every_seconds
+        self.offset_seconds = offset_seconds
+        self.catch_up = catch_up
+        self.max_catch_up = max_catch_up
+
+    def latest_slot(self, now: datetime) -> datetime:
+        """Most recent slot at or before now"""
+        elapsed = (now - EPOCH).total_seconds() - self.offset_seconds
+        slots = int(elapsed // self.every_seconds)
+        return EPOCH + timedelta(seconds=slots * self.every_seconds + self.offset_seconds)
+
+    def due_slots(self, last_tick_at: Optional[datetime], now: datetime) -> List[datetime]:
+        """Slots after last_tick_at up to now, oldest first"""
+        latest = self.latest_slot(now)
+        if last_tick_at is not None and latest <= last_tick_at:
+            return []
+        if last_tick_at is None or not self.catch_up:
+            return [latest]
+
+        interval = timedelta(seconds=self.every_seconds)
+        missed = int((latest - last_tick_at) / interval)
+        count = min(missed, self.max_catch_up)
+        if missed > count:
+            logger.warning(f"Scheduler: {self.name} missed {missed} ticks, catching up the last {count}")
+        return [latest - interval * i for i in range(count - 1, -1, -1)]
+
+
+_tasks: Dict[str, ScheduledTask] = {}
+
+
+def scheduled_task(
+    name: str,
+    every_seconds: int,
+    offset_seconds: int = 0,
+    catch_up: bool = False,
+    max_catch_up: int = 24
+) -> Callable:
+    """Register `func(db, slot) -> dict` (sync or async) as a scheduled task"""
+    def decorator(func: Callable) -> Callable:
+        _tasks[name] = ScheduledTask(name, func, every_seconds, offset_seconds, catch_up, max_catch_up)
+        return func
+    return decorator
+
+
+def get_tasks() -> Dict[str, ScheduledTask]:
+    # Tasks are defined next to their cron endpoints; importing registers them
+    from app.api import cron  # noqa: F401
+    return _tasks
+
+
+def get_last_ticks(db: Session) -> Dict[str, datetime]:
+    rows = db.execute(text("SELECT name, last_tick_at FROM scheduled_tasks")).fetchall()
+    return {name: last_tick_at for name, last_tick_at in rows}
+
+
+def _claim_slot(task: ScheduledTask, slot: datetime, trigger: str) -> Tuple[str, datetime, Optional[str]]:
+    """
+    Claim a slot in one committed transaction.
+
+    Returns:
+        (status, slot, run_id): status is 'claimed', 'locked' or 'already_ran'.
+        The slot differs from the one asked for when an abandoned run of a
+        catch-up task is re-run first.
+    """
+    with engine.begin() as conn:
+        locked = conn.execute(
+            text("SELECT pg_try_advisory_xact_lock(hashtext(:lock_name))"),
+            {'lock_name': f"scheduled_task:{task.name}"}
+        ).scalar()
+        if not locked:
+            return 'locked', slot, None
+
+        stale_params = {'name': task.name, 'stale': settings.SCHEDULER_RUN_STALE_SECONDS}
+        running = conn.execute(
+            text("""
+                SELECT 1 FROM scheduled_task_runs
+                WHERE task_name = :name
+                  AND status = 'running'
+                  AND heartbeat_at > NOW() - make_interval(secs => :stale)
+                LIMIT 1
+            """),
+            stale_params
+        ).scalar()
+        if running:
+            return 'locked', slot, None
+
+        abandoned = conn.execute(
+            text("""
+                UPDATE scheduled_task_runs
+                SET status = 'failed',
+                    finished_at = NOW(),
+                    error_message = 'Abandoned: instance stopped heartbeating'
+                WHERE task_name = :name AND status = 'running'
+                RETURNING scheduled_for
+            """),
+            stale_params
+        ).fetchall()
+        if abandoned:
+            logger.warning(f"Scheduler: {task.name} had {len(abandoned)} abandoned run(s), running again")
+            # Rewind so the oldest abandoned slot is claimable again. Catch-up
+            # tasks re-run it now (the slots after it follow in the next
+            # passes); others just run the slot asked for.
+            oldest_abandoned = min(row[0] for row in abandoned)
+            conn.execute(
+                text("""
+                    UPDATE scheduled_tasks
+                    SET last_tick_at = LEAST(last_tick_at, :previous_slot), updated_at = NOW()
+                    WHERE name = :name
+                """),
+                {'name': task.name, 'previous_slot': oldest_abandoned - timedelta(seconds=task.every_seconds)}
+            )
+            if task.catch_up:
+                slot = min(slot, oldest_abandoned)
+
+        claimed = conn.execute(
+            text("""
+                INSERT INTO scheduled_tasks (name, last_tick_at, updated_at)
+                VALUES (:name, :slot, NOW())
+                ON CONFLICT (name) DO UPDATE
+                SET last_tick_at = EXCLUDED.last_tick_at, updated_at = NOW()
+                WHERE scheduled_tasks.last_tick_at < EXCLUDED.last_tick_at
+                RETURNING name
+            """),
+            {'name': task.name, 'slot': slot}
+        ).scalar()
+        if not claimed:
+            return 'already_ran', slot, None
+
+        run_id = conn.execute(
+            text("""
+                INSERT INTO scheduled_task_runs (task_name, scheduled_for, trigger, instance)
+                VALUES (:task_name, :slot, :trigger, :instance)
+                RETURNING id
+            """),
+            {'task_name': task.name, 'slot': slot, 'trigger': trigger, 'instance': worker_id()}
+        ).scalar()
+        return 'claimed', slot, str(run_id)
+
+
+def _record_finish(run_id: str, status: str, duration_ms: int, result: Any, error: Optional[str]) -> None:
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                UPDATE scheduled_task_runs
+                SET status = :status,
+                    finished_at = NOW(),
+                    duration_ms = :duration_ms,
+                    result = CAST(:result AS jsonb),
+                    error_message = :error
+                WHERE id = :id
+            """),
+            {
+                'id': str(run_id),
+                'status': status,
+                'duration_ms': duration_ms,
+                'result': json.dumps(result, default=str) if result is not None else None,
+                'error': error,
+            }
+        )
+
+
+def run_task(name: str, slot: Optional[datetime] = None, trigger: str = 'scheduler') -> Dict[str, Any]:
+    """
+    Run one slot of a task (default: the latest) unless another instance
+    is running the task or already ran the slot. An abandoned run of a
+    catch-up task is re-run first (see the module docstring).
+
+    Returns:
+        dict with status ('succeeded', 'failed', 'locked' or 'already_ran'),
+        the slot, and the task's result or error
+    """
+    task = get_tasks().get(name)
+    if task is None:
+        raise ValueError(f"Unknown scheduled task '{name}'")
+    slot = slot or task.latest_slot(datetime.now(timezone.utc))
+
+    claim, slot, run_id = _claim_slot(task, slot, trigger)
+    outcome = {'task': name, 'slot': slot.isoformat()}
+    if claim != 'claimed':
+        return {**outcome, 'status': claim}
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with Heartbeat(
+            "UPDATE scheduled_task_runs SET heartbeat_at = NOW() WHERE id = :id AND status = 'running'",
+            {'id': run_id},
+            settings.SCHEDULER_HEARTBEAT_SECONDS
+        ):
+            if asyncio.iscoroutinefunction(task.func):
+                result = asyncio.run(task.func(db, slot))
+            else:
+                result = task.func(db, slot)
+        status, error = 'succeeded', None
+    except Exception as e:
+        db.rollback()
+        # The slot stays claimed: a failing task waits for its next tick
+        # instead of being retried every loop
+        result, status, error = None, 'failed', str(e)
+        logger.error(f"Scheduled task {name} ({slot.isoformat()}) failed: {e}")
+    finally:
+        db.close()
+
+    duration_ms = int((time.perf_counter() - started) * 1000)
+    _record_finish(run_id, status, duration_ms, result, error)
+    logger.info(f"Scheduled task {name} ({slot.isoformat()}) {status} in {duration_ms}ms")
+
+    return {**outcome, 'status': status, 'duration_ms': duration_ms, 'result': result, 'error': error}
+
+
+def run_due_tasks() -> List[Dict[str, Any]]:
+    """One scheduler pass: run every task's due (and missed) slots"""
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        last_ticks = get_last_ticks(db)
+    finally:
+        db.close()
+
+    outcomes = []
+    for name, task in get_tasks().items():
+        for slot in task.due_slots(last_ticks.get(name), now):
+            outcome = run_task(name, slot)
+            outcomes.append(outcome)
+            if outcome['status'] == 'locked':
+                break  # Another instance is on it (and on the later slots)
+    return outcomes
+
+
+def get_recent_runs(db: Session, task_name: Optional[str] = None, limit: int = 50) -> List[Dict[str, Any]]:
+    rows = db.execute(
+        text("""
+            SELECT id, task_name, scheduled_for, trigger, instance, status,
+                   started_at, finished_at, duration_ms, result, error_message
+            FROM scheduled_task_runs
+            WHERE (CAST(:task_name AS varchar) IS NULL OR task_name = :task_name)
+            ORDER BY started_at DESC
+            LIMIT :limit
+        """),
+        {'task_name': task_name, 'limit': limit}
+    ).fetchall()
+    return [
+        {
+            'id': row[0],
+            'task_name': row[1],
+            'scheduled_for': row[2],
+            'trigger': row[3],
+            'instance': row[4],
+            'status': row[5],
+            'started_at': row[6],
+            'finished_at': row[7],
+            'duration_ms': row[8],
+            'result': row[9],
+            'error_message': row[10],
+        }
+        for row in rows
+    ]
+
+
+class Scheduler:
+    """Background thread running run_due_tasks every SCHEDULER_POLL_SECONDS"""
+
+    def __init__(self, poll_seconds: Optional[float] = None):
+        self.poll_seconds = poll_seconds or settings.SCHEDULER_POLL_SECONDS
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._loop, name="scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"Scheduler started: {', '.join(get_tasks())}")
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop after the task currently running (if any) finishes"""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _loop(self) -> None:
+        while not self._stopped.is_set():
+            try:
+                run_due_tasks()
+            except Exception as e:
+                # Database unreachable etc.: missed slots are caught up later
+                logger.error(f"Scheduler pass failed: {e}")
+            self._stopped.wait(self.poll_seconds)
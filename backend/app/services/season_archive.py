@@ -0,0 +1,213 @@
+"""
+Season Archive Service
+
+Copies a camp season's applications, responses, approvals, admin notes and
+invoices into the season_archive_* tables (see migration 038) so the annual
+reset can prune the live tables without losing history.
+
+Archiving is done with one bulk INSERT ... SELECT per table - no rows are
+pulled into Python. Each archive row keeps the full source row as JSONB in
+`data` plus a few extracted columns used for filtering. Re-running an archive
+for the same season is safe (ON CONFLICT DO NOTHING). Invoices are never
+pruned by the reset, so each invoice is archived once, under the first
+season it was archived with.
+
+Reads for past seasons go through the get_archived_* helpers below, which only
+touch the archive tables, so the live tables stay small.
+
+Usage:
+    from app.services import season_archive
+
+    counts = season_archive.archive_season(db, season_year=2025)
+    db.commit()  # archive_season does NOT commit - the caller owns the transaction
+"""
+
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.database import lift_timeouts
+
+
+# Archive table -> (live table, extracted columns copied alongside the JSONB snapshot)
+ARCHIVE_TABLES = {
+    'season_archive_applications': (
+        'applications',
+        ['user_id', 'status', 'sub_status', 'camper_first_name', 'camper_last_name'],
+    ),
+    'season_archive_responses': ('application_responses', ['application_id', 'question_id']),
+    'season_archive_approvals': ('application_approvals', ['application_id']),
+    'season_archive_notes': ('admin_notes', ['application_id']),
+    'season_archive_invoices': ('invoices', ['application_id']),
+}
+
+
+def archive_season(
+    db: Session,
+    season_year: int,
+    application_ids: Optional[List[UUID]] = None,
+) -> Dict[str, int]:
+    """
+    Snapshot a season into the archive tables.
+
+    Args:
+        db: Database session
+        season_year: Camp season the rows belong to (the archive partition)
+        application_ids: Limit the snapshot to these applications (default: all)
+
+    Returns:
+        dict mapping archive table name -> number of rows inserted
+
+    The caller must commit. The annual reset archives and prunes in the same
+    transaction, so a failed reset never leaves a half-written archive; the
+    DB timeouts are lifted for that whole transaction, which can outlast them.
+    """
+    lift_timeouts(db)
+    db.execute(text("SELECT ensure_season_archive_partitions(:year)"), {'year': season_year})
+
+    params: Dict[str, Any] = {'year': season_year}
+    if application_ids is not None:
+        params['app_ids'] = [str(app_id) for app_id in application_ids]
+
+    counts = {}
+    for archive_table, (live_table, columns) in ARCHIVE_TABLES.items():
+        app_column = 'id' if live_table == 'applications' else 'application_id'
+        conditions = []
+        if application_ids is not None:
+            conditions.append(f"t.{app_column} = ANY(CAST(:app_ids AS uuid[]))")
+        if live_table == 'invoices':
+            # Invoices outlive the reset: copy each one only into the first
+            # season that sees it, not into every later season again
+            conditions.append("""NOT EXISTS (
+                SELECT 1 FROM season_archive_invoices a
+                WHERE a.application_id = t.application_id AND a.id = t.id AND a.season_year < :year
+            )""")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        column_list = ", ".join(columns)
+        select_list = ", ".join(f"t.{c}" for c in columns)
+
+        result = db.execute(
+            text(f"""
+                INSERT INTO {archive_table} (season_year, id, {column_list}, data)
+                SELECT :year, t.id, {select_list}, to_jsonb(t)
+                FROM {live_table} t
+                {where}
+                ON CONFLICT (season_year, id) DO NOTHING
+            """),
+            params
+        )
+        counts[archive_table] = result.rowcount or 0
+
+    return counts
+
+
+def get_archived_seasons(db: Session) -> List[Dict[str, Any]]:
+    """List archived seasons with their application counts, newest first"""
+    result = db.execute(
+        text("""
+            SELECT season_year, COUNT(*) AS applications, MAX(archived_at) AS archived_at
+            FROM season_archive_applications
+            GROUP BY season_year
+            ORDER BY season_year DESC
+        """)
+    )
+    return [
+        {
+            'season_year': row.season_year,
+            'applications': row.applications,
+            'archived_at': row.archived_at.isoformat() if row.archived_at else None,
+        }
+        for row in result
+    ]
+
+
+def get_archived_applications(
+    db: Session,
+    season_year: int,
+    status: Optional[str] = None,
+    sub_status: Optional[str] = None,
+    skip: int = 0,
+    limit: int = 100,
+) -> List[Dict[str, Any]]:
+    """
+    List archived applications for a season.
+
+    Only the season's partition is scanned (season_year is the partition key).
+    """
+    filters = ["season_year = :year"]
+    params: Dict[str, Any] = {'year': season_year, 'skip': skip, 'limit': limit}
+    if status:
+        filters.append("status = :status")
+        params['status'] = status
+    if sub_status:
+        filters.append("sub_status = :sub_status")
+        params['sub_status'] = sub_status
+
+    result = db.execute(
+        text(f"""
+            SELECT id, user_id, status, sub_status, camper_first_name, camper_last_name,
+                   data->>'completion_percentage' AS completion_percentage,
+                   data->>'created_at' AS created_at
+            FROM season_archive_applications
+            WHERE {' AND '.join(filters)}
+            ORDER BY camper_last_name NULLS LAST, camper_first_name NULLS LAST
+            OFFSET :skip LIMIT :limit
+        """),
+        params
+    )
+    return [
+        {
+            'id': str(row.id),
+            'user_id': str(row.user_id) if row.user_id else None,
+            'status': row.status,
+            'sub_status': row.sub_status,
+            'camper_first_name': row.camper_first_name,
+            'camper_last_name': row.camper_last_name,
+            'completion_percentage': int(row.completion_percentage) if row.completion_percentage else 0,
+            'created_at': row.created_at,
+        }
+        for row in result
+    ]
+
+
+def get_archived_application(
+    db: Session,
+    season_year: int,
+    application_id: UUID,
+) -> Optional[Dict[str, Any]]:
+    """
+    Get one archived application with its responses, approvals, notes and invoices.
+
+    Returns None if the application was not archived for that season.
+    """
+    params = {'year': season_year, 'app_id': str(application_id)}
+
+    app_row = db.execute(
+        text("""
+            SELECT data FROM season_archive_applications
+            WHERE season_year = :year AND id = :app_id
+        """),
+        params
+    ).fetchone()
+
+    if not app_row:
+        return None
+
+    bundle = {'application': app_row.data}
+    for key, archive_table in (
+        ('responses', 'season_archive_responses'),
+        ('approvals', 'season_archive_approvals'),
+        ('notes', 'season_archive_notes'),
+        ('invoices', 'season_archive_invoices'),
+    ):
+        rows = db.execute(
+            text(f"""
+                SELECT data FROM {archive_table}
+                WHERE season_year = :year AND application_id = :app_id
+            """),
+            params
+        ).fetchall()
+        bundle[key] = [row.data for row in rows]
+
+    return bundle
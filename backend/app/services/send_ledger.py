@@ -0,0 +1,154 @@
+"""
+Email Send Ledger
+
+Records who already received a logical email, so retried and resumed runs
+(scheduler catch-up, cron retries, Stripe webhook redeliveries, a worker
+dying mid-batch) only send to the recipients that are left.
+
+A logical email is (send_key, period), e.g. ('automation:<id>', '2026-10-19')
+or ('reminder:payment_reminder', '2026-W42'). Recipients are keyed by email
+address and, for emails about one application, application_id.
+
+    ledger = SendLedger(db, f"automation:{automation.id}", "2026-10-19")
+    recipients = ledger.unsent(recipients, lambda r: (r['email'], r.get('application_id')))
+    for r in recipients:
+        key = ledger.claim(r['email'], r.get('application_id'))
+        if key is None:
+            continue  # Another run is sending it
+        send_result = email_service.send_template_email(..., idempotency_key=key)
+        ledger.record(r['email'], r.get('application_id'), send_result)
+
+unsent() is one query, done before anything is rendered. claim() commits
+before the send, so concurrent runs can't both send. A claim left behind by
+a crashed run is taken over after EMAIL_SEND_CLAIM_STALE_SECONDS with the
+same idempotency key, so Resend drops the copy if the crashed run did reach
+it; failed sends are retried by the next run with a new key.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, TypeVar
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+import logging
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+RecipientKey = Tuple[str, Optional[str]]
+
+# Must match idx_email_send_ledger_key (migration 048)
+LEDGER_CONFLICT_TARGET = (
+    "(send_key, period, recipient_email, "
+    "COALESCE(application_id, '00000000-0000-0000-0000-000000000000'::uuid))"
+)
+
+
+def recipient_key(email: str, application_id: Any = None) -> RecipientKey:
+    return (email.strip().lower(), str(application_id) if application_id else None)
+
+
+class SendLedger:
+    def __init__(self, db: Session, send_key: str, period: str):
+        self.db = db
+        self.send_key = send_key
+        self.period = period
+
+    def handled(self) -> Set[RecipientKey]:
+        """Recipients already sent to, or being sent to by a live run"""
+        rows = self.db.execute(
+            text("""
+                SELECT recipient_email, application_id
+                FROM email_send_ledger
+                WHERE send_key = :send_key
+                  AND period = :period
+                  AND (status = 'sent'
+                       OR (status = 'sending' AND claimed_at > NOW() - make_interval(secs => :stale)))
+            """),
+            {
+                'send_key': self.send_key,
+                'period': self.period,
+                'stale': settings.EMAIL_SEND_CLAIM_STALE_SECONDS,
+            }
+        ).fetchall()
+        return {recipient_key(email, application_id) for email, application_id in rows}
+
+    def unsent(self, items: Iterable[T], key: Callable[[T], Tuple[str, Any]]) -> List[T]:
+        """Filter items down to the recipients still to send to"""
+        items = list(items)
+        handled = self.handled()
+        if not handled:
+            return items
+        remaining = [item for item in items if recipient_key(*key(item)) not in handled]
+        logger.info(
+            f"Send ledger {self.send_key} ({self.period}): "
+            f"{len(items) - len(remaining)} of {len(items)} recipients already handled"
+        )
+        return remaining
+
+    def claim(self, email: str, application_id: Any = None) -> Optional[str]:
+        """
+        Claim a recipient for sending.
+
+        Returns:
+            The idempotency key to send with, or None if the recipient was
+            already sent to or is claimed by a live run
+        """
+        email, application_id = recipient_key(email, application_id)
+        row = self.db.execute(
+            text(f"""
+                INSERT INTO email_send_ledger (send_key, period, recipient_email, application_id)
+                VALUES (:send_key, :period, :email, :application_id)
+                ON CONFLICT {LEDGER_CONFLICT_TARGET} DO UPDATE
+                SET status = 'sending',
+                    attempts = email_send_ledger.attempts
+                        + CASE WHEN email_send_ledger.status = 'failed' THEN 1 ELSE 0 END,
+                    claimed_at = NOW(),
+                    error_message = NULL
+                WHERE email_send_ledger.status = 'failed'
+                   OR (email_send_ledger.status = 'sending'
+                       AND email_send_ledger.claimed_at <= NOW() - make_interval(secs => :stale))
+                RETURNING id, attempts
+            """),
+            {
+                'send_key': self.send_key,
+                'period': self.period,
+                'email': email,
+                'application_id': application_id,
+                'stale': settings.EMAIL_SEND_CLAIM_STALE_SECONDS,
+            }
+        ).fetchone()
+        self.db.commit()
+        if row is None:
+            return None
+        return f"email-send/{row[0]}/{row[1]}"
+
+    def record(self, email: str, application_id: Any, send_result: Dict[str, Any]) -> None:
+        """Record the outcome of a claimed send (a send_email() result)"""
+        email, application_id = recipient_key(email, application_id)
+        sent = bool(send_result.get('success'))
+        self.db.execute(
+            text("""
+                UPDATE email_send_ledger
+                SET status = :status,
+                    resend_id = :resend_id,
+                    error_message = :error,
+                    sent_at = CASE WHEN :sent THEN NOW() ELSE sent_at END
+                WHERE send_key = :send_key
+                  AND period = :period
+                  AND recipient_email = :email
+                  AND application_id IS NOT DISTINCT FROM CAST(:application_id AS uuid)
+            """),
+            {
+                'status': 'sent' if sent else 'failed',
+                'resend_id': send_result.get('resend_id'),
+                'error': None if sent else send_result.get('error'),
+                'sent': sent,
+                'send_key': self.send_key,
+                'period': self.period,
+                'email': email,
+                'application_id': application_id,
+            }
+        )
+        self.db.commit()
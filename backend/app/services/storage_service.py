@@ -6,15 +6,26 @@ Security: All filenames are sanitized to prevent path traversal attacks.
 """
 
 import re
-from typing import BinaryIO, Optional, Union
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, BinaryIO, Dict, List, Optional, Union
 from ..core.config import get_settings
 from ..core.security_utils import generate_safe_storage_path, is_path_traversal_attempt
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 settings = get_settings()
 
-# Initialize Supabase client
-supabase: Client = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+# Supabase client, created on first use (not at import, to keep cold starts fast)
+_supabase: Optional["Client"] = None
+
+
+def get_supabase() -> "Client":
+    """Get or create the Supabase client used for storage"""
+    global _supabase
+    if _supabase is None:
+        from supabase import create_client
+        _supabase = create_client(settings.SUPABASE_URL, settings.SUPABASE_KEY)
+    return _supabase
 
 # Bucket name for application files
 BUCKET_NAME = "application-files"
@@ -73,7 +84,7 @@ def ensure_bucket_exists() -> None:
     """
     try:
         # Try to get bucket info
-        supabase.storage.get_bucket(BUCKET_NAME)
+        get_supabase().storage.get_bucket(BUCKET_NAME)
         return
     except Exception as exc:
         # Only attempt to create the bucket when it truly does not exist
@@ -87,7 +98,7 @@ def ensure_bucket_exists() -> None:
             raise
 
     try:
-        supabase.storage.create_bucket(
+        get_supabase().storage.create_bucket(
             BUCKET_NAME,
             options={
                 "public": False,
@@ -103,7 +114,7 @@ def ensure_bucket_exists() -> None:
             },
         )
         # Verify bucket is now accessible; raises if not
-        supabase.storage.get_bucket(BUCKET_NAME)
+        get_supabase().storage.get_bucket(BUCKET_NAME)
     except Exception as exc:
         # Ignore conflict errors caused by race conditions; re-raise everything else
         status = _storage_error_status(exc)
@@ -161,7 +172,7 @@ def upload_file(
             file.seek(0)
 
     def _upload_once(payload: bytes) -> None:
-        supabase.storage.from_(BUCKET_NAME).upload(
+        get_supabase().storage.from_(BUCKET_NAME).upload(
             path=file_path,
             file=payload,
             file_options={
@@ -175,7 +186,7 @@ def upload_file(
         _upload_once(file_bytes)
 
         # Get signed URL with configured expiration
-        signed_url = supabase.storage.from_(BUCKET_NAME).create_signed_url(
+        signed_url = get_supabase().storage.from_(BUCKET_NAME).create_signed_url(
             file_path,
             expires_in=SIGNED_URL_EXPIRATION
         )
@@ -193,7 +204,7 @@ def upload_file(
             ensure_bucket_exists()
             try:
                 _upload_once(file_bytes)
-                signed_url = supabase.storage.from_(BUCKET_NAME).create_signed_url(
+                signed_url = get_supabase().storage.from_(BUCKET_NAME).create_signed_url(
                     file_path,
                     expires_in=SIGNED_URL_EXPIRATION
                 )
@@ -221,7 +232,7 @@ def download_file(file_path: str) -> bytes:
         File binary data
     """
     try:
-        result = supabase.storage.from_(BUCKET_NAME).download(file_path)
+        result = get_supabase().storage.from_(BUCKET_NAME).download(file_path)
         return result
     except Exception as e:
         raise Exception(f"Failed to download file: {str(e)}")
@@ -238,7 +249,7 @@ def delete_file(file_path: str) -> bool:
         True if successful
     """
     try:
-        supabase.storage.from_(BUCKET_NAME).remove([file_path])
+        get_supabase().storage.from_(BUCKET_NAME).remove([file_path])
         return True
     except Exception as e:
         raise Exception(f"Failed to delete file: {str(e)}")
@@ -256,10 +267,40 @@ def get_signed_url(file_path: str, expires_in: int = SIGNED_URL_EXPIRATION) -> s
         Signed URL
     """
     try:
-        result = supabase.storage.from_(BUCKET_NAME).create_signed_url(
+        result = get_supabase().storage.from_(BUCKET_NAME).create_signed_url(
             file_path,
             expires_in=expires_in
         )
         return result.get("signedURL", "")
     except Exception as e:
         raise Exception(f"Failed to generate signed URL: {str(e)}")
+
+
+def get_signed_urls(file_paths: List[str], expires_in: int = SIGNED_URL_EXPIRATION) -> Dict[str, str]:
+    """
+    Get signed URLs for many private files in one storage request
+
+    Args:
+        file_paths: Paths to the files in storage
+        expires_in: URL expiration time in seconds (default 15 minutes)
+
+    Returns:
+        Dict of path -> signed URL. Paths storage couldn't sign are left out.
+    """
+    paths = list(dict.fromkeys(path for path in file_paths if path))
+    if not paths:
+        return {}
+    try:
+        results = get_supabase().storage.from_(BUCKET_NAME).create_signed_urls(
+            paths,
+            expires_in=expires_in
+        )
+    except Exception as e:
+        raise Exception(f"Failed to generate signed URLs: {str(e)}")
+
+    signed_urls = {}
+    for item in results or []:
+        url = item.get("signedURL") or item.get("signedUrl")
+        if item.get("path") and url and not item.get("error"):
+            signed_urls[item["path"]] = url
+    return signed_urls
@@ -5,7 +5,6 @@ Handles invoice creation, payment plan management, and webhook processing
 Documentation reference: https://stripe.com/docs/api/invoices
 """
 
-import stripe
 import hashlib
 from datetime import datetime, timezone, timedelta
 from typing import Optional, Dict, Any, List, Tuple
@@ -15,14 +14,25 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from ..core.config import get_settings
+from ..core.database import engine
+from ..core.lazy_imports import LazyModule
+from ..core.profiling import profiled_section
 from ..models.user import User
 from ..models.application import Application
 from ..models.super_admin import SystemConfiguration
 
 settings = get_settings()
 
-# Initialize Stripe with API key
-stripe.api_key = settings.STRIPE_SECRET_KEY
+
+def configure_stripe(module) -> None:
+    module.api_key = settings.STRIPE_SECRET_KEY
+    if settings.STRIPE_API_BASE:
+        # Local Stripe stand-in (stripe-mock) instead of api.stripe.com
+        module.api_base = settings.STRIPE_API_BASE
+
+
+# Stripe SDK, imported and configured on first use (keeps it out of cold starts)
+stripe = LazyModule("stripe", configure=configure_stripe)
 
 
 def generate_idempotency_key(*args) -> str:
@@ -118,7 +128,90 @@ def calculate_invoice_due_date(db: Session, from_date: Optional[datetime] = None
 # =============================================================================
 # Stripe Customer Management
 # =============================================================================
+#
+# stripe_customers (migration 049) caches the customers we've seen, so an
+# invoice for a known customer doesn't cost a Customer.retrieve round trip.
+# Rows are written from our own API responses and from customer.* webhooks
+# (customer.deleted marks the row deleted); a row older than
+# STRIPE_CUSTOMER_CACHE_SECONDS counts as a miss and is re-verified.
+
+def get_cached_stripe_customer(db: Session, customer_id: str) -> Optional[Dict[str, Any]]:
+    """Cached customer synced within STRIPE_CUSTOMER_CACHE_SECONDS, or None (miss)"""
+    row = db.execute(
+        text("""
+            SELECT id, user_id, email, name, deleted, synced_at
+            FROM stripe_customers
+            WHERE id = :id
+              AND synced_at > NOW() - make_interval(secs => :ttl)
+        """),
+        {'id': customer_id, 'ttl': settings.STRIPE_CUSTOMER_CACHE_SECONDS}
+    ).fetchone()
+    if row is None:
+        return None
+    return {
+        'id': row[0],
+        'user_id': row[1],
+        'email': row[2],
+        'name': row[3],
+        'deleted': row[4],
+        'synced_at': row[5],
+    }
+
+
+def cache_stripe_customer(db: Session, customer: Any, user_id: Optional[UUID] = None) -> None:
+    """
+    Store a Stripe customer object (API response or webhook payload).
+    Deleted customers only carry id and deleted=True. Doesn't commit.
+    """
+    db.execute(
+        text("""
+            INSERT INTO stripe_customers (id, user_id, email, name, deleted, synced_at)
+            VALUES (:id, :user_id, :email, :name, :deleted, NOW())
+            ON CONFLICT (id) DO UPDATE
+            SET user_id = COALESCE(EXCLUDED.user_id, stripe_customers.user_id),
+                email = COALESCE(EXCLUDED.email, stripe_customers.email),
+                name = COALESCE(EXCLUDED.name, stripe_customers.name),
+                deleted = EXCLUDED.deleted,
+                synced_at = NOW()
+        """),
+        {
+            'id': customer['id'],
+            'user_id': str(user_id) if user_id else None,
+            'email': customer.get('email'),
+            'name': customer.get('name'),
+            'deleted': bool(customer.get('deleted', False)),
+        }
+    )
+
+
+def forget_stripe_customer(customer_id: str) -> None:
+    """
+    Drop a cached customer so the next use re-verifies it with Stripe.
+    Runs on its own connection: callers are mid-error-handling and their
+    session's pending state must be neither committed nor lost here.
+    """
+    with engine.begin() as conn:
+        conn.execute(text("DELETE FROM stripe_customers WHERE id = :id"), {'id': customer_id})
+
+
+def forget_rejected_customer(error: Exception, customer_id: Optional[str]) -> None:
+    """
+    Stripe rejected the customer we passed (deleted without a webhook
+    reaching us): forget it, so the next attempt verifies it and creates a
+    new one if needed.
+    """
+    if customer_id and isinstance(error, stripe.error.InvalidRequestError) and error.param == 'customer':
+        forget_stripe_customer(customer_id)
+
+
+def handle_customer_event(event_type: str, customer: Any, db: Session) -> Dict[str, Any]:
+    """Apply a customer.created / updated / deleted webhook to the customer cache"""
+    cache_stripe_customer(db, {**customer, 'deleted': event_type == 'customer.deleted'})
+    db.commit()
+    return {'success': True, 'customer_id': customer['id']}
 
+
+@profiled_section("stripe")
 def get_or_create_stripe_customer(
     db: Session,
     user: User,
@@ -127,6 +220,9 @@ def get_or_create_stripe_customer(
     Get existing Stripe customer or create a new one.
     Stores the customer ID in the user record for future use.
 
+    Known customers come from the stripe_customers cache; Stripe is only
+    asked on a cache miss (or to create a customer).
+
     Args:
         db: Database session
         user: User model instance
@@ -136,14 +232,21 @@ def get_or_create_stripe_customer(
     """
     # If user already has a Stripe customer ID, verify it still exists
     if user.stripe_customer_id:
-        try:
-            customer = stripe.Customer.retrieve(user.stripe_customer_id)
-            # Check if customer is deleted (attribute only exists on deleted customers)
-            if not getattr(customer, 'deleted', False):
+        cached = get_cached_stripe_customer(db, user.stripe_customer_id)
+        if cached is not None:
+            if not cached['deleted']:
                 return user.stripe_customer_id
-        except stripe.error.InvalidRequestError:
-            # Customer doesn't exist in Stripe, create a new one
-            pass
+        else:
+            try:
+                customer = stripe.Customer.retrieve(user.stripe_customer_id)
+                cache_stripe_customer(db, customer, user.id)
+                db.commit()
+                # Check if customer is deleted (attribute only exists on deleted customers)
+                if not getattr(customer, 'deleted', False):
+                    return user.stripe_customer_id
+            except stripe.error.InvalidRequestError:
+                # Customer doesn't exist in Stripe, create a new one
+                pass
 
     # Create new Stripe customer
     customer_name = f"{user.first_name or ''} {user.last_name or ''}".strip() or user.email
@@ -163,6 +266,7 @@ def get_or_create_stripe_customer(
         text("UPDATE users SET stripe_customer_id = :customer_id WHERE id = :user_id"),
         {'customer_id': customer.id, 'user_id': str(user.id)}
     )
+    cache_stripe_customer(db, customer, user.id)
     db.commit()
 
     return customer.id
@@ -172,6 +276,7 @@ def get_or_create_stripe_customer(
 # Invoice Creation
 # =============================================================================
 
+@profiled_section("stripe")
 def create_invoice_for_application(
     db: Session,
     application: Application,
@@ -328,6 +433,7 @@ def create_invoice_for_application(
         }
 
     except stripe.error.StripeError as e:
+        forget_rejected_customer(e, customer_id)
         return {
             'success': False,
             'error': str(e)
@@ -338,15 +444,44 @@ def create_invoice_for_application(
 # Invoice Management
 # =============================================================================
 
+INVOICE_COLUMNS = """
+    id, stripe_invoice_id, amount, discount_amount,
+    scholarship_applied, scholarship_note, status, paid_at,
+    payment_number, total_payments, due_date,
+    stripe_invoice_url, voided_at, voided_reason,
+    description, created_at, updated_at, application_id
+"""
+
+
+def invoice_row_to_dict(row) -> Dict[str, Any]:
+    """Invoice dict (API shape) from a row selected with INVOICE_COLUMNS"""
+    return {
+        'id': str(row[0]),
+        'application_id': str(row[17]),
+        'stripe_invoice_id': row[1],
+        'amount': float(row[2]) if row[2] else 0,
+        'discount_amount': float(row[3]) if row[3] else 0,
+        'scholarship_applied': row[4],
+        'scholarship_note': row[5],
+        'status': row[6],
+        'paid_at': row[7].isoformat() if row[7] else None,
+        'payment_number': row[8],
+        'total_payments': row[9],
+        'due_date': row[10].isoformat() if row[10] else None,
+        'stripe_invoice_url': row[11],
+        'voided_at': row[12].isoformat() if row[12] else None,
+        'voided_reason': row[13],
+        'description': row[14],
+        'created_at': row[15].isoformat() if row[15] else None,
+        'updated_at': row[16].isoformat() if row[16] else None,
+    }
+
+
 def get_invoices_for_application(db: Session, application_id: UUID) -> List[Dict[str, Any]]:
     """Get all invoices for an application"""
     result = db.execute(
-        text("""
-            SELECT id, stripe_invoice_id, amount, discount_amount,
-                   scholarship_applied, scholarship_note, status, paid_at,
-                   payment_number, total_payments, due_date,
-                   stripe_invoice_url, voided_at, voided_reason,
-                   description, created_at, updated_at
+        text(f"""
+            SELECT {INVOICE_COLUMNS}
             FROM invoices
             WHERE application_id = :application_id
             ORDER BY payment_number ASC, created_at ASC
@@ -354,32 +489,39 @@ def get_invoices_for_application(db: Session, application_id: UUID) -> List[Dict
         {'application_id': str(application_id)}
     )
 
-    invoices = []
+    return [invoice_row_to_dict(row) for row in result.fetchall()]
+
+
+def get_invoices_for_applications(db: Session, application_ids: List[UUID]) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get the invoices of several applications in ONE query
+
+    Returns:
+        Dict of application_id (str) -> invoices, ordered as in get_invoices_for_application.
+        Every requested application has an entry (empty list if it has no invoices).
+    """
+    invoices_by_application = {str(app_id): [] for app_id in application_ids}
+    if not application_ids:
+        return invoices_by_application
+
+    result = db.execute(
+        text(f"""
+            SELECT {INVOICE_COLUMNS}
+            FROM invoices
+            WHERE application_id = ANY(CAST(:application_ids AS uuid[]))
+            ORDER BY application_id, payment_number ASC, created_at ASC
+        """),
+        {'application_ids': [str(app_id) for app_id in application_ids]}
+    )
+
     for row in result.fetchall():
-        invoices.append({
-            'id': str(row[0]),
-            'application_id': str(application_id),
-            'stripe_invoice_id': row[1],
-            'amount': float(row[2]) if row[2] else 0,
-            'discount_amount': float(row[3]) if row[3] else 0,
-            'scholarship_applied': row[4],
-            'scholarship_note': row[5],
-            'status': row[6],
-            'paid_at': row[7].isoformat() if row[7] else None,
-            'payment_number': row[8],
-            'total_payments': row[9],
-            'due_date': row[10].isoformat() if row[10] else None,
-            'stripe_invoice_url': row[11],
-            'voided_at': row[12].isoformat() if row[12] else None,
-            'voided_reason': row[13],
-            'description': row[14],
-            'created_at': row[15].isoformat() if row[15] else None,
-            'updated_at': row[16].isoformat() if row[16] else None,
-        })
-
-    return invoices
+        invoice = invoice_row_to_dict(row)
+        invoices_by_application.setdefault(invoice['application_id'], []).append(invoice)
+
+    return invoices_by_application
 
 
+@profiled_section("stripe")
 def void_invoice(
     db: Session,
     invoice_id: UUID,
@@ -441,6 +583,7 @@ def void_invoice(
         return {'success': False, 'error': str(e)}
 
 
+@profiled_section("stripe")
 def mark_invoice_paid(
     db: Session,
     invoice_id: UUID,
@@ -538,6 +681,7 @@ def mark_invoice_paid(
         return {'success': False, 'error': str(e)}
 
 
+@profiled_section("stripe")
 def mark_invoice_unpaid(
     db: Session,
     invoice_id: UUID,
@@ -644,6 +788,7 @@ def mark_invoice_unpaid(
 # Scholarship Management
 # =============================================================================
 
+@profiled_section("stripe")
 def apply_scholarship(
     db: Session,
     application_id: UUID,
@@ -773,6 +918,7 @@ def apply_scholarship(
 # Payment Plan Management
 # =============================================================================
 
+@profiled_section("stripe")
 def create_payment_plan(
     db: Session,
     application_id: UUID,
@@ -827,6 +973,7 @@ def create_payment_plan(
             'error': f'Payment plan total ({total_plan_amount}) must equal invoice amount ({current_amount})'
         }
 
+    customer_id = None
     try:
         # Void the original invoice
         void_result = void_invoice(
@@ -952,6 +1099,7 @@ def create_payment_plan(
 
     except stripe.error.StripeError as e:
         db.rollback()
+        forget_rejected_customer(e, customer_id)
         return {'success': False, 'error': str(e)}
     except Exception as e:
         db.rollback()
@@ -12,25 +12,29 @@ This service uses the service_role key to perform admin operations like:
 Documentation: https://supabase.com/docs/reference/python/auth-admin-createuser
 """
 
-from typing import Optional, Dict, Any
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, Optional, Dict, Any
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from ..core.config import get_settings
 from ..models.user import User
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 settings = get_settings()
 
 # Initialize Supabase Admin client with service_role key
 # The service_role key has admin privileges and bypasses RLS
-_supabase_admin: Optional[Client] = None
+_supabase_admin: Optional["Client"] = None
 
 
-def get_supabase_admin() -> Client:
+def get_supabase_admin() -> "Client":
     """Get or create Supabase admin client with service_role key"""
     global _supabase_admin
     if _supabase_admin is None:
+        # Imported here: the supabase SDK is slow to import and most requests don't need it
+        from supabase import create_client
         _supabase_admin = create_client(
             settings.SUPABASE_URL,
             settings.SUPABASE_KEY  # This should be the service_role key in production
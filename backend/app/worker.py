@@ -0,0 +1,79 @@
+"""
+Background job worker
+
+Claims and runs jobs from the background_jobs queue until stopped, and runs
+the scheduler thread for the cron workloads (unless SCHEDULER_ENABLED is off
+or --no-scheduler is given):
+
+    python -m app.worker                 # run forever
+    python -m app.worker --once          # drain due jobs, then exit (no scheduler)
+    python -m app.worker --poll-seconds 5
+
+Run as many workers as needed (claims use SKIP LOCKED). SIGTERM / SIGINT
+finish the current job and exit. Deployments without a worker process
+(Vercel) rely on /api/cron/process-jobs and JOBS_RUN_AFTER_RESPONSE instead.
+"""
+
+import argparse
+import signal
+import threading
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.core.logging_config import get_logger
+from app.services import job_queue
+from app.services.scheduler import Scheduler
+
+logger = get_logger("worker")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Background job worker")
+    parser.add_argument("--once", action="store_true", help="Exit once no due jobs are left")
+    parser.add_argument("--poll-seconds", type=float, default=settings.JOB_WORKER_POLL_SECONDS)
+    parser.add_argument("--no-scheduler", action="store_true", help="Only run jobs, not scheduled tasks")
+    args = parser.parse_args()
+
+    stopping = threading.Event()
+
+    def request_stop(signum, frame):
+        logger.info("Worker stopping after the current job")
+        stopping.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    worker = job_queue.worker_id()
+    logger.info(f"Worker {worker} started")
+
+    scheduler = None
+    if settings.SCHEDULER_ENABLED and not args.no_scheduler and not args.once:
+        scheduler = Scheduler()
+        scheduler.start()
+
+    while not stopping.is_set():
+        db = SessionLocal()
+        try:
+            # One job per round, so a stop request is seen between jobs
+            result = job_queue.process_jobs(db, batch_size=1, worker=worker)
+        except Exception as e:
+            # Database unreachable etc.: back off and try again
+            logger.error(f"Job processing failed: {e}")
+            result = {'processed': 0}
+        finally:
+            db.close()
+
+        if result['processed']:
+            logger.info(f"Processed jobs: {result}")
+            continue
+        if args.once:
+            break
+        stopping.wait(args.poll_seconds)
+
+    if scheduler:
+        scheduler.stop()
+    logger.info(f"Worker {worker} stopped")
+
+
+if __name__ == "__main__":
+    main()
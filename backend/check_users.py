@@ -2,31 +2,22 @@
 Check users in database
 """
 
-import os
-from dotenv import load_dotenv
-import psycopg2
-
-# Load environment variables
-load_dotenv()
-
-# Get database URL
-DATABASE_URL = os.getenv("DATABASE_URL")
+from sqlalchemy import text
+from app.core.database import engine  # Shared engine: same pool, timeouts and pooler settings as the app
 
 # Connect to database
-conn = psycopg2.connect(DATABASE_URL)
-cur = conn.cursor()
+conn = engine.connect()
 
 try:
     # Get all users
     print("Users in database:")
     print("=" * 80)
-    cur.execute("""
+    results = conn.execute(text("""
         SELECT email, role, team, first_name, last_name
         FROM users
         ORDER BY role DESC, email;
-    """)
+    """)).fetchall()
 
-    results = cur.fetchall()
     for row in results:
         email, role, team, first_name, last_name = row
         team_str = f"[{team}]" if team else "[no team]"
@@ -38,5 +29,4 @@ except Exception as e:
     print(f"✗ Error: {e}")
 
 finally:
-    cur.close()
     conn.close()
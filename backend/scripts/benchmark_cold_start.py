@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Cold start benchmark and budget check.
+
+Runs in fresh interpreters (like a new serverless instance) and measures:
+- import time of app.main via `python -X importtime` (with the slowest packages)
+- time to first response: import app.main + first GET / through TestClient
+- that heavy SDKs (stripe, resend, markdown2, supabase, google-auth) are NOT
+  imported at startup - they should load lazily on first use
+
+Exits with status 1 when a budget is exceeded or a heavy SDK is imported
+eagerly, so it can gate CI / deploys.
+
+Requires the backend .env (Settings must load) and an installed requirements.txt.
+
+Usage:
+    python scripts/benchmark_cold_start.py [--import-budget-ms 1500] [--first-response-budget-ms 2500] [--runs 3]
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must stay out of the startup import graph
+LAZY_MODULES = ("stripe", "resend", "markdown2", "supabase", "google.oauth2")
+
+FIRST_RESPONSE_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+from app.main import app
+imported = time.perf_counter()
+from fastapi.testclient import TestClient
+response = TestClient(app).get("/")
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - start) * 1000,
+    "first_response_ms": (done - start) * 1000,
+    "status": response.status_code,
+    "eager_modules": [name for name in %r if name in sys.modules],
+}))
+""" % (LAZY_MODULES,)
+
+
+def run_python(args: list, env: dict) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, *args],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+
+
+def measure_importtime(env: dict) -> tuple:
+    """Return (total ms for app.main, [(cumulative ms, package)] for third-party/stdlib packages)"""
+    result = run_python(["-X", "importtime", "-c", "import app.main"], env)
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(1)
+
+    total_us = 0
+    # Root package -> cumulative time of its outermost import (the largest one)
+    packages = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if not cumulative.isdigit():
+            continue  # header line
+        if name == "app.main":
+            total_us = int(cumulative)
+        root = name.split(".")[0]
+        if root != "app":
+            packages[root] = max(packages.get(root, 0), int(cumulative))
+
+    return total_us / 1000, sorted(((us / 1000, root) for root, us in packages.items()), reverse=True)
+
+
+def measure_first_response(env: dict) -> dict:
+    result = run_python(["-c", FIRST_RESPONSE_SNIPPET], env)
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(1)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cold start benchmark")
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--first-response-budget-ms", type=float, default=2500)
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.pop("PYTHONDONTWRITEBYTECODE", None)
+    # Measure the app itself, not the background warmup it starts
+    env["WARMUP_ON_STARTUP"] = "false"
+
+    print(f"\n{'='*80}")
+    print(f"Cold start benchmark ({args.runs} fresh interpreters each)")
+    print(f"{'='*80}\n")
+
+    # First run compiles .pyc files; don't count it
+    measure_importtime(env)
+
+    import_times = []
+    packages = []
+    for _ in range(args.runs):
+        total, packages = measure_importtime(env)
+        import_times.append(total)
+
+    import_ms = statistics.median(import_times)
+    print(f"import app.main (-X importtime): {import_ms:8.1f}ms  (budget {args.import_budget_ms:.0f}ms)")
+    print("\nSlowest packages:")
+    for cumulative, name in packages[:15]:
+        print(f"  {cumulative:8.1f}ms  {name}")
+
+    runs = [measure_first_response(env) for _ in range(args.runs)]
+    first_response_ms = statistics.median(run["first_response_ms"] for run in runs)
+    eager_modules = sorted({name for run in runs for name in run["eager_modules"]})
+
+    print(f"\nTime to first response:          {first_response_ms:8.1f}ms  (budget {args.first_response_budget_ms:.0f}ms)")
+    print(f"Heavy SDKs imported at startup:  {', '.join(eager_modules) or 'none'}")
+
+    failures = []
+    if import_ms > args.import_budget_ms:
+        failures.append(f"import time {import_ms:.0f}ms > {args.import_budget_ms:.0f}ms")
+    if first_response_ms > args.first_response_budget_ms:
+        failures.append(f"first response {first_response_ms:.0f}ms > {args.first_response_budget_ms:.0f}ms")
+    if eager_modules:
+        failures.append(f"imported eagerly: {', '.join(eager_modules)}")
+    if any(run["status"] != 200 for run in runs):
+        failures.append("GET / did not return 200")
+
+    print()
+    if failures:
+        print("❌ Cold start budget exceeded: " + "; ".join(failures))
+        sys.exit(1)
+    print("✅ Cold start within budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Benchmark middleware overhead per request.
+
+Compares the CSRF + error handling middleware pair as:
+- BaseHTTPMiddleware implementations (the previous versions, reproduced below)
+- pure ASGI implementations (app.core.csrf / app.core.exceptions)
+- no middleware (baseline)
+
+Requests are driven straight through the ASGI interface (no server or
+network), so the numbers isolate the middleware cost. Both a small JSON
+response and a streamed response (like the audit log export) are measured.
+
+Usage:
+    python scripts/benchmark_middleware.py [requests]
+"""
+import sys
+import os
+import asyncio
+import statistics
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from starlette.middleware.base import BaseHTTPMiddleware
+from app.core.csrf import CSRFProtectionMiddleware
+from app.core.exceptions import ErrorHandlingMiddleware, handle_exception_safely
+
+
+class LegacyCSRFMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware version of CSRFProtectionMiddleware"""
+
+    def __init__(self, app, debug: bool = False):
+        super().__init__(app)
+        self.debug = debug
+
+    async def dispatch(self, request, call_next):
+        if request.method not in CSRFProtectionMiddleware.PROTECTED_METHODS:
+            return await call_next(request)
+        path = request.url.path
+        for prefix in CSRFProtectionMiddleware.EXEMPT_PATHS | CSRFProtectionMiddleware.SAFE_PATHS:
+            if path.startswith(prefix):
+                return await call_next(request)
+        if self.debug:
+            return await call_next(request)
+        if request.headers.get("X-Requested-With", "").lower() != "xmlhttprequest":
+            raise HTTPException(status_code=403, detail="CSRF validation failed")
+        return await call_next(request)
+
+
+class LegacyErrorHandlingMiddleware(BaseHTTPMiddleware):
+    """The previous BaseHTTPMiddleware version of ErrorHandlingMiddleware"""
+
+    def __init__(self, app, debug: bool = False):
+        super().__init__(app)
+        self.debug = debug
+
+    async def dispatch(self, request, call_next):
+        try:
+            return await call_next(request)
+        except Exception as exc:
+            if isinstance(exc, HTTPException):
+                raise
+            return handle_exception_safely(exception=exc, request=request, debug_mode=self.debug)
+
+
+def build_app(csrf_cls=None, errors_cls=None) -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/api/applications/bench")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/api/export")
+    async def export():
+        def rows():
+            for i in range(200):
+                yield f'{{"row": {i}}}\n'
+        return StreamingResponse(rows(), media_type="application/x-ndjson")
+
+    if csrf_cls:
+        app.add_middleware(csrf_cls, debug=False)
+    if errors_cls:
+        app.add_middleware(errors_cls, debug=False)
+    return app
+
+
+async def call(app, method: str, path: str) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench"), (b"x-requested-with", b"XMLHttpRequest")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    status_code = 0
+    body_sent = False
+
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.sleep(3600)
+
+    async def send(message):
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def time_requests(app, method: str, path: str, count: int) -> list:
+    """Return per-request latencies in microseconds"""
+    # Warm up routing / first-call paths
+    for _ in range(50):
+        await call(app, method, path)
+
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        status_code = await call(app, method, path)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+        assert status_code == 200, status_code
+    return timings
+
+
+def report(label: str, timings: list, baseline: float) -> None:
+    mean = statistics.mean(timings)
+    print(f"  {label:<22} mean {mean:8.1f}us   p50 {statistics.median(timings):8.1f}us   "
+          f"overhead {mean - baseline:+8.1f}us   {1_000_000 / mean:8.0f} req/s")
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    apps = {
+        "no middleware": build_app(),
+        "BaseHTTPMiddleware": build_app(LegacyCSRFMiddleware, LegacyErrorHandlingMiddleware),
+        "pure ASGI": build_app(CSRFProtectionMiddleware, ErrorHandlingMiddleware),
+    }
+
+    print(f"\n{'='*80}")
+    print(f"Middleware overhead: CSRF + error handling ({count} requests each)")
+    print(f"{'='*80}")
+
+    for method, path, label in (("POST", "/api/applications/bench", "JSON response"),
+                                ("GET", "/api/export", "streamed response (200 chunks)")):
+        print(f"\n{label}:")
+        results = {name: await time_requests(app, method, path, count) for name, app in apps.items()}
+        baseline = statistics.mean(results["no middleware"])
+        for name, timings in results.items():
+            report(name, timings, baseline)
+
+    print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
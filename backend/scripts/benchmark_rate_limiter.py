@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark rate limiter overhead per request.
+
+Measures the cost of one limiter hit for:
+- memory://  (old per-process storage, baseline)
+- campdb://  (shared Postgres counters, under the limit -> one upsert)
+- campdb://  (over the limit -> in-process fast path, no DB round trip)
+
+Requires DATABASE_URL and migration 041 (rate_limit_counters).
+
+Usage:
+    python scripts/benchmark_rate_limiter.py [iterations]
+"""
+import sys
+import os
+import statistics
+import time
+import uuid
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+from app.core import rate_limit_storage  # noqa: F401 - registers campdb://
+
+
+def time_hits(limiter: FixedWindowRateLimiter, limit, key: str, iterations: int) -> list:
+    """Return per-hit latencies in microseconds"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        limiter.hit(limit, key)
+        timings.append((time.perf_counter() - start) * 1_000_000)
+    return timings
+
+
+def report(label: str, timings: list) -> None:
+    timings = sorted(timings)
+    p99 = timings[int(len(timings) * 0.99) - 1]
+    print(f"{label:<32} mean {statistics.mean(timings):8.1f}us   "
+          f"p50 {statistics.median(timings):8.1f}us   p99 {p99:8.1f}us")
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    run_id = uuid.uuid4().hex[:8]
+
+    print(f"\n{'='*80}")
+    print(f"Rate limiter overhead per hit ({iterations} hits each)")
+    print(f"{'='*80}\n")
+
+    memory = FixedWindowRateLimiter(storage_from_string("memory://"))
+    report("memory:// (per-process)", time_hits(memory, parse("1000000/minute"), f"bench-{run_id}", iterations))
+
+    storage = storage_from_string("campdb://")
+    if not storage.check():
+        print("campdb:// storage not reachable - is DATABASE_URL set and migration 041 applied?")
+        return
+
+    postgres = FixedWindowRateLimiter(storage)
+    try:
+        report("campdb:// under limit", time_hits(postgres, parse("1000000/minute"), f"bench-{run_id}-a", iterations))
+
+        # First hit takes the key over the limit; the rest use the fast path
+        report("campdb:// over limit (fast path)", time_hits(postgres, parse("1/minute"), f"bench-{run_id}-b", iterations))
+    finally:
+        for key in (f"bench-{run_id}-a", f"bench-{run_id}-b"):
+            for limit in (parse("1000000/minute"), parse("1/minute")):
+                storage.clear(limit.key_for(key))
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Benchmark JSON serialization and payload size for large list responses.
+
+Builds a synthetic admin application list (GET /api/applications/admin/all:
+applications with user info and every response) and compares:
+- old path: model_validate + model_dump per row, jsonable_encoder, json.dumps
+- new path: Projection per row, orjson (FastJSONResponse)
+
+and reports the payload size uncompressed, gzip and brotli, with the
+compression time for each.
+
+No database needed.
+
+Usage:
+    python scripts/benchmark_serialization.py [applications] [responses_per_application]
+"""
+import sys
+import os
+import gzip
+import json
+import statistics
+import time
+import typing
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.encoders import jsonable_encoder
+from app.core.serialization import Projection, dumps, orjson
+from app.core.compression import Compressor, brotli
+from app.schemas.application import ApplicationWithUser, ApplicationResponse, UserInfo
+
+
+def fake_value(annotation, name: str):
+    """A plausible value for a schema field annotation"""
+    origin = typing.get_origin(annotation)
+    if origin is typing.Union:
+        return fake_value([a for a in typing.get_args(annotation) if a is not type(None)][0], name)
+    if annotation is bool:
+        return True
+    if annotation is int:
+        return 42
+    if annotation is datetime:
+        return datetime.now(timezone.utc)
+    if annotation is str:
+        return f"Sample {name.replace('_', ' ')}"
+    if isinstance(annotation, type) and issubclass(annotation, uuid.UUID):
+        return uuid.uuid4()
+    if "UUID" in str(annotation):
+        return uuid.uuid4()
+    return None
+
+
+def fake_object(schema, **overrides):
+    values = {name: fake_value(field.annotation, name) for name, field in schema.model_fields.items()}
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def build_rows(applications: int, responses: int) -> list:
+    rows = []
+    for _ in range(applications):
+        rows.append(fake_object(
+            ApplicationWithUser,
+            user=fake_object(UserInfo, email="parent@example.com"),
+            responses=[fake_object(ApplicationResponse, response_value="An answer of typical length for a form field")
+                       for _ in range(responses)],
+        ))
+    return rows
+
+
+def old_path(rows) -> bytes:
+    content = [ApplicationWithUser.model_validate(row).model_dump() for row in rows]
+    # FastAPI: jsonable_encoder, then JSONResponse.render
+    encoded = jsonable_encoder(content)
+    return json.dumps(encoded, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+projection = Projection(ApplicationWithUser)
+
+
+def new_path(rows) -> bytes:
+    return dumps([projection(row) for row in rows])
+
+
+def time_ms(func, *args, runs: int = 5):
+    timings = []
+    result = None
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = func(*args)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    applications = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    responses = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+
+    rows = build_rows(applications, responses)
+
+    print(f"\n{'='*80}")
+    print(f"Serialization: {applications} applications x {responses} responses")
+    print(f"{'='*80}\n")
+
+    old_ms, old_body = time_ms(old_path, rows)
+    new_ms, new_body = time_ms(new_path, rows)
+    print(f"  validate + jsonable_encoder + json   {old_ms:8.1f}ms   {len(old_body) / 1024:8.1f} KB")
+    print(f"  projection + {'orjson' if orjson else 'json (orjson missing)':<22}  {new_ms:8.1f}ms   {len(new_body) / 1024:8.1f} KB")
+    print(f"  speedup                              {old_ms / new_ms:8.1f}x")
+
+    print("\nCompression of the new payload:")
+    gzip_ms, gzip_body = time_ms(lambda body: Compressor("gzip").finish(body), new_body)
+    print(f"  gzip (level 6)     {gzip_ms:8.1f}ms   {len(gzip_body) / 1024:8.1f} KB   "
+          f"({len(gzip_body) / len(new_body):.1%} of original)")
+    assert gzip.decompress(gzip_body) == new_body
+
+    if brotli is not None:
+        br_ms, br_body = time_ms(lambda body: Compressor("br").finish(body), new_body)
+        print(f"  brotli (q4)        {br_ms:8.1f}ms   {len(br_body) / 1024:8.1f} KB   "
+              f"({len(br_body) / len(new_body):.1%} of original)")
+    else:
+        print("  brotli             not installed")
+
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Cache invalidation bus check against a real Postgres.
+
+Plays "another worker" over a separate connection and verifies that this
+process's LocalCache entries are evicted:
+- listen mode: a NOTIFY on cache_invalidation evicts the key (and only that key)
+- poll mode: bumping cache_versions evicts the namespace on the next read
+- publish(): bumps the namespace version and evicts locally
+
+Exits with status 1 on the first failure. Requires the backend .env (DATABASE_URL
+pointing at a local/dev database - the check writes to cache_versions) with
+migration 045_cache_versions.sql applied. Use the session pooler or a direct
+connection: LISTEN does not work through the transaction pooler.
+
+Usage:
+    python scripts/check_cache_bus.py [--timeout 5]
+"""
+import sys
+import os
+import argparse
+import json
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.core.database import engine, SessionLocal
+from app.core.cache_bus import LocalCache, CHANNEL, cache_bus, publish
+
+NAMESPACE = "cache_bus_check"
+
+
+def fail(message: str):
+    print(f"❌ {message}")
+    cache_bus.stop()
+    sys.exit(1)
+
+
+def wait_for(condition, timeout: float) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.05)
+    return False
+
+
+def notify(key=None):
+    """NOTIFY as another worker would (committed on its own connection)"""
+    with engine.begin() as conn:
+        conn.execute(
+            text("SELECT pg_notify(:channel, :payload)"),
+            {"channel": CHANNEL, "payload": json.dumps({"namespace": NAMESPACE, "key": key})}
+        )
+
+
+def bump_version():
+    with engine.begin() as conn:
+        conn.execute(
+            text("""
+                INSERT INTO cache_versions (namespace, version, updated_at)
+                VALUES (:namespace, 1, NOW())
+                ON CONFLICT (namespace)
+                DO UPDATE SET version = cache_versions.version + 1, updated_at = NOW()
+            """),
+            {"namespace": NAMESPACE}
+        )
+
+
+def current_version() -> int:
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT version FROM cache_versions WHERE namespace = :namespace"),
+            {"namespace": NAMESPACE}
+        ).scalar() or 0
+
+
+def check_listen(cache: LocalCache, timeout: float):
+    cache_bus.mode = "listen"
+    cache_bus.start()
+    if not wait_for(lambda: cache_bus._listening, timeout):
+        fail("Listener did not connect (transaction pooler? see usage)")
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    notify("a")
+    if not wait_for(lambda: cache.get("a") is None, timeout):
+        fail("NOTIFY for key 'a' was not delivered")
+    if cache.get("b") != 2:
+        fail("NOTIFY for key 'a' evicted key 'b'")
+    print("✓ listen: keyed NOTIFY evicts only that key")
+
+    notify()
+    if not wait_for(lambda: cache.get("b") is None, timeout):
+        fail("Namespace-wide NOTIFY was not delivered")
+    print("✓ listen: namespace NOTIFY evicts every key")
+
+    cache_bus.stop()
+
+
+def check_poll(cache: LocalCache):
+    cache_bus.mode = "poll"
+    cache_bus.version_check_seconds = 0
+    cache_bus._versions = None
+
+    cache.set("a", 1)
+    if cache.get("a") != 1:  # First read takes the version baseline
+        fail("Poll baseline read evicted an unchanged namespace")
+    bump_version()
+    if cache.get("a") is not None:
+        fail("Version bump did not evict the namespace")
+    print("✓ poll: cache_versions bump evicts the namespace")
+
+
+def check_publish(cache: LocalCache):
+    before = current_version()
+    cache.set("a", 1)
+    db = SessionLocal()
+    try:
+        publish(db, NAMESPACE, "a")
+    finally:
+        db.close()
+    if cache.get("a") is not None:
+        fail("publish() did not evict locally")
+    if current_version() != before + 1:
+        fail("publish() did not bump cache_versions")
+    print("✓ publish: evicts locally and bumps the version")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cache invalidation bus check")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(f"\n{'='*80}")
+    print("Cache invalidation bus check")
+    print(f"{'='*80}\n")
+
+    cache = LocalCache(NAMESPACE, ttl_seconds=60)
+    try:
+        check_listen(cache, args.timeout)
+        check_poll(cache)
+        check_publish(cache)
+    finally:
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM cache_versions WHERE namespace = :namespace"), {"namespace": NAMESPACE})
+
+    print("\n✅ Cache bus delivers invalidations")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Stripe customer cache check against a local Stripe stand-in.
+
+Runs get_or_create_stripe_customer for a throwaway user and verifies:
+- the created customer is cached (stripe_customers) and stored on the user
+- a known customer is returned without contacting Stripe
+- a customer.deleted webhook invalidates it (the next call goes to Stripe)
+- a cache miss is re-verified with Customer.retrieve and cached again
+
+"Without contacting Stripe" is checked by pointing the SDK at a closed port:
+any request fails with APIConnectionError.
+
+Exits with status 1 on the first failure. Requires the backend .env with
+STRIPE_API_BASE pointing at stripe-mock (refuses to run against
+api.stripe.com) and DATABASE_URL pointing at a local/dev database with
+migration 049_stripe_customer_cache.sql applied - the check creates and
+deletes a user.
+
+    docker run --rm -p 12111:12111 stripe/stripe-mock
+    STRIPE_API_BASE=http://localhost:12111 python scripts/check_stripe_customer_cache.py
+"""
+import sys
+import os
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.user import User
+from app.services import stripe_service
+from app.services.stripe_service import stripe
+
+UNREACHABLE_API_BASE = "http://127.0.0.1:9"
+
+
+def fail(message: str):
+    print(f"❌ {message}")
+    sys.exit(1)
+
+
+def cached_row(db, customer_id: str):
+    return db.execute(
+        text("SELECT deleted FROM stripe_customers WHERE id = :id"),
+        {"id": customer_id}
+    ).fetchone()
+
+
+def offline_get_or_create(db, user):
+    """get_or_create_stripe_customer with every Stripe request failing"""
+    module = stripe.load()  # Set on the module itself, not the lazy proxy
+    module.api_base = UNREACHABLE_API_BASE
+    try:
+        return stripe_service.get_or_create_stripe_customer(db, user)
+    finally:
+        module.api_base = settings.STRIPE_API_BASE
+
+
+def main():
+    if not settings.STRIPE_API_BASE:
+        fail("STRIPE_API_BASE is not set - this check only runs against a local Stripe stand-in")
+    stripe.load()
+
+    db = SessionLocal()
+    user = User(email=f"stripe-cache-check-{uuid.uuid4().hex[:8]}@example.com", first_name="Cache", last_name="Check")
+    db.add(user)
+    db.commit()
+    customer_ids = set()
+
+    try:
+        customer_id = stripe_service.get_or_create_stripe_customer(db, user)
+        customer_ids.add(customer_id)
+        db.refresh(user)
+        if user.stripe_customer_id != customer_id:
+            fail("customer ID was not stored on the user")
+        row = cached_row(db, customer_id)
+        if row is None or row[0]:
+            fail("created customer was not cached")
+        print(f"✅ created and cached {customer_id}")
+
+        try:
+            if offline_get_or_create(db, user) != customer_id:
+                fail("cache hit returned a different customer")
+        except stripe.error.APIConnectionError:
+            fail("cached customer still contacted Stripe")
+        print("✅ cached customer returned without contacting Stripe")
+
+        stripe_service.handle_customer_event(
+            "customer.deleted", {"id": customer_id, "object": "customer", "deleted": True}, db
+        )
+        if not cached_row(db, customer_id)[0]:
+            fail("customer.deleted did not mark the cached customer deleted")
+        try:
+            offline_get_or_create(db, user)
+            fail("deleted customer was still trusted")
+        except stripe.error.APIConnectionError:
+            pass
+        new_customer_id = stripe_service.get_or_create_stripe_customer(db, user)
+        customer_ids.add(new_customer_id)
+        if cached_row(db, new_customer_id)[0]:
+            fail("replacement customer is cached as deleted")
+        print(f"✅ customer.deleted invalidated the cache, replacement {new_customer_id}")
+
+        db.refresh(user)
+        stripe_service.forget_stripe_customer(user.stripe_customer_id)
+        stripe_service.get_or_create_stripe_customer(db, user)
+        if cached_row(db, user.stripe_customer_id) is None:
+            fail("cache miss was not re-cached after Customer.retrieve")
+        print("✅ cache miss re-verified with Stripe and cached again")
+
+    finally:
+        db.rollback()
+        db.execute(text("DELETE FROM stripe_customers WHERE id = ANY(:ids)"), {"ids": list(customer_ids)})
+        db.execute(text("DELETE FROM users WHERE id = :id"), {"id": str(user.id)})
+        db.commit()
+        db.close()
+
+    print("All Stripe customer cache checks passed")
+
+
+if __name__ == "__main__":
+    main()
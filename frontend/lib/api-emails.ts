@@ -2,6 +2,8 @@
  * API client for email-related endpoints
  */
 
+import { resultOfQueuedJob } from './api-jobs'
+
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
 // CSRF protection header required for state-changing requests
@@ -247,7 +249,7 @@ export async function sendMassEmail(
     throw new Error(error.detail || 'Failed to send mass emails')
   }
 
-  return response.json()
+  return resultOfQueuedJob(token, response)
 }
 
 /**
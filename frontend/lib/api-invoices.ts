@@ -3,6 +3,8 @@
  * Functions for invoice management, payments, and scholarships
  */
 
+import { resultOfQueuedJob } from './api-jobs'
+
 const API_BASE_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
 // CSRF protection header required for state-changing requests
@@ -340,7 +342,7 @@ export async function createPaymentPlan(
     throw new Error(error.detail || 'Failed to create payment plan')
   }
 
-  return response.json()
+  return resultOfQueuedJob(token, response)
 }
 
 // =============================================================================
@@ -0,0 +1,150 @@
+/**
+ * Background Job API Client
+ * Heavy admin actions (mass email, deletions, payment plans) are queued as
+ * background jobs: the endpoint answers 202 with a job_id, then we poll the
+ * job until it finishes.
+ */
+
+const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
+
+// CSRF protection header required for state-changing requests
+const CSRF_HEADER = {
+  'X-Requested-With': 'XMLHttpRequest',
+}
+
+export type JobStatus = 'pending' | 'running' | 'completed' | 'failed' | 'cancelled'
+
+export interface JobAccepted {
+  job_id: string
+  job_type: string
+  status: JobStatus
+  status_url: string
+}
+
+export interface Job<T = unknown> {
+  id: string
+  job_type: string
+  status: JobStatus
+  priority: number
+  attempts: number
+  max_attempts: number
+  cancel_requested: boolean
+  progress: {
+    current: number
+    total: number | null
+    message: string | null
+  }
+  result: T | null
+  error_message: string | null
+  created_by: string | null
+  created_at: string
+  started_at: string | null
+  finished_at: string | null
+  run_at: string
+}
+
+/**
+ * Get a background job's status, progress and result
+ */
+export async function getJob<T = unknown>(token: string, jobId: string): Promise<Job<T>> {
+  const response = await fetch(`${API_URL}/api/jobs/${jobId}`, {
+    headers: {
+      'Authorization': `Bearer ${token}`,
+    },
+  })
+
+  if (!response.ok) {
+    const error = await response.json()
+    throw new Error(error.detail || 'Failed to fetch job')
+  }
+
+  return response.json()
+}
+
+/**
+ * Cancel a background job (running jobs stop at their next progress report)
+ */
+export async function cancelJob(token: string, jobId: string): Promise<Job> {
+  const response = await fetch(`${API_URL}/api/jobs/${jobId}/cancel`, {
+    method: 'POST',
+    headers: {
+      'Authorization': `Bearer ${token}`,
+      ...CSRF_HEADER,
+    },
+  })
+
+  if (!response.ok) {
+    const error = await response.json()
+    throw new Error(error.detail || 'Failed to cancel job')
+  }
+
+  return response.json()
+}
+
+export interface WaitForJobOptions<T> {
+  intervalMs?: number
+  /** Give up after this long (the job keeps running server-side). Default 10 minutes. */
+  timeoutMs?: number
+  /** Stop polling early, e.g. when the component unmounts */
+  signal?: AbortSignal
+  onProgress?: (job: Job<T>) => void
+}
+
+const DEFAULT_WAIT_TIMEOUT_MS = 10 * 60 * 1000
+
+/**
+ * Poll a job until it finishes and return its result.
+ * Throws with the job's error message if it failed or was cancelled, and
+ * stops polling once timeoutMs has passed or the signal is aborted.
+ */
+export async function waitForJob<T>(
+  token: string,
+  jobId: string,
+  options?: WaitForJobOptions<T>
+): Promise<T> {
+  const intervalMs = options?.intervalMs ?? 1500
+  const deadline = Date.now() + (options?.timeoutMs ?? DEFAULT_WAIT_TIMEOUT_MS)
+  const signal = options?.signal
+
+  while (true) {
+    signal?.throwIfAborted()
+    const job = await getJob<T>(token, jobId)
+    options?.onProgress?.(job)
+
+    if (job.status === 'completed') {
+      return job.result as T
+    }
+    if (job.status === 'failed' || job.status === 'cancelled') {
+      throw new Error(job.error_message || `Job ${job.status}`)
+    }
+    if (Date.now() + intervalMs > deadline) {
+      throw new Error(
+        `Job is still ${job.status} - it keeps running in the background, check back later`
+      )
+    }
+
+    await new Promise<void>((resolve, reject) => {
+      const onAbort = () => {
+        clearTimeout(timer)
+        reject(signal?.reason)
+      }
+      const timer = setTimeout(() => {
+        signal?.removeEventListener('abort', onAbort)
+        resolve()
+      }, intervalMs)
+      signal?.addEventListener('abort', onAbort, { once: true })
+    })
+  }
+}
+
+/**
+ * Read a 202 JobAccepted response and wait for the job's result
+ */
+export async function resultOfQueuedJob<T>(
+  token: string,
+  response: Response,
+  options?: WaitForJobOptions<T>
+): Promise<T> {
+  const accepted: JobAccepted = await response.json()
+  return waitForJob<T>(token, accepted.job_id, options)
+}
@@ -238,77 +238,64 @@ export async function deleteAllergy(allergyId: string): Promise<void> {
 // ============================================================================
 
 /**
- * Save all medications for a question at once
- * This handles creating new medications and updating existing ones
+ * Save all medications (and their doses) for a question at once.
+ * The server diffs the list against what's stored in one transaction:
+ * items with an id are updated, items without one are created, and
+ * medications/doses missing from the list are deleted.
+ * Returns the stored list (with ids for the new items).
  */
 export async function saveMedicationsForQuestion(
   applicationId: string,
   questionId: string,
   medications: Medication[]
-): Promise<void> {
-  // First, fetch existing medications to see what needs to be created vs updated
-  const existing = await getMedicationsForQuestion(applicationId, questionId);
-  const existingIds = new Set(existing.map(m => m.id));
-
-  for (const medication of medications) {
-    const medData = {
-      ...medication,
-      application_id: applicationId,
-      question_id: questionId
-    };
-
-    if (medication.id && existingIds.has(medication.id)) {
-      // Update existing
-      await updateMedication(medication.id, medData);
-    } else {
-      // Create new
-      await saveMedication(medData);
+): Promise<Medication[]> {
+  const token = localStorage.getItem('token');
+  const response = await fetch(
+    `${API_BASE_URL}/api/medications/${applicationId}/question/${questionId}`,
+    {
+      method: 'PUT',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json',
+        ...CSRF_HEADER
+      },
+      body: JSON.stringify({ medications })
     }
-  }
+  );
 
-  // Delete medications that were removed
-  const currentIds = new Set(medications.filter(m => m.id).map(m => m.id));
-  for (const existingMed of existing) {
-    if (existingMed.id && !currentIds.has(existingMed.id)) {
-      await deleteMedication(existingMed.id);
-    }
+  if (!response.ok) {
+    throw new Error('Failed to save medications');
   }
+
+  return response.json();
 }
 
 /**
- * Save all allergies for a question at once
- * This handles creating new allergies and updating existing ones
+ * Save all allergies for a question at once (same diffing as medications).
+ * Returns the stored list (with ids for the new items).
  */
 export async function saveAllergiesForQuestion(
   applicationId: string,
   questionId: string,
   allergies: Allergy[]
-): Promise<void> {
-  // First, fetch existing allergies to see what needs to be created vs updated
-  const existing = await getAllergiesForQuestion(applicationId, questionId);
-  const existingIds = new Set(existing.map(a => a.id));
-
-  for (const allergy of allergies) {
-    const allergyData = {
-      ...allergy,
-      application_id: applicationId,
-      question_id: questionId
-    };
-
-    if (allergy.id && existingIds.has(allergy.id)) {
-      // Update existing
-      await updateAllergy(allergy.id, allergyData);
-    } else {
-      // Create new
-      await saveAllergy(allergyData);
+): Promise<Allergy[]> {
+  const token = localStorage.getItem('token');
+  const response = await fetch(
+    `${API_BASE_URL}/api/allergies/${applicationId}/question/${questionId}`,
+    {
+      method: 'PUT',
+      headers: {
+        'Authorization': `Bearer ${token}`,
+        'Content-Type': 'application/json',
+        ...CSRF_HEADER
+      },
+      body: JSON.stringify({ allergies })
     }
-  }
+  );
 
-  // Delete allergies that were removed
-  const currentIds = new Set(allergies.filter(a => a.id).map(a => a.id));
-  for (const existingAllergy of existing) {
-    if (existingAllergy.id && !currentIds.has(existingAllergy.id)) {
-      await deleteAllergy(existingAllergy.id);
-    }
+  if (!response.ok) {
+    throw new Error('Failed to save allergies');
   }
+
+  return response.json();
 }
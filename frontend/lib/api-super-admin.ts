@@ -4,6 +4,8 @@
  * Security: All state-changing requests include X-Requested-With header for CSRF protection.
  */
 
+import { resultOfQueuedJob } from './api-jobs'
+
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000'
 
 // CSRF protection header required for state-changing requests
@@ -374,7 +376,7 @@ export async function deleteUser(
     throw new Error(error.detail || 'Failed to delete user')
   }
 
-  return response.json()
+  return resultOfQueuedJob(token, response)
 }
 
 /**
@@ -940,7 +942,7 @@ export async function deleteApplication(
     throw new Error(error.detail || 'Failed to delete application')
   }
 
-  return response.json()
+  return resultOfQueuedJob(token, response)
 }
 
 
@@ -0,0 +1,116 @@
+-- Migration: Season archive tables
+-- Purpose: Keep past camp seasons out of the live tables without losing history.
+--
+-- Before the annual reset prunes responses, notes and approvals, every row for
+-- the season is copied into an archive table partitioned by season_year. Each
+-- archive row stores the full source row as JSONB (so later column changes on
+-- the live tables never break archiving) plus a few extracted columns that
+-- past-season queries filter on.
+--
+-- This migration is IDEMPOTENT - safe to run multiple times
+-- Date: 2026-10-18
+
+-- ============================================================================
+-- ARCHIVE TABLES (LIST partitioned by season_year)
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS season_archive_applications (
+    season_year INTEGER NOT NULL,
+    id UUID NOT NULL,
+    user_id UUID,
+    status VARCHAR(50),
+    sub_status VARCHAR(50),
+    camper_first_name VARCHAR(100),
+    camper_last_name VARCHAR(100),
+    data JSONB NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (season_year, id)
+) PARTITION BY LIST (season_year);
+
+CREATE TABLE IF NOT EXISTS season_archive_responses (
+    season_year INTEGER NOT NULL,
+    id UUID NOT NULL,
+    application_id UUID NOT NULL,
+    question_id UUID,
+    data JSONB NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (season_year, id)
+) PARTITION BY LIST (season_year);
+
+CREATE TABLE IF NOT EXISTS season_archive_approvals (
+    season_year INTEGER NOT NULL,
+    id UUID NOT NULL,
+    application_id UUID NOT NULL,
+    data JSONB NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (season_year, id)
+) PARTITION BY LIST (season_year);
+
+CREATE TABLE IF NOT EXISTS season_archive_notes (
+    season_year INTEGER NOT NULL,
+    id UUID NOT NULL,
+    application_id UUID NOT NULL,
+    data JSONB NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (season_year, id)
+) PARTITION BY LIST (season_year);
+
+CREATE TABLE IF NOT EXISTS season_archive_invoices (
+    season_year INTEGER NOT NULL,
+    id UUID NOT NULL,
+    application_id UUID NOT NULL,
+    data JSONB NOT NULL,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (season_year, id)
+) PARTITION BY LIST (season_year);
+
+-- Indexes are declared on the parent and inherited by every partition
+CREATE INDEX IF NOT EXISTS idx_season_archive_applications_user ON season_archive_applications(user_id);
+CREATE INDEX IF NOT EXISTS idx_season_archive_applications_status ON season_archive_applications(status, sub_status);
+CREATE INDEX IF NOT EXISTS idx_season_archive_responses_app ON season_archive_responses(application_id);
+CREATE INDEX IF NOT EXISTS idx_season_archive_approvals_app ON season_archive_approvals(application_id);
+CREATE INDEX IF NOT EXISTS idx_season_archive_notes_app ON season_archive_notes(application_id);
+CREATE INDEX IF NOT EXISTS idx_season_archive_invoices_app ON season_archive_invoices(application_id);
+
+-- Archive tables are only read through the backend (service role)
+ALTER TABLE season_archive_applications ENABLE ROW LEVEL SECURITY;
+ALTER TABLE season_archive_responses ENABLE ROW LEVEL SECURITY;
+ALTER TABLE season_archive_approvals ENABLE ROW LEVEL SECURITY;
+ALTER TABLE season_archive_notes ENABLE ROW LEVEL SECURITY;
+ALTER TABLE season_archive_invoices ENABLE ROW LEVEL SECURITY;
+
+-- ============================================================================
+-- PARTITION MANAGEMENT
+-- ============================================================================
+
+-- Creates the per-year partition of every archive table if it does not exist.
+-- Called by the backend before each archive run.
+CREATE OR REPLACE FUNCTION ensure_season_archive_partitions(p_year INTEGER)
+RETURNS VOID AS $$
+DECLARE
+    parent TEXT;
+BEGIN
+    FOREACH parent IN ARRAY ARRAY[
+        'season_archive_applications',
+        'season_archive_responses',
+        'season_archive_approvals',
+        'season_archive_notes',
+        'season_archive_invoices'
+    ]
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES IN (%s)',
+            parent || '_' || p_year, parent, p_year
+        );
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Add comments
+COMMENT ON TABLE season_archive_applications IS 'Per-season snapshot of applications taken before the annual reset. Partitioned by season_year.';
+COMMENT ON TABLE season_archive_responses IS 'Per-season snapshot of application_responses taken before the annual reset.';
+COMMENT ON TABLE season_archive_approvals IS 'Per-season snapshot of application_approvals taken before the annual reset.';
+COMMENT ON TABLE season_archive_notes IS 'Per-season snapshot of admin_notes taken before the annual reset.';
+COMMENT ON TABLE season_archive_invoices IS 'Per-season snapshot of invoices taken before the annual reset.';
+COMMENT ON COLUMN season_archive_applications.data IS 'Full source row as JSONB (to_jsonb) so archives survive later schema changes';
+COMMENT ON FUNCTION ensure_season_archive_partitions(INTEGER) IS 'Creates the season_year partition of every season_archive_* table if missing';
@@ -0,0 +1,19 @@
+-- Migration: Indexes for keyset pagination of audit logs
+--
+-- GET /api/super-admin/audit-logs now pages on (created_at, id) instead of
+-- OFFSET and supports created_at date-range filters. These composite indexes
+-- let each page (and each batch of the NDJSON export) be a single index range
+-- scan regardless of how deep into the table it is.
+
+-- Unfiltered listing / date-range export
+CREATE INDEX IF NOT EXISTS idx_audit_logs_created_id
+ON audit_logs(created_at DESC, id DESC);
+
+-- Listing filtered by category (entity_type) - the most common filter in the UI
+CREATE INDEX IF NOT EXISTS idx_audit_logs_entity_type_created_id
+ON audit_logs(entity_type, created_at DESC, id DESC);
+
+-- Listing filtered by actor ("what did this admin do")
+CREATE INDEX IF NOT EXISTS idx_audit_logs_actor_created_id
+ON audit_logs(actor_id, created_at DESC, id DESC)
+WHERE actor_id IS NOT NULL;
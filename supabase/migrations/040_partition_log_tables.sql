@@ -0,0 +1,299 @@
+-- Migration: Monthly partitioning for audit_logs / email_logs, email_queue archival and stats counters
+--
+-- audit_logs, email_logs and email_queue grew without bound. This migration:
+-- 1. Converts audit_logs (by created_at) and email_logs (by sent_at) into
+--    RANGE partitioned tables with one partition per month, so retention can
+--    DROP whole partitions instead of running large row deletes.
+-- 2. Adds email_queue_archive, where completed queue rows are moved once they
+--    are older than the configured age.
+-- 3. Adds email_queue_stats, a small per-status counter table maintained by
+--    triggers on email_queue, so queue stats no longer scan the whole queue.
+--
+-- Existing rows are copied into the new partitions. The conversion only runs
+-- while the tables are still plain tables, so this migration is IDEMPOTENT.
+-- Date: 2026-10-18
+
+-- ============================================================================
+-- PARTITION HELPERS
+-- ============================================================================
+
+-- Creates the partition of p_parent covering the month containing p_month.
+-- Partitions are named <parent>_pYYYY_MM.
+CREATE OR REPLACE FUNCTION create_monthly_partition(p_parent TEXT, p_month DATE)
+RETURNS TEXT AS $$
+DECLARE
+    start_date DATE := date_trunc('month', p_month)::DATE;
+    end_date DATE := (date_trunc('month', p_month) + INTERVAL '1 month')::DATE;
+    partition_name TEXT := p_parent || '_p' || to_char(p_month, 'YYYY_MM');
+BEGIN
+    EXECUTE format(
+        'CREATE TABLE IF NOT EXISTS %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+        partition_name, p_parent, start_date, end_date
+    );
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Makes sure partitions exist from the current month through p_months_ahead.
+-- A month that already has rows in the DEFAULT partition is skipped (with a
+-- NOTICE) rather than failing the whole run.
+CREATE OR REPLACE FUNCTION ensure_monthly_partitions(p_parent TEXT, p_months_ahead INTEGER DEFAULT 3)
+RETURNS INTEGER AS $$
+DECLARE
+    month_start DATE := date_trunc('month', NOW())::DATE;
+    created INTEGER := 0;
+BEGIN
+    FOR i IN 0..p_months_ahead LOOP
+        BEGIN
+            PERFORM create_monthly_partition(p_parent, (month_start + make_interval(months => i))::DATE);
+            created := created + 1;
+        EXCEPTION WHEN OTHERS THEN
+            RAISE NOTICE 'Could not create % partition for %: %',
+                p_parent, month_start + make_interval(months => i), SQLERRM;
+        END;
+    END LOOP;
+    RETURN created;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Drops monthly partitions of p_parent that end before the retention window
+-- (current month minus p_retain_months). Returns the dropped partition names.
+CREATE OR REPLACE FUNCTION drop_expired_monthly_partitions(p_parent TEXT, p_retain_months INTEGER)
+RETURNS SETOF TEXT AS $$
+DECLARE
+    part_name TEXT;
+    part_month DATE;
+    cutoff DATE := (date_trunc('month', NOW()) - make_interval(months => p_retain_months))::DATE;
+BEGIN
+    FOR part_name IN
+        SELECT c.relname
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        JOIN pg_class p ON p.oid = i.inhparent
+        WHERE p.relname = p_parent
+          AND c.relname ~ ('^' || p_parent || '_p[0-9]{4}_[0-9]{2}$')
+    LOOP
+        part_month := to_date(right(part_name, 7), 'YYYY_MM');
+        IF part_month + INTERVAL '1 month' <= cutoff THEN
+            EXECUTE format('DROP TABLE %I', part_name);
+            RETURN NEXT part_name;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- AUDIT_LOGS -> partitioned by created_at
+-- ============================================================================
+
+DO $$
+DECLARE
+    month_cursor DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'audit_logs' AND relkind = 'r') THEN
+        ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned;
+
+        CREATE TABLE audit_logs (LIKE audit_logs_unpartitioned INCLUDING DEFAULTS)
+            PARTITION BY RANGE (created_at);
+
+        SELECT COALESCE(date_trunc('month', MIN(created_at)), date_trunc('month', NOW()))::DATE
+        INTO month_cursor
+        FROM audit_logs_unpartitioned;
+
+        WHILE month_cursor <= date_trunc('month', NOW()) + INTERVAL '3 months' LOOP
+            PERFORM create_monthly_partition('audit_logs', month_cursor);
+            month_cursor := (month_cursor + INTERVAL '1 month')::DATE;
+        END LOOP;
+        CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT;
+
+        UPDATE audit_logs_unpartitioned SET created_at = NOW() WHERE created_at IS NULL;
+        INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned;
+        DROP TABLE audit_logs_unpartitioned;
+
+        ALTER TABLE audit_logs ALTER COLUMN created_at SET NOT NULL;
+        -- The partition key must be part of the primary key
+        ALTER TABLE audit_logs ADD PRIMARY KEY (id, created_at);
+        ALTER TABLE audit_logs ADD CONSTRAINT audit_logs_actor_id_fkey
+            FOREIGN KEY (actor_id) REFERENCES users(id);
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_audit_logs_entity ON audit_logs(entity_type, entity_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_action ON audit_logs(action);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_actor ON audit_logs(actor_id);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_created_id ON audit_logs(created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_entity_type_created_id ON audit_logs(entity_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_audit_logs_actor_created_id ON audit_logs(actor_id, created_at DESC, id DESC)
+    WHERE actor_id IS NOT NULL;
+
+-- ============================================================================
+-- EMAIL_LOGS -> partitioned by sent_at
+-- ============================================================================
+
+DO $$
+DECLARE
+    month_cursor DATE;
+BEGIN
+    IF EXISTS (SELECT 1 FROM pg_class WHERE relname = 'email_logs' AND relkind = 'r') THEN
+        ALTER TABLE email_logs RENAME TO email_logs_unpartitioned;
+
+        CREATE TABLE email_logs (LIKE email_logs_unpartitioned INCLUDING DEFAULTS)
+            PARTITION BY RANGE (sent_at);
+
+        SELECT COALESCE(date_trunc('month', MIN(sent_at)), date_trunc('month', NOW()))::DATE
+        INTO month_cursor
+        FROM email_logs_unpartitioned;
+
+        WHILE month_cursor <= date_trunc('month', NOW()) + INTERVAL '3 months' LOOP
+            PERFORM create_monthly_partition('email_logs', month_cursor);
+            month_cursor := (month_cursor + INTERVAL '1 month')::DATE;
+        END LOOP;
+        CREATE TABLE email_logs_default PARTITION OF email_logs DEFAULT;
+
+        UPDATE email_logs_unpartitioned SET sent_at = NOW() WHERE sent_at IS NULL;
+        INSERT INTO email_logs SELECT * FROM email_logs_unpartitioned;
+        DROP TABLE email_logs_unpartitioned;
+
+        ALTER TABLE email_logs ALTER COLUMN sent_at SET NOT NULL;
+        ALTER TABLE email_logs ADD PRIMARY KEY (id, sent_at);
+        ALTER TABLE email_logs ADD CONSTRAINT email_logs_user_id_fkey
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE SET NULL;
+        ALTER TABLE email_logs ADD CONSTRAINT email_logs_application_id_fkey
+            FOREIGN KEY (application_id) REFERENCES applications(id) ON DELETE SET NULL;
+    END IF;
+END $$;
+
+CREATE INDEX IF NOT EXISTS idx_email_logs_recipient ON email_logs(recipient_email);
+CREATE INDEX IF NOT EXISTS idx_email_logs_sent_at ON email_logs(sent_at);
+CREATE INDEX IF NOT EXISTS idx_email_logs_user_id ON email_logs(user_id);
+CREATE INDEX IF NOT EXISTS idx_email_logs_application_id ON email_logs(application_id);
+CREATE INDEX IF NOT EXISTS idx_email_logs_email_type ON email_logs(email_type);
+CREATE INDEX IF NOT EXISTS idx_email_logs_status ON email_logs(status);
+
+COMMENT ON TABLE email_logs IS 'Log of all emails sent through the system, partitioned monthly by sent_at';
+COMMENT ON TABLE audit_logs IS 'Audit trail of system actions, partitioned monthly by created_at';
+
+-- ============================================================================
+-- EMAIL_QUEUE ARCHIVE
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS email_queue_archive (LIKE email_queue INCLUDING DEFAULTS);
+CREATE INDEX IF NOT EXISTS idx_email_queue_archive_processed_at ON email_queue_archive(processed_at);
+CREATE INDEX IF NOT EXISTS idx_email_queue_archive_application_id ON email_queue_archive(application_id);
+ALTER TABLE email_queue_archive ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE email_queue_archive IS 'Completed email_queue rows moved out of the live queue by archive_completed_email_queue()';
+
+-- ============================================================================
+-- EMAIL_QUEUE STATS COUNTERS
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS email_queue_stats (
+    status VARCHAR(50) PRIMARY KEY,  -- pending, processing, completed, failed, archived
+    count BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+ALTER TABLE email_queue_stats ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE email_queue_stats IS 'Row count per email_queue status (plus archived total), maintained by triggers';
+
+CREATE OR REPLACE FUNCTION email_queue_stats_adjust(p_status TEXT, p_delta BIGINT)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO email_queue_stats (status, count, updated_at)
+    VALUES (p_status, p_delta, NOW())
+    ON CONFLICT (status) DO UPDATE
+        SET count = email_queue_stats.count + EXCLUDED.count,
+            updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION email_queue_stats_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        PERFORM email_queue_stats_adjust(OLD.status, -1);
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        PERFORM email_queue_stats_adjust(NEW.status, 1);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS email_queue_stats_insert_delete ON email_queue;
+CREATE TRIGGER email_queue_stats_insert_delete
+    AFTER INSERT OR DELETE ON email_queue
+    FOR EACH ROW EXECUTE FUNCTION email_queue_stats_trigger();
+
+DROP TRIGGER IF EXISTS email_queue_stats_status_change ON email_queue;
+CREATE TRIGGER email_queue_stats_status_change
+    AFTER UPDATE OF status ON email_queue
+    FOR EACH ROW
+    WHEN (OLD.status IS DISTINCT FROM NEW.status)
+    EXECUTE FUNCTION email_queue_stats_trigger();
+
+-- Seed counters from the current queue (re-running recounts the live statuses)
+INSERT INTO email_queue_stats (status, count, updated_at)
+SELECT s.status, COALESCE(q.count, 0), NOW()
+FROM (VALUES ('pending'), ('processing'), ('completed'), ('failed')) AS s(status)
+LEFT JOIN (SELECT status, COUNT(*) AS count FROM email_queue GROUP BY status) q ON q.status = s.status
+ON CONFLICT (status) DO UPDATE SET count = EXCLUDED.count, updated_at = NOW();
+
+INSERT INTO email_queue_stats (status, count)
+SELECT 'archived', COUNT(*) FROM email_queue_archive
+ON CONFLICT (status) DO NOTHING;
+
+-- Moves completed queue rows older than p_older_than into email_queue_archive.
+-- Runs in batches so a large backlog doesn't hold locks for long. Columns are
+-- listed by name: the archive was created with LIKE email_queue, so matching
+-- by position would break (or misplace data) once email_queue gains a column.
+CREATE OR REPLACE FUNCTION archive_completed_email_queue(p_older_than INTERVAL, p_batch_size INTEGER DEFAULT 5000)
+RETURNS INTEGER AS $$
+DECLARE
+    moved INTEGER;
+BEGIN
+    WITH moved_rows AS (
+        DELETE FROM email_queue
+        WHERE id IN (
+            SELECT id FROM email_queue
+            WHERE status = 'completed'
+              AND processed_at < NOW() - p_older_than
+            LIMIT p_batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, recipient_email, recipient_name, user_id, application_id,
+                  template_key, subject, html_content, text_content, variables,
+                  priority, status, scheduled_for, attempts, max_attempts,
+                  last_attempt_at, processed_at, resend_id, error_message, created_at, updated_at
+    )
+    INSERT INTO email_queue_archive (
+        id, recipient_email, recipient_name, user_id, application_id,
+        template_key, subject, html_content, text_content, variables,
+        priority, status, scheduled_for, attempts, max_attempts,
+        last_attempt_at, processed_at, resend_id, error_message, created_at, updated_at
+    )
+    SELECT
+        id, recipient_email, recipient_name, user_id, application_id,
+        template_key, subject, html_content, text_content, variables,
+        priority, status, scheduled_for, attempts, max_attempts,
+        last_attempt_at, processed_at, resend_id, error_message, created_at, updated_at
+    FROM moved_rows;
+
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    IF moved > 0 THEN
+        PERFORM email_queue_stats_adjust('archived', moved);
+    END IF;
+    RETURN moved;
+END;
+$$ LANGUAGE plpgsql;
+
+-- ============================================================================
+-- RETENTION SETTINGS
+-- ============================================================================
+
+INSERT INTO system_configuration (key, value, description, data_type, category) VALUES
+('audit_log_retention_months', '24', 'Months of audit log partitions to keep (0 = keep forever)', 'number', 'system'),
+('email_log_retention_months', '12', 'Months of email log partitions to keep (0 = keep forever)', 'number', 'system'),
+('email_queue_archive_days', '30', 'Days after which completed queue emails move to email_queue_archive', 'number', 'system')
+ON CONFLICT (key) DO NOTHING;
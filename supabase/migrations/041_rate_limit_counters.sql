@@ -0,0 +1,22 @@
+-- Migration: Shared rate limit counters
+--
+-- slowapi used in-memory counters, so each Uvicorn worker / Vercel instance
+-- enforced its own limit. The backend's Postgres rate limit storage
+-- (app/core/rate_limit_storage.py) keeps fixed-window counters here instead.
+--
+-- UNLOGGED: counters are short-lived and losing them on a crash only resets
+-- the current window, so skip WAL writes for speed.
+
+CREATE UNLOGGED TABLE IF NOT EXISTS rate_limit_counters (
+    key TEXT PRIMARY KEY,  -- limits key, e.g. LIMITER/user:<id>/api/.../5/1/minute
+    count INTEGER NOT NULL DEFAULT 0,
+    expires_at TIMESTAMPTZ NOT NULL
+);
+
+-- Used by the periodic cleanup of expired windows
+CREATE INDEX IF NOT EXISTS idx_rate_limit_counters_expires_at ON rate_limit_counters(expires_at);
+
+-- Only the backend (service role) touches this table
+ALTER TABLE rate_limit_counters ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE rate_limit_counters IS 'Fixed-window API rate limit counters shared by all backend instances';
@@ -0,0 +1,26 @@
+-- Migration: Stored request profiles
+--
+-- The opt-in sampling profiler (app/core/profiling.py) saves one row per
+-- profiled request. folded_stacks is in the "folded" flame graph format
+-- (frame;frame;frame count per line) readable by speedscope / flamegraph.pl.
+
+CREATE TABLE IF NOT EXISTS request_profiles (
+    id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+    method VARCHAR(10) NOT NULL,
+    path TEXT NOT NULL,
+    route TEXT,  -- Route template, e.g. /api/applications/admin/{application_id}
+    status_code INTEGER,
+    duration_ms NUMERIC(10, 1),
+    trigger VARCHAR(20) NOT NULL,  -- 'token' (signed header) or 'sampled'
+    sample_count INTEGER DEFAULT 0,
+    sections JSONB,  -- {"completion": {"calls": 1, "ms": 12.3}, "stripe": {...}}
+    folded_stacks TEXT,
+    created_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_request_profiles_created_at ON request_profiles(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_request_profiles_route ON request_profiles(route);
+
+ALTER TABLE request_profiles ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE request_profiles IS 'Sampled stack profiles of individual API requests, viewable by super admins';
@@ -0,0 +1,125 @@
+-- Migration: Per-application revision counter
+--
+-- applications.revision increases whenever the application row or any of its
+-- child rows changes (responses, files, notes, approvals, medications, doses,
+-- allergies, invoices). The backend uses it as a cheap version tag for
+-- conditional GETs (ETag / If-None-Match -> 304), without loading the
+-- application's object graph.
+--
+-- Child tables bump the revision with STATEMENT-level triggers over the
+-- transition tables, so one statement touching many rows bumps (and locks)
+-- the application row once. Autosave writes all its responses in a single
+-- INSERT ... ON CONFLICT (upsert_responses in app/api/applications.py),
+-- which fires the insert and the update trigger once each: 50 responses
+-- bump the application at most twice, not 50 times.
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+ALTER TABLE applications ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT 1;
+
+COMMENT ON COLUMN applications.revision IS 'Increases on every change to the application or its child rows (ETag source)';
+
+-- ============================================================================
+-- APPLICATION ROW
+-- ============================================================================
+
+-- Any direct update of the application bumps the revision, unless the update
+-- already sets it (e.g. the child-table triggers below)
+CREATE OR REPLACE FUNCTION bump_application_revision()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.revision = OLD.revision THEN
+        NEW.revision := OLD.revision + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_applications_revision ON applications;
+CREATE TRIGGER trg_applications_revision
+    BEFORE UPDATE ON applications
+    FOR EACH ROW EXECUTE FUNCTION bump_application_revision();
+
+-- ============================================================================
+-- CHILD TABLES (rows carry application_id)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION bump_application_revision_from_children()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE applications
+    SET revision = revision + 1
+    WHERE id IN (SELECT DISTINCT application_id FROM changed_rows WHERE application_id IS NOT NULL);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables only allow one event per trigger, so each table gets three
+DO $$
+DECLARE
+    child TEXT;
+BEGIN
+    FOREACH child IN ARRAY ARRAY[
+        'application_responses', 'files', 'admin_notes', 'application_approvals',
+        'medications', 'allergies', 'invoices'
+    ]
+    LOOP
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_revision_ins ON %I', child, child);
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_revision_upd ON %I', child, child);
+        EXECUTE format('DROP TRIGGER IF EXISTS trg_%s_revision_del ON %I', child, child);
+
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_revision_ins AFTER INSERT ON %I
+             REFERENCING NEW TABLE AS changed_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION bump_application_revision_from_children()',
+            child, child
+        );
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_revision_upd AFTER UPDATE ON %I
+             REFERENCING NEW TABLE AS changed_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION bump_application_revision_from_children()',
+            child, child
+        );
+        EXECUTE format(
+            'CREATE TRIGGER trg_%s_revision_del AFTER DELETE ON %I
+             REFERENCING OLD TABLE AS changed_rows
+             FOR EACH STATEMENT EXECUTE FUNCTION bump_application_revision_from_children()',
+            child, child
+        );
+    END LOOP;
+END $$;
+
+-- ============================================================================
+-- MEDICATION DOSES (rows carry medication_id)
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION bump_application_revision_from_doses()
+RETURNS TRIGGER AS $$
+BEGIN
+    UPDATE applications
+    SET revision = revision + 1
+    WHERE id IN (
+        SELECT DISTINCT m.application_id
+        FROM changed_rows d
+        JOIN medications m ON m.id = d.medication_id
+    );
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_medication_doses_revision_ins ON medication_doses;
+DROP TRIGGER IF EXISTS trg_medication_doses_revision_upd ON medication_doses;
+DROP TRIGGER IF EXISTS trg_medication_doses_revision_del ON medication_doses;
+
+CREATE TRIGGER trg_medication_doses_revision_ins AFTER INSERT ON medication_doses
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_application_revision_from_doses();
+CREATE TRIGGER trg_medication_doses_revision_upd AFTER UPDATE ON medication_doses
+    REFERENCING NEW TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_application_revision_from_doses();
+-- Doses deleted by the medications cascade find no medication row; the
+-- medications delete trigger has already bumped the application
+CREATE TRIGGER trg_medication_doses_revision_del AFTER DELETE ON medication_doses
+    REFERENCING OLD TABLE AS changed_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION bump_application_revision_from_doses();
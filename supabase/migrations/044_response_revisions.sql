@@ -0,0 +1,90 @@
+-- Migration: Per-response revisions for delta sync
+--
+-- Every application_responses row records the application revision
+-- (migration 043) at which it was last written, and deleted responses leave
+-- a tombstone. GET /api/applications/{id}/responses?since=<rev> then returns
+-- only the responses written (or deleted) after <rev>, and PATCH can detect
+-- responses another tab or an admin changed after the client's base revision.
+--
+-- The BEFORE ROW trigger locks the application row before reading its
+-- revision, so concurrent writers get strictly increasing revisions in
+-- commit order: a reader that has seen revision R never misses a later
+-- write tagged <= R. The statement-level trigger from 043 then moves
+-- applications.revision up to the value just assigned.
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+ALTER TABLE application_responses ADD COLUMN IF NOT EXISTS revision BIGINT NOT NULL DEFAULT 0;
+
+CREATE INDEX IF NOT EXISTS idx_application_responses_app_revision
+    ON application_responses(application_id, revision);
+
+COMMENT ON COLUMN application_responses.revision IS 'Application revision at which this response was last written (delta sync)';
+
+-- Backfill (before the stamping trigger exists): existing responses are all
+-- "at" their application's current revision
+UPDATE application_responses r
+SET revision = a.revision
+FROM applications a
+WHERE a.id = r.application_id AND r.revision = 0;
+
+-- ============================================================================
+-- TOMBSTONES
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS application_response_tombstones (
+    application_id UUID NOT NULL REFERENCES applications(id) ON DELETE CASCADE,
+    question_id UUID NOT NULL,
+    revision BIGINT NOT NULL,
+    deleted_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    PRIMARY KEY (application_id, question_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_response_tombstones_app_revision
+    ON application_response_tombstones(application_id, revision);
+
+ALTER TABLE application_response_tombstones ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE application_response_tombstones IS 'Deleted application responses, so delta sync clients can drop them';
+
+-- ============================================================================
+-- TRIGGERS
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION stamp_application_response_revision()
+RETURNS TRIGGER AS $$
+DECLARE
+    current_revision BIGINT;
+BEGIN
+    SELECT revision INTO current_revision
+    FROM applications
+    WHERE id = COALESCE(NEW.application_id, OLD.application_id)
+    FOR UPDATE;
+
+    IF TG_OP = 'DELETE' THEN
+        -- Cascade from a deleted application: nothing left to sync
+        IF current_revision IS NOT NULL THEN
+            INSERT INTO application_response_tombstones (application_id, question_id, revision)
+            VALUES (OLD.application_id, OLD.question_id, current_revision + 1)
+            ON CONFLICT (application_id, question_id)
+            DO UPDATE SET revision = EXCLUDED.revision, deleted_at = NOW();
+        END IF;
+        RETURN OLD;
+    END IF;
+
+    NEW.revision := COALESCE(current_revision, 0) + 1;
+
+    -- A re-created response supersedes its tombstone
+    IF TG_OP = 'INSERT' THEN
+        DELETE FROM application_response_tombstones
+        WHERE application_id = NEW.application_id AND question_id = NEW.question_id;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_application_responses_stamp_revision ON application_responses;
+CREATE TRIGGER trg_application_responses_stamp_revision
+    BEFORE INSERT OR UPDATE OR DELETE ON application_responses
+    FOR EACH ROW EXECUTE FUNCTION stamp_application_response_revision();
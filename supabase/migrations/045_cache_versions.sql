@@ -0,0 +1,17 @@
+-- Migration: Cache invalidation version counters
+--
+-- In-process caches (app/core/cache_bus.py) are invalidated across workers
+-- with NOTIFY cache_invalidation. Instances that can't hold a LISTEN
+-- connection (serverless, transaction pooler) poll this table instead: every
+-- invalidation bumps its namespace's version in the same transaction as the
+-- NOTIFY, and a changed version evicts that namespace locally.
+
+CREATE TABLE IF NOT EXISTS cache_versions (
+    namespace VARCHAR(50) PRIMARY KEY,  -- 'form', 'system_config', 'teams', 'users'
+    version BIGINT NOT NULL DEFAULT 1,
+    updated_at TIMESTAMPTZ DEFAULT NOW()
+);
+
+ALTER TABLE cache_versions ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE cache_versions IS 'Per-namespace invalidation counters for in-process caches (polling fallback for LISTEN/NOTIFY)';
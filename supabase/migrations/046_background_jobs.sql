@@ -0,0 +1,62 @@
+-- Migration: Background job queue
+--
+-- Generic Postgres-backed queue for work that is too slow for an HTTP request
+-- (annual reset, mass email, application/user deletion, payment plans).
+-- Endpoints insert a row and return its id; workers claim rows with
+-- FOR UPDATE SKIP LOCKED (app/services/job_queue.py), so any number of
+-- workers, the cron endpoint and in-process runs can share the table without
+-- running a job twice.
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS background_jobs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    job_type VARCHAR(100) NOT NULL,  -- Handler name, e.g. 'annual_reset'
+    payload JSONB NOT NULL DEFAULT '{}'::jsonb,
+
+    -- Queue management
+    status VARCHAR(20) NOT NULL DEFAULT 'pending'
+        CHECK (status IN ('pending', 'running', 'completed', 'failed', 'cancelled')),
+    priority INTEGER NOT NULL DEFAULT 0,  -- Higher = claimed first
+    run_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),  -- Not claimed before this (retry backoff)
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    cancel_requested BOOLEAN NOT NULL DEFAULT FALSE,
+
+    -- Claim tracking
+    locked_by VARCHAR(255),  -- Worker id (hostname:pid)
+    heartbeat_at TIMESTAMPTZ,  -- Refreshed on progress; stale running jobs are re-queued
+
+    -- Progress and outcome
+    progress_current INTEGER NOT NULL DEFAULT 0,
+    progress_total INTEGER,
+    progress_message TEXT,
+    result JSONB,
+    error_message TEXT,
+
+    created_by UUID REFERENCES users(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Claim query: next pending jobs by priority, then age
+CREATE INDEX IF NOT EXISTS idx_background_jobs_pending
+    ON background_jobs(priority DESC, run_at, created_at)
+    WHERE status = 'pending';
+
+-- Stale job recovery
+CREATE INDEX IF NOT EXISTS idx_background_jobs_running
+    ON background_jobs(heartbeat_at)
+    WHERE status = 'running';
+
+CREATE INDEX IF NOT EXISTS idx_background_jobs_created_by
+    ON background_jobs(created_by, created_at DESC);
+
+-- Only the backend (service role) touches this table
+ALTER TABLE background_jobs ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE background_jobs IS 'Background job queue (claimed with SKIP LOCKED, retried with backoff)';
+COMMENT ON COLUMN background_jobs.cancel_requested IS 'Set by the cancel endpoint; running handlers stop at their next progress report';
@@ -0,0 +1,51 @@
+-- Migration: In-process scheduler state and run history
+--
+-- The worker process (python -m app.worker) runs the cron workloads itself
+-- (app/services/scheduler.py). Every instance runs the scheduler loop; for
+-- each task tick one instance wins pg_try_advisory_xact_lock and advances
+-- scheduled_tasks.last_tick_at, so a tick is claimed once even with several
+-- workers and the Vercel Cron HTTP triggers active at the same time (runs
+-- are at-least-once: see migration 051).
+-- last_tick_at is also what missed ticks are caught up from after downtime.
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS scheduled_tasks (
+    name VARCHAR(100) PRIMARY KEY,
+    last_tick_at TIMESTAMPTZ NOT NULL,  -- Latest schedule slot claimed by a run
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+ALTER TABLE scheduled_tasks ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE scheduled_tasks IS 'Last claimed tick per scheduled task (scheduler catch-up and de-duplication)';
+
+-- ============================================================================
+-- RUN HISTORY
+-- ============================================================================
+
+CREATE TABLE IF NOT EXISTS scheduled_task_runs (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    task_name VARCHAR(100) NOT NULL,
+    scheduled_for TIMESTAMPTZ NOT NULL,  -- The tick this run covers
+    trigger VARCHAR(20) NOT NULL DEFAULT 'scheduler',  -- 'scheduler' or 'http' (Vercel Cron)
+    instance VARCHAR(255),  -- hostname:pid
+    status VARCHAR(20) NOT NULL DEFAULT 'running'
+        CHECK (status IN ('running', 'succeeded', 'failed')),
+    started_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    finished_at TIMESTAMPTZ,
+    duration_ms INTEGER,
+    result JSONB,
+    error_message TEXT
+);
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_task_runs_task_started
+    ON scheduled_task_runs(task_name, started_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_scheduled_task_runs_started
+    ON scheduled_task_runs(started_at);
+
+ALTER TABLE scheduled_task_runs ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE scheduled_task_runs IS 'History and durations of scheduled task runs (pruned by log maintenance)';
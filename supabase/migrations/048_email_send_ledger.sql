@@ -0,0 +1,42 @@
+-- Migration: Per-recipient email send ledger
+--
+-- One row per (logical email, period, recipient, application): e.g. the
+-- "automation:<id>" email for the 2026-10-19 run to parent@example.com about
+-- one camper. Scheduled automations, reminders and retried event emails
+-- (Stripe webhooks) check the ledger in bulk before rendering and claim each
+-- recipient before sending, so a retried or resumed run only sends to the
+-- recipients that are left (app/services/send_ledger.py).
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS email_send_ledger (
+    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    send_key VARCHAR(200) NOT NULL,  -- 'automation:<id>', 'event:<event>:<automation id>', 'reminder:<template>'
+    period VARCHAR(100) NOT NULL,  -- Run identity: date, ISO week, Stripe invoice id...
+    recipient_email VARCHAR(255) NOT NULL,  -- Lowercased
+    application_id UUID,  -- NULL for emails not about one application
+    status VARCHAR(20) NOT NULL DEFAULT 'sending'
+        CHECK (status IN ('sending', 'sent', 'failed')),
+    attempts INTEGER NOT NULL DEFAULT 1,  -- Bumped when a failed send is retried (part of the Resend idempotency key)
+    resend_id VARCHAR(255),
+    error_message TEXT,
+    claimed_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    sent_at TIMESTAMPTZ
+);
+
+-- The idempotency key (NULL application_id counts as one value)
+CREATE UNIQUE INDEX IF NOT EXISTS idx_email_send_ledger_key
+    ON email_send_ledger(
+        send_key, period, recipient_email,
+        COALESCE(application_id, '00000000-0000-0000-0000-000000000000'::uuid)
+    );
+
+-- Retention cleanup
+CREATE INDEX IF NOT EXISTS idx_email_send_ledger_claimed_at ON email_send_ledger(claimed_at);
+
+-- Only the backend (service role) touches this table
+ALTER TABLE email_send_ledger ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE email_send_ledger IS 'Who already received each logical email, so retried/resumed sends skip them';
+COMMENT ON COLUMN email_send_ledger.status IS 'sending = claimed (reclaimable once stale), sent = done, failed = retried by the next run';
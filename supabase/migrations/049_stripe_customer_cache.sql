@@ -0,0 +1,30 @@
+-- Migration: Local cache of Stripe customers
+--
+-- get_or_create_stripe_customer used to call Customer.retrieve on every
+-- invoice just to check the stored customer still exists. Customers are now
+-- cached here: written from our own Stripe API responses and from the
+-- customer.created / customer.updated / customer.deleted webhooks, and
+-- re-verified with Stripe only on a miss or after
+-- STRIPE_CUSTOMER_CACHE_SECONDS (app/services/stripe_service.py).
+--
+-- Invoice state needs no separate cache: the invoices table already mirrors
+-- it through the invoice.* webhooks.
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS stripe_customers (
+    id VARCHAR(255) PRIMARY KEY,  -- Stripe customer ID (cus_...)
+    user_id UUID REFERENCES users(id) ON DELETE SET NULL,
+    email VARCHAR(255),
+    name VARCHAR(255),
+    deleted BOOLEAN NOT NULL DEFAULT FALSE,  -- Set by customer.deleted; the next invoice creates a new customer
+    synced_at TIMESTAMPTZ NOT NULL DEFAULT NOW()  -- Last write from Stripe data (API response or webhook)
+);
+
+CREATE INDEX IF NOT EXISTS idx_stripe_customers_user_id ON stripe_customers(user_id);
+
+-- Only the backend (service role) touches this table
+ALTER TABLE stripe_customers ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE stripe_customers IS 'Stripe customers seen by the app (cache, kept in sync by customer.* webhooks)';
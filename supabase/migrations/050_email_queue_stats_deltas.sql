@@ -0,0 +1,115 @@
+-- Migration: Append-only deltas for the email_queue stats counters
+--
+-- Migration 040 kept email_queue_stats up to date with ROW triggers that
+-- updated the one counter row per status. Every writer locked those rows
+-- until it committed, so a mass enqueue holding the 'pending' row blocked
+-- every worker claim (pending -> processing) behind it.
+--
+-- Triggers now only append to email_queue_stats_deltas: one row per status
+-- per statement, summed over the statement's transition tables, and never
+-- an update of a shared row. process_email_queue folds the deltas into
+-- email_queue_stats once per batch (fold_email_queue_stats), and
+-- get_queue_stats reads counters + unfolded deltas, so stats stay exact
+-- between folds.
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+CREATE TABLE IF NOT EXISTS email_queue_stats_deltas (
+    id BIGSERIAL PRIMARY KEY,
+    status VARCHAR(50) NOT NULL,  -- Same keys as email_queue_stats.status
+    delta BIGINT NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Only the backend (service role) touches this table
+ALTER TABLE email_queue_stats_deltas ENABLE ROW LEVEL SECURITY;
+
+COMMENT ON TABLE email_queue_stats_deltas IS 'Unfolded email_queue_stats changes, appended by triggers and folded per queue batch';
+COMMENT ON TABLE email_queue_stats IS 'Row count per email_queue status (plus archived total); add email_queue_stats_deltas for the live value';
+
+-- ============================================================================
+-- WRITERS: append only
+-- ============================================================================
+
+-- Also used by archive_completed_email_queue() (migration 040) for 'archived'
+CREATE OR REPLACE FUNCTION email_queue_stats_adjust(p_status TEXT, p_delta BIGINT)
+RETURNS VOID AS $$
+BEGIN
+    INSERT INTO email_queue_stats_deltas (status, delta) VALUES (p_status, p_delta);
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION email_queue_stats_statement_trigger()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO email_queue_stats_deltas (status, delta)
+        SELECT status, COUNT(*) FROM new_rows GROUP BY status;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO email_queue_stats_deltas (status, delta)
+        SELECT status, -COUNT(*) FROM old_rows GROUP BY status;
+    ELSE
+        INSERT INTO email_queue_stats_deltas (status, delta)
+        SELECT status, SUM(delta)
+        FROM (
+            SELECT status, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT status, -1 FROM old_rows
+        ) changes
+        GROUP BY status
+        HAVING SUM(delta) <> 0;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS email_queue_stats_insert_delete ON email_queue;
+DROP TRIGGER IF EXISTS email_queue_stats_status_change ON email_queue;
+DROP FUNCTION IF EXISTS email_queue_stats_trigger();
+
+-- Transition tables only allow one event per trigger (and no column list),
+-- so each event gets its own trigger
+DROP TRIGGER IF EXISTS email_queue_stats_ins ON email_queue;
+DROP TRIGGER IF EXISTS email_queue_stats_upd ON email_queue;
+DROP TRIGGER IF EXISTS email_queue_stats_del ON email_queue;
+
+CREATE TRIGGER email_queue_stats_ins AFTER INSERT ON email_queue
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION email_queue_stats_statement_trigger();
+CREATE TRIGGER email_queue_stats_upd AFTER UPDATE ON email_queue
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION email_queue_stats_statement_trigger();
+CREATE TRIGGER email_queue_stats_del AFTER DELETE ON email_queue
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION email_queue_stats_statement_trigger();
+
+-- ============================================================================
+-- FOLD
+-- ============================================================================
+
+-- Moves committed deltas into the counters. Concurrent folds can't double
+-- count: a delta row is deleted (and summed) by exactly one of them.
+CREATE OR REPLACE FUNCTION fold_email_queue_stats()
+RETURNS INTEGER AS $$
+DECLARE
+    folded INTEGER;
+BEGIN
+    WITH folded_rows AS (
+        DELETE FROM email_queue_stats_deltas
+        RETURNING status, delta
+    ), totals AS (
+        SELECT status, SUM(delta) AS delta, COUNT(*) AS row_count
+        FROM folded_rows
+        GROUP BY status
+    ), applied AS (
+        INSERT INTO email_queue_stats (status, count, updated_at)
+        SELECT status, delta, NOW() FROM totals
+        ON CONFLICT (status) DO UPDATE
+            SET count = email_queue_stats.count + EXCLUDED.count,
+                updated_at = NOW()
+    )
+    SELECT COALESCE(SUM(row_count), 0) INTO folded FROM totals;
+    RETURN folded;
+END;
+$$ LANGUAGE plpgsql;
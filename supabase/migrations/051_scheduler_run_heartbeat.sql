@@ -0,0 +1,20 @@
+-- Migration: Heartbeats for scheduled task runs
+--
+-- The scheduler used to hold its advisory lock in a transaction left open
+-- for the whole task run, which idle_in_transaction_session_timeout (and a
+-- crash) would end mid-run. Claims are now committed up front as a
+-- 'running' scheduled_task_runs row, kept alive by heartbeat_at while the
+-- task runs (app/services/scheduler.py). A run whose heartbeat goes stale is
+-- marked failed by the next claim and its slot runs again (at-least-once).
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+ALTER TABLE scheduled_task_runs ADD COLUMN IF NOT EXISTS heartbeat_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+
+COMMENT ON COLUMN scheduled_task_runs.heartbeat_at IS 'Refreshed while the run is in progress; stale running rows are abandoned runs';
+
+-- Claim check: the task's running run, if any
+CREATE INDEX IF NOT EXISTS idx_scheduled_task_runs_running
+    ON scheduled_task_runs(task_name)
+    WHERE status = 'running';
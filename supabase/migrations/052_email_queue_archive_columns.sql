@@ -0,0 +1,53 @@
+-- Migration: Archive email_queue rows by column name
+--
+-- archive_completed_email_queue() (migration 040) copied rows with
+-- INSERT INTO email_queue_archive SELECT * - columns matched by position,
+-- which breaks or silently misplaces data once email_queue gains a column.
+-- Re-creates it with explicit column lists, for databases that already ran 040.
+--
+-- IDEMPOTENT: safe to run multiple times.
+-- Date: 2026-10-18
+
+-- Moves completed queue rows older than p_older_than into email_queue_archive.
+-- Runs in batches so a large backlog doesn't hold locks for long. Columns are
+-- listed by name: the archive was created with LIKE email_queue, so matching
+-- by position would break (or misplace data) once email_queue gains a column.
+CREATE OR REPLACE FUNCTION archive_completed_email_queue(p_older_than INTERVAL, p_batch_size INTEGER DEFAULT 5000)
+RETURNS INTEGER AS $$
+DECLARE
+    moved INTEGER;
+BEGIN
+    WITH moved_rows AS (
+        DELETE FROM email_queue
+        WHERE id IN (
+            SELECT id FROM email_queue
+            WHERE status = 'completed'
+              AND processed_at < NOW() - p_older_than
+            LIMIT p_batch_size
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING id, recipient_email, recipient_name, user_id, application_id,
+                  template_key, subject, html_content, text_content, variables,
+                  priority, status, scheduled_for, attempts, max_attempts,
+                  last_attempt_at, processed_at, resend_id, error_message, created_at, updated_at
+    )
+    INSERT INTO email_queue_archive (
+        id, recipient_email, recipient_name, user_id, application_id,
+        template_key, subject, html_content, text_content, variables,
+        priority, status, scheduled_for, attempts, max_attempts,
+        last_attempt_at, processed_at, resend_id, error_message, created_at, updated_at
+    )
+    SELECT
+        id, recipient_email, recipient_name, user_id, application_id,
+        template_key, subject, html_content, text_content, variables,
+        priority, status, scheduled_for, attempts, max_attempts,
+        last_attempt_at, processed_at, resend_id, error_message, created_at, updated_at
+    FROM moved_rows;
+
+    GET DIAGNOSTICS moved = ROW_COUNT;
+    IF moved > 0 THEN
+        PERFORM email_queue_stats_adjust('archived', moved);
+    END IF;
+    RETURN moved;
+END;
+$$ LANGUAGE plpgsql;